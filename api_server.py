@@ -0,0 +1,362 @@
+# api_server.py
+"""
+Bileşen veritabanı için yerel HTTP/JSON API (barkod okuyucular, atölye tableti).
+
+    python -m api_server [--host 127.0.0.1] [--port 8765] [--workers 8]
+
+    GET    /health
+    GET    /perf                               işlem süreleri (p50/p95/max ms) ve yavaş sorgular;
+                                               ölçüm --perf ile açılır
+    GET    /components?q=&category=&limit=&sort=&desc=1   arama (q boşsa tüm liste)
+    GET    /components?q=lm-317&fuzzy=1        bulanık, parça numarası duyarlı arama (benzerliğe göre)
+    GET    /components/<id>
+    POST   /components                         {"name", "drawer_code", "quantity", ...}
+    PUT    /components/<id>                    sadece gönderilen alanlar değişir
+    DELETE /components/<id>
+    POST   /components/<id>/adjust             {"delta": -1} -> {"id", "quantity"}
+    POST   /adjust                             {"deltas": [{"id", "delta"}, ...], "strict": false}
+                                               tek transaction (ör. BOM tüketimi) -> {"quantities": {id: qty}}
+
+İstekler sabit boyutlu bir thread havuzunda işlenir; her worker thread
+db_handler'ın thread başına bağlantısını yeniden kullanır. Tk import edilmez.
+"""
+import argparse
+import json
+import logging
+import re
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import app_logging
+import config
+import db_handler
+import perf
+from component_store import ComponentStore
+from config import COLUMNS
+
+log = logging.getLogger(__name__)
+access_log = logging.getLogger(__name__ + ".access")
+
+# Gövdeden kabul edilen alanlar (id ve added_date veritabanında belirlenir)
+EDITABLE_FIELDS = ("name", "category", "drawer_code", "quantity", "datasheet", "description", "image_path")
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _row_to_dict(row):
+    return dict(zip(COLUMNS, row))
+
+
+def _component_or_404(comp_id):
+    row = db_handler.get_component(comp_id)
+    if row is None:
+        raise ApiError(404, f"component {comp_id} not found")
+    return row
+
+
+_fuzzy_store = None
+_fuzzy_lock = threading.Lock()
+
+
+def _fuzzy_store_fresh():
+    """Bulanık arama için bellekteki store: ilk istekte yüklenir, sonra her istekte artımlı tazelenir."""
+    global _fuzzy_store
+    with _fuzzy_lock:
+        if _fuzzy_store is None:
+            store = ComponentStore(fuzzy=True)
+            store.load()
+            _fuzzy_store = store
+        else:
+            _fuzzy_store.refresh()
+        return _fuzzy_store
+
+
+def _clean_fields(body, required=()):
+    """JSON gövdesini doğrular; quantity tamsayı, metin alanları str olmalıdır."""
+    if not isinstance(body, dict):
+        raise ApiError(400, "expected a JSON object")
+    unknown = set(body) - set(EDITABLE_FIELDS)
+    if unknown:
+        raise ApiError(400, f"unknown field(s): {', '.join(sorted(unknown))}")
+    missing = [k for k in required if not str(body.get(k, "")).strip()]
+    if missing:
+        raise ApiError(400, f"missing field(s): {', '.join(missing)}")
+    data = {}
+    for key, value in body.items():
+        if key == "quantity":
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise ApiError(400, "quantity must be an integer")
+            data[key] = value
+        else:
+            data[key] = "" if value is None else str(value).strip()
+    return data
+
+
+# --- Handlers: (query, body, *ids) -> (status, payload) ---
+
+def list_components(query, body):
+    limit = query.get("limit")
+    try:
+        limit = int(limit) if limit else None
+    except ValueError:
+        raise ApiError(400, "limit must be an integer")
+    order_by = query.get("sort")
+    desc = query.get("desc") in ("1", "true")
+    if query.get("fuzzy") in ("1", "true") and query.get("q", "").strip():
+        try:
+            rows = _fuzzy_store_fresh().fuzzy_select(
+                query["q"], query.get("category", "All"), order_by, desc=desc, limit=limit
+            )
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        if rows is not None:   # terim çok kısaysa normal aramaya düşülür
+            return 200, [_row_to_dict(r) for r in rows]
+    if order_by and desc:
+        order_by += " desc"
+    try:
+        rows = db_handler.search_components(query.get("q", ""), query.get("category", "All"),
+                                            limit=limit, order_by=order_by)
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    return 200, [_row_to_dict(r) for r in rows]
+
+
+def get_component(query, body, comp_id):
+    return 200, _row_to_dict(_component_or_404(comp_id))
+
+
+def add_component(query, body):
+    data = _clean_fields(body, required=("name", "drawer_code", "quantity"))
+    duplicate = ApiError(409, "a component with this name and drawer_code already exists")
+    # Ön kontrol benzersiz indeksi olmayan eski veritabanları için; eşzamanlı
+    # iki istekte kaybeden, indeksin IntegrityError'ı ile aynı 409'u alır
+    if db_handler.component_exists(data["name"], data["drawer_code"]):
+        raise duplicate
+    data = {k: data.get(k, "") for k in EDITABLE_FIELDS}
+    try:
+        comp_id = db_handler.add_component(data)
+    except sqlite3.IntegrityError:
+        raise duplicate from None
+    if comp_id is None:
+        raise ApiError(500, "component could not be added")
+    return 201, _row_to_dict(db_handler.get_component(comp_id))
+
+
+def update_component(query, body, comp_id):
+    current = _row_to_dict(_component_or_404(comp_id))
+    data = {k: current[k] for k in EDITABLE_FIELDS}
+    data.update(_clean_fields(body))
+    try:
+        updated = db_handler.update_component(comp_id, data)
+    except sqlite3.IntegrityError:
+        raise ApiError(409, "a component with this name and drawer_code already exists") from None
+    if updated is None:
+        raise ApiError(500, "component could not be updated")
+    return 200, _row_to_dict(db_handler.get_component(comp_id))
+
+
+def delete_component(query, body, comp_id):
+    if db_handler.delete_component(comp_id) is None:
+        raise ApiError(404, f"component {comp_id} not found")
+    return 200, {"id": comp_id, "deleted": True}
+
+
+def adjust_component(query, body, comp_id):
+    delta = body.get("delta") if isinstance(body, dict) else None
+    if isinstance(delta, bool) or not isinstance(delta, int):
+        raise ApiError(400, "delta must be an integer")
+    quantity = db_handler.adjust_stock(comp_id, delta)
+    if quantity is None:
+        raise ApiError(404, f"component {comp_id} not found")
+    return 200, {"id": comp_id, "quantity": quantity}
+
+
+def adjust_many(query, body):
+    items = body.get("deltas") if isinstance(body, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ApiError(400, "deltas must be a non-empty list of {\"id\", \"delta\"} objects")
+    deltas = []
+    for item in items:
+        comp_id = item.get("id") if isinstance(item, dict) else None
+        delta = item.get("delta") if isinstance(item, dict) else None
+        if any(isinstance(v, bool) or not isinstance(v, int) for v in (comp_id, delta)):
+            raise ApiError(400, "each delta needs integer id and delta")
+        deltas.append((comp_id, delta))
+    try:
+        results = db_handler.adjust_stock_many(deltas, strict=bool(body.get("strict")))
+    except KeyError as e:
+        raise ApiError(404, f"component {e.args[0]} not found; nothing was changed")
+    except db_handler.InsufficientStock as e:
+        raise ApiError(409, f"{e}; nothing was changed")
+    return 200, {"quantities": {str(k): v for k, v in results.items()}}
+
+
+def health(query, body):
+    return 200, {"status": "ok", "search_backend": db_handler.get_search_backend(),
+                 "db_path": db_handler.database_path()}
+
+
+def perf_stats(query, body):
+    slow = [{"time": t, "ms": ms, "sql": sql, "plan": plan} for t, ms, sql, plan in perf.slow_queries()]
+    return 200, {"enabled": perf.is_enabled(), "operations": perf.stats(), "slow_queries": slow}
+
+
+# (metot, yol kalıbı, handler) — kalıptaki gruplar tamsayı argüman olarak geçer
+ROUTES = [
+    ("GET",    re.compile(r"/health"), health),
+    ("GET",    re.compile(r"/perf"), perf_stats),
+    ("GET",    re.compile(r"/components"), list_components),
+    ("POST",   re.compile(r"/components"), add_component),
+    ("GET",    re.compile(r"/components/(\d+)"), get_component),
+    ("PUT",    re.compile(r"/components/(\d+)"), update_component),
+    ("DELETE", re.compile(r"/components/(\d+)"), delete_component),
+    ("POST",   re.compile(r"/components/(\d+)/adjust"), adjust_component),
+    ("POST",   re.compile(r"/adjust"), adjust_many),
+]
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ComponentTrackerAPI/1.0"
+    timeout = 10   # yavaş/boşta istemci bir worker'ı sonsuza kadar tutmasın
+    disable_nagle_algorithm = True   # küçük JSON yanıtları beklemeden gönderilsin
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            allowed = False
+            for route_method, pattern, handler in ROUTES:
+                match = pattern.fullmatch(path)
+                if match is None:
+                    continue
+                allowed = True
+                if route_method != method:
+                    continue
+                args = [int(g) for g in match.groups()]
+                body = self._read_body() if method in ("POST", "PUT") else None
+                with perf.span("api." + handler.__name__):
+                    status, payload = handler(query, body, *args)
+                break
+            else:
+                raise ApiError(405 if allowed else 404, "method not allowed" if allowed else "not found")
+        except ApiError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception:
+            log.exception("%s %s failed", method, self.path)
+            status, payload = 500, {"error": "internal error"}
+        self._send_json(status, payload)
+
+    def _read_body(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ApiError(400, "invalid Content-Length")
+        if length > config.API_MAX_BODY:
+            raise ApiError(413, "request body too large")
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ApiError(400, "invalid JSON body")
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Erişim kaydı sadece verbose modda; yazma log kuyruğunun thread'inde yapılır
+        if self.server.verbose:
+            access_log.info("%s %s", self.address_string(), format % args)
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    ThreadingHTTPServer gibi ama istek başına yeni thread yerine sabit boyutlu
+    bir havuz kullanır: eşzamanlı istemci sayısı ne olursa olsun en fazla
+    `workers` istek aynı anda işlenir, fazlası kuyrukta bekler. Havuzun
+    thread'leri kalıcı olduğu için SQLite bağlantıları da yeniden kullanılır.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, handler=ApiRequestHandler, workers=config.API_WORKERS, verbose=False):
+        super().__init__(address, handler)
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+        if _fuzzy_store is not None:
+            _fuzzy_store.close()
+        db_handler.close_connections()
+
+
+def serve(host=config.API_HOST, port=config.API_PORT, workers=config.API_WORKERS, verbose=False):
+    """Sunucuyu başlatır ve Ctrl+C ile durdurulana kadar çalıştırır."""
+    app_logging.setup_logging(console_level=logging.INFO if verbose else logging.WARNING)
+    db_handler.setup_database()
+    server = PooledHTTPServer((host, port), workers=workers, verbose=verbose)
+    print(f"Component API listening on http://{host}:{server.server_port} ({workers} workers)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the component database as a local JSON API.")
+    parser.add_argument("--host", default=config.API_HOST)
+    parser.add_argument("--port", type=int, default=config.API_PORT)
+    parser.add_argument("--workers", type=int, default=config.API_WORKERS)
+    parser.add_argument("--verbose", action="store_true", help="log every request to stderr")
+    parser.add_argument("--perf", action="store_true", help="record operation timings (see GET /perf)")
+    args = parser.parse_args(argv)
+    if args.perf:
+        perf.enable()
+    return serve(args.host, args.port, args.workers, args.verbose)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# app_logging.py
+"""
+Uygulama genelinde loglama kurulumu.
+
+Modüller sadece kendi logger'larını alır ve %-argümanlarıyla yazar; mesaj
+sadece seviye geçiyorsa biçimlendirilir:
+
+    log = logging.getLogger(__name__)
+    log.debug("%d satır okundu", len(rows))
+
+setup_logging() giriş noktalarında (uygulama, CLI, API) bir kez çağrılır.
+Kayıtlar bir QueueHandler ile kuyruğa atılır; dosyaya ve konsola yazma
+QueueListener thread'inde yapılır, böylece disk/konsol G/Ç'si UI thread'ini
+hiç bekletmez. Dosya config.LOG_FILE (APP_DIR/app.log), boyutu dolunca döner.
+
+Modül bazında seviyeler ayarlardaki "log_levels" sözlüğünden gelir ve
+çalışırken değiştirilebilir:
+
+    {"root": "INFO", "db_handler": "DEBUG", "perf": "WARNING"}
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+import config
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+CONSOLE_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+_listener = None
+_queue_handler = None
+_unobserve = None
+
+
+def apply_levels(levels):
+    """{"root" | modül adı: "DEBUG"/"INFO"/...} sözlüğünü logger'lara uygular."""
+    for name, level in (levels or {}).items():
+        logger = logging.getLogger(None if name in ("", "root") else name)
+        try:
+            logger.setLevel(str(level).upper())
+        except ValueError:
+            logging.getLogger(__name__).warning("Unknown log level %r for %r", level, name)
+
+
+def setup_logging(console_level=logging.WARNING, log_file=None):
+    """
+    Kök logger'a QueueHandler bağlar ve dosya (+ stderr) handler'larını
+    arka plan dinleyicisinde başlatır. Birden çok çağrı güvenlidir.
+    console_level=None ise konsola hiç yazılmaz.
+    """
+    global _listener, _queue_handler, _unobserve
+    if _listener is not None:
+        return
+
+    handlers = []
+    try:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file or config.LOG_FILE, maxBytes=config.LOG_MAX_BYTES,
+            backupCount=config.LOG_BACKUP_COUNT, encoding="utf-8", delay=True,
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(file_handler)
+    except OSError as e:
+        print(f"[LOG] {log_file or config.LOG_FILE} açılamadı: {e}", file=sys.stderr)
+    if console_level is not None:
+        console = logging.StreamHandler(sys.stderr)
+        console.setLevel(console_level)
+        console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+    root.setLevel(logging.INFO)
+    apply_levels(config.settings.get("log_levels", {}))
+    _unobserve = config.settings.observe("log_levels", lambda key, value: apply_levels(value))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Kuyrukta bekleyen kayıtları yazar ve dinleyiciyi durdurur."""
+    global _listener, _queue_handler, _unobserve
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _queue_handler = None
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    if _unobserve is not None:
+        _unobserve()
+        _unobserve = None
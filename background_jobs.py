@@ -0,0 +1,133 @@
+# background_jobs.py
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """İş fonksiyonu iptal isteği üzerine yarıda bıraktı (bkz. check_cancelled)."""
+
+
+class BackgroundJob:
+    """
+    Worker thread'de çalışan tek bir iş. İş fonksiyonu ilk argüman olarak
+    bu nesneyi alır; ilerlemeyi report() ile bildirir ve uzun döngülerde
+    cancelled / cancel_event ile iptal isteğini kontrol eder. İş ancak
+    JobCancelled fırlatarak durursa iptal sayılır; normal dönen bir iş,
+    iptal sonradan istenmiş olsa bile tamamlanmış olarak bildirilir.
+    """
+
+    def __init__(self, runner, name, on_done=None, on_progress=None, on_error=None, on_cancel=None):
+        self.runner = runner
+        self.name = name
+        self.cancel_event = threading.Event()
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """İptal ister; iş fonksiyonu bir sonraki kontrolde durmalıdır."""
+        self.cancel_event.set()
+
+    def check_cancelled(self):
+        """İptal istendiyse JobCancelled fırlatır."""
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def report(self, *payload):
+        """Worker thread'den UI'a ilerleme gönderir (thread-safe)."""
+        self.runner._events.put((self, "progress", payload))
+
+
+class JobRunner:
+    """
+    Uzun işleri Tk ana döngüsünü bloklamadan çalıştıran küçük altyapı.
+
+    İşler kalıcı bir thread havuzunda çalışır (böylece thread başına açılan
+    SQLite bağlantıları yeniden kullanılır). Sonuç, ilerleme ve hatalar
+    thread-safe bir kuyruğa yazılır; kuyruk root.after() ile ana thread'de
+    boşaltılır ve callback'ler orada çağrılır. Tk'ye sadece ana thread dokunur.
+    """
+
+    def __init__(self, root, max_workers=2, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._events = queue.Queue()
+        self._active = set()
+        self._poll_id = None
+
+    def submit(self, func, *args, name="job", on_done=None, on_progress=None, on_error=None, on_cancel=None):
+        """
+        func(job, *args) fonksiyonunu arka planda çalıştırır.
+        Callback'ler ana thread'de çağrılır:
+          on_progress(job, *payload), on_done(job, result),
+          on_error(job, exc), on_cancel(job)
+        """
+        job = BackgroundJob(self, name, on_done, on_progress, on_error, on_cancel)
+        self._active.add(job)
+        self._executor.submit(self._run, job, func, args)
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+        return job
+
+    def cancel_all(self):
+        for job in list(self._active):
+            job.cancel()
+
+    def shutdown(self):
+        """Tüm işleri iptal eder, kuyruğu bekleyen işleri çalıştırmadan bırakır."""
+        self.cancel_all()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job, func, args):
+        """
+        Worker thread: sonucu veya hatayı kuyruğa yazar. func normal dönerse
+        iş "done" olur (örn. iptal commit'ten sonra istendiyse değişiklikler
+        yazılmıştır); sadece JobCancelled "cancel" sayılır.
+        """
+        if job.cancelled:
+            self._events.put((job, "cancel", None))
+            return
+        try:
+            result = func(job, *args)
+        except JobCancelled:
+            self._events.put((job, "cancel", None))
+            return
+        except BaseException as e:
+            self._events.put((job, "error", e))
+            return
+        self._events.put((job, "done", result))
+
+    def _poll(self):
+        """Ana thread: kuyruktaki olayları sırayla ilgili callback'lere dağıtır."""
+        self._poll_id = None
+        while True:
+            try:
+                job, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                if job.on_progress and not job.cancelled:
+                    job.on_progress(job, *payload)
+                continue
+
+            self._active.discard(job)
+            if kind == "done" and job.on_done:
+                job.on_done(job, payload)
+            elif kind == "error" and job.on_error:
+                job.on_error(job, payload)
+            elif kind == "cancel" and job.on_cancel:
+                job.on_cancel(job)
+
+        if self._active:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
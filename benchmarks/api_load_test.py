@@ -0,0 +1,134 @@
+# benchmarks/api_load_test.py
+"""
+api_server için yük testi. Sunucu ayrı bir süreçte çalışıyor olmalıdır:
+
+    python -m cli serve --port 8765
+    python benchmarks/api_load_test.py --clients 32 --duration 10
+
+Her istemci thread'i belirtilen karışımda istek gönderir (arama, tekil okuma,
+stok düşme). Sonunda istek/sn ve gecikme yüzdelikleri (ms) yazdırılır.
+Sadece standart kütüphane kullanılır.
+"""
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import quote
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Client(threading.Thread):
+    def __init__(self, args, ids, terms, deadline, results):
+        super().__init__(daemon=True)
+        self.args = args
+        self.ids = ids
+        self.terms = terms
+        self.deadline = deadline
+        self.results = results        # kind -> [gecikme sn]
+        self.errors = 0
+        self.rng = random.Random()
+
+    def request(self, method, path, body=None):
+        # Sunucu HTTP/1.0 ile her yanıttan sonra bağlantıyı kapatır
+        conn = http.client.HTTPConnection(self.args.host, self.args.port, timeout=10)
+        try:
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        finally:
+            conn.close()
+
+    def run(self):
+        weights = (self.args.search, self.args.get, self.args.adjust)
+        while time.perf_counter() < self.deadline:
+            kind = self.rng.choices(("search", "get", "adjust"), weights)[0]
+            comp_id = self.rng.choice(self.ids)
+            if kind == "search":
+                term = quote(self.rng.choice(self.terms))
+                args = ("GET", f"/components?q={term}&limit={self.args.limit}")
+            elif kind == "get":
+                args = ("GET", f"/components/{comp_id}")
+            else:
+                # Düşme ve geri ekleme dengeli; test verisi tükenmesin
+                args = ("POST", f"/components/{comp_id}/adjust", {"delta": self.rng.choice((-1, 1))})
+
+            start = time.perf_counter()
+            try:
+                status = self.request(*args)
+            except OSError:
+                status = None
+            elapsed = time.perf_counter() - start
+            if status is None or status >= 500:
+                self.errors += 1
+            else:
+                self.results.setdefault(kind, []).append(elapsed)
+
+
+def fetch_sample(args):
+    """İstekler için örnek id'ler ve (--terms verilmediyse) arama terimi olarak isimler."""
+    conn = http.client.HTTPConnection(args.host, args.port, timeout=30)
+    conn.request("GET", f"/components?limit={args.sample}")
+    rows = json.loads(conn.getresponse().read())
+    conn.close()
+    return [row["id"] for row in rows], [row["name"] for row in rows if row["name"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the component JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--limit", type=int, default=20, help="row limit for search requests")
+    parser.add_argument("--sample", type=int, default=1000, help="component ids to draw requests from")
+    parser.add_argument("--terms", nargs="+", help="search terms (default: names of the sampled components, "
+                                                  "like a barcode scanner lookup)")
+    parser.add_argument("--search", type=int, default=4, help="relative weight of search requests")
+    parser.add_argument("--get", type=int, default=4, help="relative weight of single-row reads")
+    parser.add_argument("--adjust", type=int, default=2, help="relative weight of stock adjustments")
+    args = parser.parse_args(argv)
+
+    ids, names = fetch_sample(args)
+    if not ids:
+        print("The database is empty; import some components first.")
+        return 1
+    terms = args.terms or names
+
+    deadline = time.perf_counter() + args.duration
+    clients = [Client(args, ids, terms, deadline, {}) for _ in range(args.clients)]
+    started = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    wall = time.perf_counter() - started
+
+    merged = {}
+    for client in clients:
+        for kind, values in client.results.items():
+            merged.setdefault(kind, []).extend(values)
+    total = sum(len(v) for v in merged.values())
+    errors = sum(c.errors for c in clients)
+
+    print(f"{args.clients} clients, {wall:.1f} s: {total} requests, {total / wall:.0f} req/s, {errors} error(s)")
+    print(f"{'kind':<8}{'count':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for kind in ("search", "get", "adjust"):
+        values = sorted(merged.get(kind, []))
+        if values:
+            row = [percentile(values, p) * 1000 for p in (50, 95, 99)] + [values[-1] * 1000]
+            print(f"{kind:<8}{len(values):>8}" + "".join(f"{v:>9.2f}" for v in row))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
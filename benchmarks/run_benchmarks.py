@@ -0,0 +1,318 @@
+# benchmarks/run_benchmarks.py
+"""
+db_handler ve dışa aktarma yolları için benchmark takımı (Tk gerektirmez).
+
+    python benchmarks/run_benchmarks.py                         # 1k ve 100k satır
+    python benchmarks/run_benchmarks.py --sizes 1k 100k 1m --output results.json
+    python benchmarks/run_benchmarks.py --save-baseline         # benchmarks/baseline.json'a yazar
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.25
+
+Her boyut için gerçekçi, sabit tohumlu sentetik bir components.db üretilir
+(çarpık kategori dağılımı, parça numarası benzeri isimler, bir kısmı uzun
+açıklamalar) ve veri klasöründe saklanıp sonraki çalıştırmalarda yeniden
+kullanılır. Arama, filtre, sıralama, toplu içe aktarma, CSV/PDF dışa aktarma
+ve kategori özetleri ile bellekteki ComponentStore (yükleme, filtre, bellek)
+ve bulanık arama indeksi (kurulum, sorgu, bellek) ölçülür; sonuçlar JSON olarak yazılır. Baseline
+verilirse medyan süreler karşılaştırılır ve eşiği aşan yavaşlama varsa çıkış kodu 1 olur.
+"""
+import argparse
+import contextlib
+import csv
+import datetime
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db_handler  # noqa: E402
+from component_store import ComponentStore  # noqa: E402
+import export_utils  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "component_tracker_bench")
+
+# Üretici değişirse artırılır; eski önbellek dosyaları kullanılmaz
+GENERATOR_VERSION = 1
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+CATEGORIES = [
+    "Resistor", "Capacitor", "IC", "Transistor", "Diode", "Connector", "LED", "Inductor",
+    "Crystal", "Regulator", "Microcontroller", "Sensor", "Relay", "Switch", "Fuse",
+    "Op-Amp", "MOSFET", "Logic", "Memory", "Display", "Module", "Battery", "Cable",
+    "Heatsink", "Transformer", "Buzzer", "Potentiometer", "Optocoupler", "Antenna", "Misc",
+]
+# Zipf benzeri ağırlıklar: ilk birkaç kategori envanterin büyük kısmı
+CATEGORY_WEIGHTS = [1 / (rank ** 1.2) for rank in range(1, len(CATEGORIES) + 1)]
+
+FAMILIES = {
+    "Resistor": ["RC0603FR-07{v}L", "RES-0805-{v}", "CFR-25JB-{v}"],
+    "Capacitor": ["GRM188R71H{v}", "CAP-0603-{v}", "ECA-1HM{v}"],
+    "IC": ["NE555P", "CD4017BE", "MAX232CPE", "74HC595N", "ULN2003A"],
+    "Transistor": ["BC547B", "2N2222A", "BC337-40", "TIP120"],
+    "Diode": ["1N4148", "1N4007", "BAT54S", "SS14"],
+    "Regulator": ["LM317T", "AMS1117-3.3", "LM7805CT", "LM2596S-ADJ"],
+    "Microcontroller": ["ATmega328P-PU", "STM32F103C8T6", "ESP32-WROOM-32", "PIC16F628A"],
+    "Op-Amp": ["LM358N", "TL072CP", "NE5532P", "LM324N"],
+    "MOSFET": ["IRF540N", "IRLZ44N", "AO3400A", "2N7002"],
+}
+VALUES = ["10K", "4K7", "100R", "1K", "220R", "47K", "100N", "10U", "1N", "22P"]
+WORDS = (
+    "low noise high precision thermal package through hole surface mount tolerance voltage "
+    "current rated lead free rohs compliant automotive grade datasheet spare reel cut tape "
+    "bulk sample replacement legacy stock obsolete alternative pin compatible footprint"
+).split()
+
+# Sonuçlarda kullanılan arama terimleri: uzun (FTS) ve kısa (LIKE yolu)
+SEARCH_TERMS = ["lm317", "10k", "0603", "stm32", "thermal"]
+SHORT_TERMS = ["lm", "10"]
+# Bulanık arama: ayraçlı/kılıflı yazım, yazım hatası, uzun parça no., çekmece kodu
+FUZZY_TERMS = ["lm-317", "LM 317 TO-220", "lm371", "stm32f103", "a00-12"]
+
+
+def parse_size(text):
+    text = text.lower()
+    if text in SIZES:
+        return SIZES[text]
+    return int(text.replace("_", ""))
+
+
+def generate_rows(count, seed=1):
+    """Sabit tohumla count adet içe aktarma satırı (sözlük) üretir."""
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    for i in range(count):
+        category = rng.choices(CATEGORIES, CATEGORY_WEIGHTS)[0]
+        family = rng.choice(FAMILIES.get(category, [f"{category[:3].upper()}-{{v}}"]))
+        name = family.format(v=rng.choice(VALUES))
+        if rng.random() < 0.1:
+            words = rng.choices(WORDS, k=rng.randint(80, 300))   # uzun açıklama
+        else:
+            words = rng.choices(WORDS, k=rng.randint(4, 20))
+        quantity = 0 if rng.random() < 0.15 else min(100_000, int(rng.paretovariate(1.2) * 10))
+        yield {
+            "name": name,
+            "category": category,
+            "drawer_code": f"{'ABCDEFGH'[i % 8]}{(i // 8) % 64:02d}-{i}",
+            "quantity": str(quantity),
+            "datasheet": f"https://example.com/ds/{name}.pdf" if rng.random() < 0.5 else "",
+            "description": " ".join(words),
+            "image_path": "",
+            "added_date": (today - datetime.timedelta(days=rng.randint(0, 5 * 365))).isoformat(),
+        }
+
+
+def dataset_path(data_dir, rows):
+    return os.path.join(data_dir, f"components_{rows}_v{GENERATOR_VERSION}.db")
+
+
+def build_dataset(path, rows, regenerate=False):
+    """Sentetik veritabanını (yoksa) üretir ve bağlantı katmanını ona yönlendirir."""
+    if regenerate and os.path.exists(path):
+        os.remove(path)
+    fresh = not os.path.exists(path)
+    db_handler.use_database(path)
+    db_handler.setup_database()
+    if fresh:
+        print(f"  generating {rows} rows -> {path}", file=sys.stderr)
+        start = time.perf_counter()
+        db_handler.import_components(generate_rows(rows))
+        db_handler.create_connection().execute("ANALYZE")
+        print(f"  generated in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+
+def measure(func, repeats, warmup=True):
+    """func'u repeats kez çalıştırır; {median_ms, min_ms, runs} döner."""
+    if warmup:
+        func()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(times), 3), "min_ms": round(min(times), 3), "runs": repeats}
+
+
+def run_size(rows, args, devnull):
+    """Bir veri kümesi boyutu için tüm benchmark'ları çalıştırır."""
+    build_dataset(dataset_path(args.data_dir, rows), rows, args.regenerate)
+    light, heavy = args.repeats, max(1, args.repeats // 5)
+    top_category = db_handler.get_category_counts()
+    top_category = max(top_category, key=lambda r: r[1])[0] if top_category else "All"
+    results = {}
+
+    def bench(name, func, repeats, warmup=True):
+        print(f"  {name}...", file=sys.stderr)
+        # get_all_components gibi fonksiyonların stdout çıktısı da ölçüme dahildir
+        with contextlib.redirect_stdout(devnull):
+            results[name] = measure(func, repeats, warmup)
+
+    bench("search_fts", lambda: [db_handler.search_components(t, "All") for t in SEARCH_TERMS], light)
+    bench("search_fts_limit20", lambda: [db_handler.search_components(t, "All", limit=20) for t in SEARCH_TERMS], light)
+    bench("search_short_like", lambda: [db_handler.search_components(t, "All") for t in SHORT_TERMS], heavy)
+    bench("filter_category", lambda: db_handler.search_components("", top_category), light)
+    bench("filter_category_search", lambda: db_handler.search_components("10k", top_category), light)
+    bench("sort_page_quantity", lambda: db_handler.get_all_components(order_by="quantity desc", limit=200), light)
+    bench("sort_page_date", lambda: db_handler.get_all_components(order_by="added_date desc", limit=200), light)
+    bench("sort_full_name", lambda: db_handler.search_components("", "All", order_by="name"), heavy)
+    bench("get_all_components", db_handler.get_all_components, heavy)
+    bench("category_counts", db_handler.get_category_counts, light)
+    bench("category_check", db_handler.check_category_totals, heavy)
+
+    store = ComponentStore()
+    bench("store_load", store.load, heavy)
+    bench("store_refresh_noop", store.refresh, light)
+    bench("store_filter_category", lambda: store.select(top_category, "name"), light)
+    bench("store_sort_full_name", lambda: store.select("All", "name"), heavy)
+    store.close()
+
+    fuzzy_store = ComponentStore(fuzzy=True)
+    bench("store_load_fuzzy", fuzzy_store.load, heavy)
+    bench("fuzzy_search", lambda: [fuzzy_store.fuzzy_select(t, limit=200) for t in FUZZY_TERMS], light)
+    bench("fuzzy_search_category", lambda: [fuzzy_store.fuzzy_select(t, top_category, limit=200) for t in FUZZY_TERMS], light)
+    fuzzy_store.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "export.csv")
+        bench("export_csv", lambda: export_utils.write_csv(csv_path), heavy, warmup=False)
+        if rows <= args.pdf_max_rows:
+            pdf_path = os.path.join(tmp, "export.pdf")
+            bench("export_pdf", lambda: export_utils.write_pdf(pdf_path), heavy, warmup=False)
+
+        # Toplu içe aktarma: boş bir veritabanına CSV'den
+        import_rows = min(rows, args.import_rows)
+        import_csv = os.path.join(tmp, "import.csv")
+        with open(import_csv, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=db_handler.IMPORT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(generate_rows(import_rows, seed=2))
+
+        def import_fresh():
+            db_path = os.path.join(tmp, "import.db")
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+            db_handler.use_database(db_path)
+            db_handler.setup_database()
+            db_handler.import_csv_file(import_csv)
+            db_handler.close_connections()
+
+        bench(f"import_csv_{import_rows}", import_fresh, heavy, warmup=False)
+    return results
+
+
+def measure_memory():
+    """Açık veritabanı için ComponentStore (bulanık indeksli/indekssiz) ve fetchall() tuple listesinin bellek kullanımı (MB)."""
+    def traced(func):
+        tracemalloc.start()
+        try:
+            kept = func()
+            return round(tracemalloc.get_traced_memory()[0] / 1e6, 1), kept
+        finally:
+            tracemalloc.stop()
+
+    def load(fuzzy):
+        store = ComponentStore(fuzzy=fuzzy)
+        store.load()
+        store.close()
+        return store
+
+    store_mb, _ = traced(lambda: load(False))
+    fuzzy_mb, _ = traced(lambda: load(True))
+    tuples_mb, _ = traced(db_handler.get_all_components)
+    return {"component_store": store_mb, "component_store_fuzzy": fuzzy_mb, "row_tuples": tuples_mb}
+
+
+def compare(current, baseline, threshold, noise_ms):
+    """Medyanları karşılaştırır; (satırlar, yavaşlama sayısı) döner."""
+    lines, regressions = [], 0
+    for size, benches in current.items():
+        for name, result in benches.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            now, before = result["median_ms"], base["median_ms"]
+            change = (now - before) / before if before else 0.0
+            flag = ""
+            if change > threshold and now - before > noise_ms:
+                flag = "REGRESSION"
+                regressions += 1
+            elif change < -threshold and before - now > noise_ms:
+                flag = "faster"
+            lines.append(f"{size:>8} {name:<26}{before:>11.2f}{now:>11.2f}{change * 100:>+9.1f}%  {flag}")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark db_handler and the export paths on synthetic data.")
+    parser.add_argument("--sizes", nargs="+", default=["1k", "100k"], help="row counts: 1k, 10k, 100k, 1m or a number")
+    parser.add_argument("--repeats", type=int, default=5, help="runs per light benchmark (heavy ones run repeats/5)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="where generated databases are cached")
+    parser.add_argument("--regenerate", action="store_true", help="rebuild cached synthetic databases")
+    parser.add_argument("--import-rows", type=int, default=100_000, help="max rows for the bulk import benchmark")
+    parser.add_argument("--pdf-max-rows", type=int, default=100_000, help="skip PDF export above this size")
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help=f"compare against this results file (default: {DEFAULT_BASELINE} if present)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write results to {DEFAULT_BASELINE}")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown counted as a regression")
+    parser.add_argument("--noise-ms", type=float, default=1.0, help="ignore differences smaller than this")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "search_backend": None,
+            "generator_version": GENERATOR_VERSION,
+        },
+        "results": {},
+        "memory_mb": {},
+    }
+    with open(os.devnull, "w") as devnull:
+        for size in args.sizes:
+            rows = parse_size(size)
+            print(f"[{rows} rows]", file=sys.stderr)
+            report["results"][str(rows)] = run_size(rows, args, devnull)
+            db_handler.use_database(dataset_path(args.data_dir, rows))
+            report["memory_mb"][str(rows)] = measure_memory()
+            report["meta"]["search_backend"] = db_handler.get_search_backend()
+    db_handler.close_connections()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Baseline saved to {DEFAULT_BASELINE}", file=sys.stderr)
+
+    baseline_path = args.baseline or (DEFAULT_BASELINE if os.path.exists(DEFAULT_BASELINE) and not args.save_baseline else None)
+    if not baseline_path:
+        return 0
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    lines, regressions = compare(report["results"], baseline, args.threshold, args.noise_ms)
+    print(f"\n{'rows':>8} {'benchmark':<26}{'base ms':>11}{'now ms':>11}{'change':>10}", file=sys.stderr)
+    for line in lines:
+        print(line, file=sys.stderr)
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
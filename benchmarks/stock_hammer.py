@@ -0,0 +1,157 @@
+# benchmarks/stock_hammer.py
+"""
+db_handler.adjust_stock / adjust_stock_many için eşzamanlılık testi.
+
+    python benchmarks/stock_hammer.py --threads 16 --iterations 500
+
+Geçici bir veritabanında birçok thread aynı parçaları aynı anda artırıp
+azaltır, arada çok parçalı BOM düşümleri yapar. Sonunda:
+  * son miktar = başlangıç + uygulanan toplam delta (kayıp güncelleme yok),
+  * sıfıra düşürülen parçada miktar hiç negatif olmaz ve tam 0'da kalır,
+  * strict BOM düşümü yetersiz stokta hiçbir şeyi değiştirmez,
+  * category_totals tutarlıdır.
+Bir kontrol başarısız olursa çıkış kodu 1'dir. Uygulama veritabanına dokunmaz.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db_handler  # noqa: E402
+
+PARTS = 5
+
+
+def _add_part(name, quantity):
+    return db_handler.add_component({
+        "name": name, "category": "Hammer", "drawer_code": "H1", "quantity": quantity,
+        "datasheet": "", "description": "", "image_path": "",
+    })
+
+
+def _quantity(comp_id):
+    return db_handler.get_component(comp_id)[4]
+
+
+def hammer(ids, threads, iterations, bom_every):
+    """Her thread rastgele ±delta ve ara sıra BOM düşümü yapar; parça başına toplam delta döner."""
+    totals = [dict.fromkeys(ids, 0) for _ in range(threads)]
+    errors = []
+    start_gate = threading.Barrier(threads)
+
+    def worker(index):
+        rng = random.Random(index)
+        applied = totals[index]
+        start_gate.wait()
+        try:
+            for i in range(iterations):
+                if bom_every and i % bom_every == 0:
+                    bom = [(comp_id, -rng.randint(1, 3)) for comp_id in rng.sample(ids, 3)]
+                    db_handler.adjust_stock_many(bom)
+                    for comp_id, delta in bom:
+                        applied[comp_id] += delta
+                else:
+                    comp_id, delta = rng.choice(ids), rng.choice((-2, -1, 1, 2))
+                    if db_handler.adjust_stock(comp_id, delta) is None:
+                        raise RuntimeError(f"adjust_stock({comp_id}, {delta}) failed")
+                    applied[comp_id] += delta
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db_handler.get_manager().close_thread()
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    if errors:
+        raise errors[0]
+    return {comp_id: sum(t[comp_id] for t in totals) for comp_id in ids}
+
+
+def drain(comp_id, threads, per_thread):
+    """Bütün thread'ler aynı parçayı 1'er düşer; dönen değerlerin en küçüğü."""
+    lowest = [0]
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(per_thread):
+            value = db_handler.adjust_stock(comp_id, -1)
+            with lock:
+                lowest[0] = min(lowest[0], value if value is not None else -1)
+        db_handler.get_manager().close_thread()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return lowest[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hammer atomic stock adjustments from many threads.")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=500, help="adjustments per thread")
+    parser.add_argument("--bom-every", type=int, default=10, help="every Nth operation is a 3-part BOM (0 = never)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_handler.use_database(os.path.join(tmp, "hammer.db"))
+        db_handler.setup_database()
+
+        # Başlangıç stoğu hiçbir zaman sıfıra inemeyecek kadar büyük: clamp devreye girmez
+        start_qty = args.threads * args.iterations * 3
+        ids = [_add_part(f"PART-{i}", start_qty) for i in range(PARTS)]
+
+        began = time.perf_counter()
+        applied = hammer(ids, args.threads, args.iterations, args.bom_every)
+        elapsed = time.perf_counter() - began
+        ops = args.threads * args.iterations
+        print(f"{ops} adjustments from {args.threads} threads in {elapsed:.2f} s ({ops / elapsed:.0f} ops/s)")
+
+        for comp_id in ids:
+            expected, actual = start_qty + applied[comp_id], _quantity(comp_id)
+            status = "ok" if expected == actual else "LOST UPDATES"
+            print(f"  part {comp_id}: expected {expected}, stored {actual} {status}")
+            if expected != actual:
+                failures.append(f"part {comp_id}: expected {expected}, stored {actual}")
+
+        # Sıfır sınırı: 10 adet, 16 thread × 5 düşüm
+        drain_id = _add_part("DRAIN", 10)
+        lowest = drain(drain_id, args.threads, 5)
+        final = _quantity(drain_id)
+        print(f"  drain: final {final}, lowest returned {lowest}")
+        if final != 0 or lowest < 0:
+            failures.append(f"drain: final {final}, lowest returned {lowest}")
+
+        # strict BOM: bir parça yetmezse hiçbiri düşülmez
+        before = [_quantity(i) for i in ids]
+        try:
+            db_handler.adjust_stock_many([(ids[0], -1), (drain_id, -1)], strict=True)
+            failures.append("strict BOM did not raise InsufficientStock")
+        except db_handler.InsufficientStock:
+            pass
+        if [_quantity(i) for i in ids] != before:
+            failures.append("strict BOM was partially applied")
+
+        problems = db_handler.check_category_totals()
+        if problems:
+            failures.append(f"category_totals inconsistent: {problems}")
+        db_handler.close_connections()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
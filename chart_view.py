@@ -0,0 +1,205 @@
+# chart_view.py
+import math
+
+from matplotlib.patches import Rectangle
+
+CHART_KINDS = ("pie", "bar", "treemap")
+
+BG_COLOR = '#2e2e2e'
+TEXT_COLOR = 'white'
+MAX_BAR_LABELS = 60
+
+
+def squarify(values, x, y, w, h):
+    """
+    Squarified treemap yerleşimi. values büyükten küçüğe sıralı ve pozitif
+    olmalı; her değer için (x, y, w, h) dikdörtgeni döner.
+    """
+    rects = []
+    values = list(values)
+    total = sum(values)
+    if total <= 0:
+        return [(x, y, 0, 0)] * len(values)
+    scale = w * h / total
+    areas = [v * scale for v in values]
+
+    def worst(row, side):
+        s = sum(row)
+        return max(max(side * side * a / (s * s), (s * s) / (side * side * a)) for a in row)
+
+    i = 0
+    while i < len(areas):
+        side = min(w, h)
+        row = [areas[i]]
+        i += 1
+        while i < len(areas) and worst(row + [areas[i]], side) <= worst(row, side):
+            row.append(areas[i])
+            i += 1
+
+        # Satırı kısa kenar boyunca yerleştir, kalan alanla devam et
+        s = sum(row)
+        if w >= h:
+            col_w = s / h if h else 0
+            cy = y
+            for a in row:
+                rh = a / col_w if col_w else 0
+                rects.append((x, cy, col_w, rh))
+                cy += rh
+            x, w = x + col_w, w - col_w
+        else:
+            row_h = s / w if w else 0
+            cx = x
+            for a in row:
+                rw = a / row_h if row_h else 0
+                rects.append((cx, y, rw, row_h))
+                cx += rw
+            y, h = y + row_h, h - row_h
+    return rects
+
+
+class CategoryChart:
+    """
+    Kategori grafiği çizici. Kategori kümesi değişmediyse mevcut artist'leri
+    (pasta dilimleri, çubuklar, treemap kutuları) yerinde günceller; sadece
+    kategori eklenince/silinince ya da grafik türü değişince ekseni baştan kurar.
+    Ekrana yansıtma draw_idle ile yapılır, böylece art arda güncellemeler tek
+    çizimde birleşir.
+    """
+
+    def __init__(self, ax, canvas, kind="pie"):
+        self.ax = ax
+        self.canvas = canvas
+        self.kind = kind if kind in CHART_KINDS else "pie"
+        self._cats = None
+        self._artists = None
+        self.rebuilds = 0
+        self.inplace_updates = 0
+
+    def set_kind(self, kind, cats, counts):
+        if kind != self.kind:
+            self.kind = kind
+            self._cats = None
+        self.update(cats, counts)
+
+    def update(self, cats, counts):
+        """Grafiği yeni değerlerle günceller ve draw_idle ister."""
+        cats, counts = list(cats), [max(0, c or 0) for c in counts]
+        if not cats or sum(counts) == 0:
+            self._rebuild_empty()
+        elif cats == self._cats:
+            getattr(self, f"_update_{self.kind}")(counts)
+            self.inplace_updates += 1
+        else:
+            self.ax.clear()
+            self._cats = cats
+            getattr(self, f"_build_{self.kind}")(cats, counts)
+            self.rebuilds += 1
+        self.canvas.draw_idle()
+
+    def _rebuild_empty(self):
+        self.ax.clear()
+        self._cats = None
+        self.ax.set_axis_off()
+        self.ax.text(0.5, 0.5, "No categorized components", ha="center", va="center",
+                     color=TEXT_COLOR, transform=self.ax.transAxes)
+
+    def _title(self):
+        self.ax.set_title("Category Distribution", color=TEXT_COLOR)
+
+    # --- Pie ---
+
+    def _build_pie(self, cats, counts):
+        wedges, texts, autotexts = self.ax.pie(
+            counts,
+            labels=cats,
+            autopct="%1.1f%%",
+            startangle=90,
+            textprops={"color": TEXT_COLOR},
+            wedgeprops={"edgecolor": TEXT_COLOR},
+        )
+        self._artists = (wedges, texts, autotexts)
+        self._title()
+        self.ax.legend(
+            wedges,
+            cats,
+            title="Categories",
+            loc="center left",
+            bbox_to_anchor=(1, 0, 0.3, 1),
+            facecolor=BG_COLOR,
+            edgecolor=BG_COLOR,
+        )
+
+    def _update_pie(self, counts):
+        """Dilim açılarını, etiket konumlarını ve yüzdeleri yerinde günceller."""
+        wedges, texts, autotexts = self._artists
+        total = float(sum(counts))
+        theta = 90.0
+        for wedge, label, pct, value in zip(wedges, texts, autotexts, counts):
+            frac = value / total
+            theta1, theta2 = theta, theta + 360.0 * frac
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            theta = theta2
+
+            mid = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(mid), math.sin(mid)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment("left" if x > 0 else "right")
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text(f"{100.0 * frac:.1f}%")
+
+    # --- Horizontal bar ---
+
+    def _build_bar(self, cats, counts):
+        fontsize = max(5, min(10, int(400 / max(1, len(cats)))))
+        positions = range(len(cats))
+        bars = self.ax.barh(positions, counts, color="#2196F3", linewidth=0)
+        # Yüzlerce kategoride her etiketi çizmek yavaş ve okunaksız; seyrelt
+        step = max(1, math.ceil(len(cats) / MAX_BAR_LABELS))
+        self.ax.set_yticks(list(positions)[::step])
+        self.ax.set_yticklabels(cats[::step], fontsize=fontsize, color=TEXT_COLOR)
+        self.ax.invert_yaxis()
+        self.ax.set_facecolor(BG_COLOR)
+        self.ax.tick_params(colors=TEXT_COLOR)
+        for spine in self.ax.spines.values():
+            spine.set_color("#555555")
+        self.ax.set_xlabel("Quantity", color=TEXT_COLOR)
+        self._artists = bars
+        self._title()
+
+    def _update_bar(self, counts):
+        for bar, value in zip(self._artists, counts):
+            bar.set_width(value)
+        self.ax.set_xlim(0, max(counts) * 1.05)
+
+    # --- Treemap ---
+
+    def _build_treemap(self, cats, counts):
+        self.ax.set_xlim(0, 1)
+        self.ax.set_ylim(0, 1)
+        self.ax.set_axis_off()
+        palette = [f"C{i % 10}" for i in range(len(cats))]
+        rects, labels = {}, {}
+        for cat, color in zip(cats, palette):
+            rects[cat] = self.ax.add_patch(Rectangle((0, 0), 0, 0, facecolor=color, edgecolor=BG_COLOR))
+            labels[cat] = self.ax.text(0, 0, cat, ha="center", va="center", fontsize=7,
+                                       color=TEXT_COLOR, clip_on=True)
+        self._artists = (rects, labels)
+        self._update_treemap(counts)
+        self._title()
+
+    def _update_treemap(self, counts):
+        rects, labels = self._artists
+        order = sorted((c, cat) for cat, c in zip(self._cats, counts) if c > 0)[::-1]
+        boxes = squarify([c for c, _ in order], 0, 0, 1, 1)
+        placed = set()
+        for (value, cat), (x, y, w, h) in zip(order, boxes):
+            rects[cat].set_bounds(x, y, w, h)
+            labels[cat].set_position((x + w / 2, y + h / 2))
+            # Küçük kutularda etiket gizlenir; yüzlerce kategoride okunabilirlik için
+            labels[cat].set_visible(w > 0.06 and h > 0.03)
+            placed.add(cat)
+        for cat in self._cats:
+            if cat not in placed:
+                rects[cat].set_bounds(0, 0, 0, 0)
+                labels[cat].set_visible(False)
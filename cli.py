@@ -0,0 +1,405 @@
+# cli.py
+"""
+Arayüzsüz komut satırı: gece senkronizasyonları ve betikler için.
+
+    python -m cli import components.csv        (ya da '-' ile stdin'den)
+    python -m cli export out.csv.gz            (ya da '-' ile stdout'a CSV)
+    python -m cli export report.pdf --group
+    python -m cli search "10k" --category Resistor --limit 20
+    python -m cli search "lm 317 to-220" --fuzzy   (bulanık; indeks her çağrıda baştan kurulur)
+    python -m cli search "lm371" --fuzzy --api http://127.0.0.1:8765   (çalışan sunucunun sıcak indeksiyle)
+    python -m cli adjust 42 -5                 (ya da '-' ile stdin'den "id,delta" satırları)
+    python -m cli adjust --drawer A3 "LM358" 10
+    python -m cli adjust - --atomic --strict < bom.csv   (BOM'u tek transaction'da düş)
+    python -m cli stats --json
+    python -m cli usage --days 90 --limit 20     (tüketim, günlük ortalama, kaç gün yeter)
+    python -m cli movements 42 --since 2025-01-01
+    python -m cli compact-movements --keep-days 365
+    python -m cli check-categories --rebuild
+    python -m cli serve --port 8765            (yerel HTTP/JSON API, bkz. api_server.py)
+    python -m cli --perf search "lm3"          (sonunda işlem süreleri ve yavaş sorgular stderr'e)
+
+Sadece db_handler (ve gerekirse export_utils, component_store) kullanılır; tkinter, matplotlib
+ve PIL hiç import edilmez. Veri stdout'a, mesajlar stderr'e yazılır.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+
+import app_logging
+import config
+import db_handler
+import perf
+from config import COLUMNS
+
+
+API_CONNECT_TIMEOUT = 2   # sn; --api sunucusu yoksa ya da cevap vermiyorsa hemen yerel aramaya geçilir
+API_READ_TIMEOUT = 20     # sn; sunucunun ilk bulanık isteği indeksi kurarken bekler
+
+
+def _err(message):
+    print(message, file=sys.stderr)
+
+
+def _positive_int(text):
+    """argparse type'ı: 1 veya daha büyük tamsayı (aksi halde çıkış kodu 2)."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def cmd_import(args):
+    if args.file == "-":
+        rows = db_handler.read_csv_components(sys.stdin)
+        added, duplicates, invalid = db_handler.import_components(rows, batch_size=args.batch_size)
+    else:
+        added, duplicates, invalid = db_handler.import_csv_file(args.file)
+    _err(f"Imported {added} component(s), skipped {duplicates} duplicate(s).")
+    if invalid:
+        _err(f"Skipped {invalid} row(s) with an empty name or drawer_code.")
+    return 0
+
+
+def cmd_export(args):
+    import export_utils   # reportlab sadece PDF yazılırken yüklenir
+    return export_utils.main(
+        [args.output, "--batch-size", str(args.batch_size)]
+        + (["--gzip"] if args.gzip else [])
+        + (["--group"] if args.group else [])
+    )
+
+
+class ApiServerError(Exception):
+    """--api sunucusu hata döndü (4xx/5xx); sessizce yerel aramaya düşülmez."""
+
+
+def _api_get(conn, path):
+    """GET path; 200 değilse sunucunun hata mesajıyla ApiServerError."""
+    conn.request("GET", path)
+    resp = conn.getresponse()
+    body = resp.read()
+    if resp.status != 200:
+        try:
+            message = json.loads(body).get("error", "")
+        except (ValueError, AttributeError):
+            message = body[:200].decode("utf-8", "replace")
+        raise ApiServerError(f"API server returned {resp.status} for {path.split('?')[0]}: {message}")
+    return json.loads(body)
+
+
+def _fuzzy_via_api(args):
+    """
+    --api ile verilen sunucunun sıcak indeksiyle arar (bkz. serve). Sunucuya
+    bağlanılamazsa ya da /health başka bir veritabanı bildirirse None döner
+    ve çağıran yerelde arar; sunucu hata dönerse ApiServerError.
+    """
+    from http.client import HTTPConnection
+    from urllib.parse import urlencode, urlsplit
+    url = urlsplit(args.api if "//" in args.api else "http://" + args.api)
+    base = url.path.rstrip("/")
+    conn = HTTPConnection(url.hostname, url.port or 80, timeout=API_CONNECT_TIMEOUT)
+    try:
+        try:
+            conn.connect()
+        except OSError as e:
+            _err(f"Cannot reach API server at {args.api} ({e}); searching locally.")
+            return None
+        # Bağlantı kuruldu; sunucu sonraki istek için yeniden bağlanırsa da
+        # ilk bulanık isteğin indeks kurulumunu bekleyebilecek süre
+        conn.timeout = API_READ_TIMEOUT
+        conn.sock.settimeout(API_READ_TIMEOUT)
+
+        served = _api_get(conn, f"{base}/health").get("db_path")
+        local = db_handler.database_path()
+        if not served or os.path.normcase(os.path.realpath(served)) != os.path.normcase(os.path.realpath(local)):
+            _err(f"API server at {args.api} serves {served or 'an unknown database'}, not {local}; "
+                 "searching locally.")
+            return None
+
+        params = {"q": args.term, "category": args.category, "fuzzy": "1"}
+        if args.limit is not None:
+            params["limit"] = args.limit
+        if args.sort:
+            params["sort"] = args.sort
+        if args.desc:
+            params["desc"] = "1"
+        items = _api_get(conn, f"{base}/components?{urlencode(params)}")
+        return [tuple(item.get(c) for c in COLUMNS) for item in items]
+    finally:
+        conn.close()
+
+
+def _fuzzy_search(args):
+    """
+    Bulanık arama: --api verildiyse o sunucunun sıcak indeksiyle, yoksa
+    bellekte indeks kurup arar (büyük envanterde saniyeler sürer). Terim
+    çok kısaysa None.
+    """
+    if args.api:
+        rows = _fuzzy_via_api(args)
+        if rows is not None:
+            return rows
+    from component_store import ComponentStore
+    store = ComponentStore(fuzzy=True)
+    try:
+        store.load()
+        return store.fuzzy_select(args.term, args.category, args.sort, desc=args.desc, limit=args.limit)
+    finally:
+        store.close()
+
+
+def cmd_search(args):
+    rows = _fuzzy_search(args) if args.fuzzy and args.term.strip() else None
+    if rows is None:
+        order_by = f"{args.sort} desc" if args.sort and args.desc else args.sort
+        rows = db_handler.search_components(args.term, args.category, limit=args.limit, order_by=order_by)
+    if args.json:
+        for row in rows:
+            sys.stdout.write(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + "\n")
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+    return 0
+
+
+def _iter_adjustments(stream):
+    """stdin'den "id,delta" ya da "name,drawer_code,delta" satırları."""
+    for line_no, fields in enumerate(csv.reader(stream), start=1):
+        fields = [f.strip() for f in fields]
+        if not fields or not fields[0] or fields[0].startswith("#"):
+            continue
+        try:
+            if len(fields) == 2:
+                yield line_no, int(fields[0]), int(fields[1])
+            elif len(fields) == 3:
+                yield line_no, db_handler.find_component_id(fields[0], fields[1]), int(fields[2])
+            else:
+                raise ValueError("expected 'id,delta' or 'name,drawer_code,delta'")
+        except ValueError as e:
+            _err(f"line {line_no}: {e}")
+            yield line_no, None, None
+
+
+def cmd_adjust(args):
+    if args.target == "-":
+        adjustments = _iter_adjustments(sys.stdin)
+    else:
+        if args.delta is None:
+            _err("adjust: DELTA is required unless reading from '-'")
+            return 2
+        if args.drawer is not None:
+            comp_id = db_handler.find_component_id(args.target, args.drawer)
+        else:
+            try:
+                comp_id = int(args.target)
+            except ValueError:
+                _err("adjust: TARGET must be an id, or a name together with --drawer")
+                return 2
+        adjustments = [(None, comp_id, args.delta)]
+
+    if args.atomic:
+        return _adjust_atomic(adjustments, args.strict)
+
+    failures = 0
+    for line_no, comp_id, delta in adjustments:
+        quantity = db_handler.adjust_stock(comp_id, delta) if comp_id is not None and delta is not None else None
+        if quantity is None:
+            failures += 1
+            if delta is not None:
+                _err(f"{'line %d: ' % line_no if line_no else ''}component not found")
+            continue
+        print(f"{comp_id},{quantity}")
+    return 1 if failures else 0
+
+
+def _adjust_atomic(adjustments, strict):
+    """Tüm satırları tek transaction'da uygular; bir hata hepsini geri alır."""
+    deltas = []
+    for line_no, comp_id, delta in adjustments:
+        if comp_id is None or delta is None:
+            _err(f"{'line %d: ' % line_no if line_no else ''}component not found; nothing was changed")
+            return 1
+        deltas.append((comp_id, delta))
+    try:
+        results = db_handler.adjust_stock_many(deltas, strict=strict)
+    except KeyError as e:
+        _err(f"component {e.args[0]} not found; nothing was changed")
+        return 1
+    except db_handler.InsufficientStock as e:
+        _err(f"{e}; nothing was changed")
+        return 1
+    for comp_id, quantity in results.items():
+        print(f"{comp_id},{quantity}")
+    return 0
+
+
+def cmd_stats(args):
+    items, total_qty, out_of_stock = db_handler.execute_query(
+        "SELECT COUNT(*), coalesce(SUM(quantity), 0), coalesce(SUM(quantity <= 0), 0) FROM components",
+        fetch="one",
+    )
+    categories = db_handler.get_category_counts()
+    stats = {
+        "database": db_handler.get_db_path(),
+        "components": items,
+        "total_quantity": total_qty,
+        "out_of_stock": out_of_stock,
+        "categories": len(categories),
+        "search_backend": db_handler.get_search_backend(),
+    }
+    if args.json:
+        stats["by_category"] = dict(categories)
+        print(json.dumps(stats, ensure_ascii=False))
+    else:
+        for key, value in stats.items():
+            print(f"{key}: {value}")
+    return 0
+
+
+def cmd_usage(args):
+    rows = db_handler.get_usage(args.days, comp_id=args.id, limit=args.limit)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["id", "name", "drawer_code", "quantity", "consumed", "received", "per_day", "days_left"])
+    for comp_id, name, drawer, quantity, consumed, received in rows:
+        per_day = consumed / args.days
+        days_left = round(quantity / per_day) if per_day and quantity is not None else ""
+        writer.writerow([comp_id, name, drawer, quantity, consumed, received, f"{per_day:.2f}", days_left])
+    return 0
+
+
+def cmd_movements(args):
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["ts", "delta", "quantity_after"])
+    writer.writerows(db_handler.get_movements(args.id, since=args.since, until=args.until, limit=args.limit))
+    return 0
+
+
+def cmd_compact_movements(args):
+    removed = db_handler.compact_movements(args.keep_days)
+    _err(f"Folded {removed} movement(s) older than {args.keep_days} day(s) into daily rollups.")
+    return 0
+
+
+def cmd_check_categories(args):
+    problems = db_handler.check_category_totals(rebuild=args.rebuild)
+    for category, expected, stored in problems:
+        print(f"{category}: expected (qty, items)={expected}, stored={stored}")
+    if not problems:
+        print("category_totals is consistent.")
+    elif args.rebuild:
+        print(f"Rebuilt category_totals ({len(problems)} inconsistent categories).")
+    return 1 if problems and not args.rebuild else 0
+
+
+def cmd_serve(args):
+    import api_server
+    return api_server.serve(args.host, args.port, args.workers, args.verbose)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Component library command line.")
+    parser.add_argument("--perf", action="store_true", help="print operation timings and slow queries to stderr")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="import components from CSV")
+    p.add_argument("file", help="CSV path or '-' for stdin")
+    p.add_argument("--batch-size", type=int, default=db_handler.IMPORT_BATCH_SIZE)
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="export components to CSV, CSV.GZ or PDF")
+    p.add_argument("output", help="output path ('-' for CSV on stdout)")
+    p.add_argument("--gzip", action="store_true", help="gzip-compress the CSV output")
+    p.add_argument("--group", action="store_true", help="PDF: group by category with subtotals")
+    p.add_argument("--batch-size", type=int, default=2000)
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("search", help="search components, CSV (or JSON lines) on stdout")
+    p.add_argument("term", nargs="?", default="")
+    p.add_argument("--category", default="All")
+    p.add_argument("--limit", type=int)
+    p.add_argument("--sort", choices=sorted(db_handler.SORT_EXPRESSIONS), help="sort column (default: relevance)")
+    p.add_argument("--desc", action="store_true", help="sort descending")
+    p.add_argument("--json", action="store_true", help="one JSON object per line")
+    p.add_argument("--fuzzy", action="store_true",
+                   help="typo-tolerant, part-number-aware match on name and drawer code. "
+                        "Each call builds the index from scratch, which takes seconds at 100k+ rows; "
+                        "use --api to query a running server's warm index instead. Default search is FTS")
+    p.add_argument("--api", metavar="URL",
+                   help=f"with --fuzzy: API server to query (e.g. http://{config.API_HOST}:{config.API_PORT}, "
+                        "see 'serve'); used only if its /health reports the same database")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("adjust", help="change stock quantity, prints 'id,new_quantity'")
+    p.add_argument("target", help="component id, name (with --drawer) or '-' for stdin")
+    p.add_argument("delta", nargs="?", type=int, help="quantity change, e.g. 10 or -3")
+    p.add_argument("--drawer", help="drawer code when TARGET is a component name")
+    p.add_argument("--atomic", action="store_true", help="apply all lines in one transaction (all or nothing)")
+    p.add_argument("--strict", action="store_true", help="with --atomic: fail instead of clamping stock at 0")
+    p.set_defaults(func=cmd_adjust)
+
+    p = sub.add_parser("stats", help="inventory summary")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("usage", help="consumption per part from the daily rollups")
+    p.add_argument("--days", type=_positive_int, default=90)
+    p.add_argument("--id", type=int, help="only this component")
+    p.add_argument("--limit", type=int)
+    p.set_defaults(func=cmd_usage)
+
+    p = sub.add_parser("movements", help="raw stock movements of one component, newest first")
+    p.add_argument("id", type=int)
+    p.add_argument("--since", help="YYYY-MM-DD[ HH:MM:SS]")
+    p.add_argument("--until", help="YYYY-MM-DD[ HH:MM:SS] (exclusive)")
+    p.add_argument("--limit", type=int)
+    p.set_defaults(func=cmd_movements)
+
+    p = sub.add_parser("compact-movements", help="fold old movements into the daily rollups")
+    p.add_argument("--keep-days", type=int, default=365, help="keep raw movements of the last N days")
+    p.set_defaults(func=cmd_compact_movements)
+
+    p = sub.add_parser("check-categories", help="verify the category_totals aggregate")
+    p.add_argument("--rebuild", action="store_true", help="rebuild category_totals if inconsistent")
+    p.set_defaults(func=cmd_check_categories)
+
+    p = sub.add_parser("serve", help="serve the database as a local HTTP/JSON API")
+    p.add_argument("--host", default=config.API_HOST)
+    p.add_argument("--port", type=int, default=config.API_PORT)
+    p.add_argument("--workers", type=int, default=config.API_WORKERS)
+    p.add_argument("--verbose", action="store_true", help="log every request to stderr")
+    p.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # Uyarılar stderr'e, her şey APP_DIR/app.log'a; serve --verbose erişim kayıtlarını da gösterir
+    app_logging.setup_logging(console_level=logging.INFO if getattr(args, "verbose", False) else logging.WARNING)
+    if args.perf:
+        perf.enable()
+    db_handler.setup_database()
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # Çıktı erken kapandı (ör. "| head"); kalan yazımlar sessizce atılsın
+        sys.stdout = open(os.devnull, "w")
+        return 0
+    except (OSError, ValueError, ApiServerError, db_handler.sqlite3.Error) as e:
+        _err(f"{args.command}: {e}")
+        return 1
+    finally:
+        db_handler.close_connections()
+        if args.perf:
+            _err(perf.report())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
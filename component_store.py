@@ -0,0 +1,443 @@
+# component_store.py
+"""
+Bileşen tablosunun bellekteki okuma modeli.
+
+Satırlar sütun sütun tutulur: id ve quantity array('q') içinde tamsayı,
+tekrar eden değerler (category, drawer_code, added_date) bir kez saklanıp
+satır başına array('I') kodu olarak, serbest metinler (name, datasheet,
+description, image_path) düz listelerde. id ile indekslenen bir array
+(id → satır konumu) tekil erişimi O(1) yapar; silme, son satırı boşluğa
+taşıyarak O(1)'dir.
+
+refresh() önce kendi bağlantısında PRAGMA data_version'a bakar: başka bir
+bağlantı (uygulamanın kendi havuzu, CLI, API) commit etmediyse tek bir PRAGMA
+ile döner. Değiştiyse component_changes günlüğünden son görülen seq'ten
+sonraki id'ler okunur ve sadece o satırlar yeniden yüklenir. Günlük budanmış
+ya da değişiklik çok fazlaysa tam yükleme yapılır.
+
+fuzzy=True ile name/drawer_code üzerinde bir fuzzy_search.FuzzyIndex de
+tutulur; yükleme, yamalama ve silme onu da günceller (bkz. fuzzy_select()).
+
+Bellek (100k satır, CPython 3.11, 64 bit): bkz. README "In-Memory Component Store".
+"""
+import itertools
+import threading
+from array import array
+
+import db_handler
+import perf
+from config import COLUMNS
+from fuzzy_search import FuzzyIndex
+
+INT_COLUMNS = ("id", "quantity")
+CODED_COLUMNS = ("category", "drawer_code", "added_date")
+TEXT_COLUMNS = ("name", "datasheet", "description", "image_path")
+
+# Bu kadardan fazla değişiklik varsa satır satır yamamak yerine tam yükleme
+RELOAD_THRESHOLD = 5000
+_FETCH_CHUNK = 500   # IN (...) başına id sayısı
+
+
+def _to_int(value):
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class Component:
+    """Tek bir bileşenin tipli anlık görüntüsü (id ve quantity int)."""
+
+    __slots__ = tuple(COLUMNS)
+
+    def __init__(self, *values):
+        for name, value in zip(COLUMNS, values):
+            setattr(self, name, value)
+
+    def as_row(self):
+        return tuple(getattr(self, name) for name in COLUMNS)
+
+    def as_form(self):
+        """Form alanlarıyla karşılaştırmak için sütun → metin sözlüğü (None → "")."""
+        return {name: "" if getattr(self, name) is None else str(getattr(self, name)) for name in COLUMNS}
+
+    def __repr__(self):
+        return f"Component(id={self.id}, name={self.name!r}, quantity={self.quantity})"
+
+
+class _Codes:
+    """Tekrar eden değerler için sözlük: değer ↔ küçük tamsayı kodu, kod başına satır sayısı."""
+
+    __slots__ = ("values", "codes", "counts")
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+        self.counts = []
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            self.counts.append(0)
+        self.counts[code] += 1
+        return code
+
+    def release(self, code):
+        self.counts[code] -= 1
+
+
+class _IdIndex:
+    """
+    id → satır konumu. AUTOINCREMENT id'ler yoğun olduğundan sözlük yerine id
+    ile indekslenen array('i') kullanılır (id başına 4 bayt, -1 = yok). Negatif
+    ya da çok seyrek (dev) id'ler küçük bir sözlüğe düşer.
+    """
+
+    __slots__ = ("slots", "extra")
+
+    def __init__(self):
+        self.slots = array("i")
+        self.extra = {}
+
+    def _dense(self, comp_id):
+        return 0 <= comp_id < len(self.slots) + 1_000_000 + 4 * len(self.slots)
+
+    def get(self, comp_id):
+        if 0 <= comp_id < len(self.slots):
+            pos = self.slots[comp_id]
+            return pos if pos >= 0 else None
+        return self.extra.get(comp_id)
+
+    def set(self, comp_id, pos):
+        if not self._dense(comp_id):
+            self.extra[comp_id] = pos
+            return
+        if comp_id >= len(self.slots):
+            self.slots.extend(itertools.repeat(-1, comp_id + 1 - len(self.slots)))
+        self.slots[comp_id] = pos
+
+    def pop(self, comp_id):
+        pos = self.get(comp_id)
+        if pos is not None:
+            if 0 <= comp_id < len(self.slots):
+                self.slots[comp_id] = -1
+            else:
+                del self.extra[comp_id]
+        return pos
+
+
+class ComponentStore:
+    """
+    components tablosunun sütunsal, tipli kopyası. Bütün metotlar thread
+    güvenlidir (arama worker'ı select() yaparken UI thread'i refresh() edebilir).
+    """
+
+    def __init__(self, db_path=None, fuzzy=False):
+        self.db_path = db_path
+        self.fuzzy = fuzzy
+        self.loaded = False
+        self._conn = None
+        self._lock = threading.RLock()
+        self._data_version = None
+        self._last_seq = 0
+        self._reset()
+
+    def _reset(self):
+        self._ints = {c: array("q") for c in INT_COLUMNS}
+        self._coded = {c: array("I") for c in CODED_COLUMNS}
+        self._codes = {c: _Codes() for c in CODED_COLUMNS}
+        self._texts = {c: [] for c in TEXT_COLUMNS}
+        self._pos = _IdIndex()
+        self._fuzzy = FuzzyIndex() if self.fuzzy else None
+
+    def _connection(self):
+        if self._conn is None:
+            manager = db_handler.get_manager()
+            if self.db_path is None:
+                self.db_path = manager.db_path
+            self._conn = manager.open_dedicated()
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Loading ---
+
+    @perf.timed("store.load")
+    def load(self):
+        """Bütün tabloyu tek bir okuma transaction'ında (tutarlı anlık görüntü) yükler."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+                # Günlük boş olsa da sqlite_sequence son verilen seq'i bilir
+                self._last_seq = conn.execute(
+                    "SELECT coalesce(max(seq), 0) FROM sqlite_sequence WHERE name = 'component_changes'"
+                ).fetchone()[0]
+                cur = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM components")
+                self._reset()
+                while True:
+                    batch = cur.fetchmany(2000)
+                    if not batch:
+                        break
+                    self._extend(batch)
+            finally:
+                conn.execute("COMMIT")
+            self.loaded = True
+        return len(self)
+
+    @perf.timed("store.refresh")
+    def refresh(self, reload=True):
+        """
+        Son yüklemeden beri değişen id'leri yeniden okur.
+        Değişen id'lerin kümesini döner (değişiklik yoksa boş küme);
+        tam yükleme gerektiyse None döner (çağıran bütün görünümü yenilemeli).
+        reload=False ise tam yükleme yapılmaz, store eski haliyle kalır: çağıran
+        yeni bir store'u arka planda yükleyebilir.
+        """
+        with self._lock:
+            if not self.loaded:
+                if reload:
+                    self.load()
+                return None
+            conn = self._connection()
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return set()
+
+            conn.execute("BEGIN")
+            try:
+                self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+                oldest = conn.execute("SELECT min(seq) FROM component_changes").fetchone()[0]
+                changes = conn.execute(
+                    "SELECT seq, component_id FROM component_changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                    (self._last_seq, RELOAD_THRESHOLD + 1),
+                ).fetchall()
+                # Günlük okuyucunun gördüğü yerden ileri budanmışsa ara değişiklikler kayıp
+                pruned = oldest is not None and oldest > self._last_seq + 1
+                needs_reload = pruned or len(changes) > RELOAD_THRESHOLD
+                if not needs_reload:
+                    ids = {comp_id for _, comp_id in changes}
+                    if changes:
+                        self._last_seq = changes[-1][0]
+                    self._apply(conn, ids)
+            finally:
+                conn.execute("COMMIT")
+            if needs_reload:
+                if reload:
+                    self.load()
+                return None
+            return ids
+
+    def _apply(self, conn, ids):
+        """ids'in güncel hallerini okur: var olanlar yamalanır/eklenir, olmayanlar silinir."""
+        ids = list(ids)
+        found = set()
+        for start in range(0, len(ids), _FETCH_CHUNK):
+            chunk = ids[start:start + _FETCH_CHUNK]
+            rows = conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM components WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for row in rows:
+                found.add(row[0])
+                self._upsert(row)
+        for comp_id in ids:
+            if comp_id not in found:
+                self._remove(comp_id)
+
+    # --- Column storage ---
+
+    def _extend(self, rows):
+        """Toplu ekleme: satırlar sütunlara çevrilip her sütun tek extend ile eklenir."""
+        columns = dict(zip(COLUMNS, zip(*rows)))
+        start = len(self._ints["id"])
+        for pos, comp_id in enumerate(columns["id"], start):
+            self._pos.set(comp_id, pos)
+        for c in INT_COLUMNS:
+            try:
+                self._ints[c].extend(columns[c])
+            except TypeError:   # NULL ya da metin: hücre hücre çevir
+                self._ints[c].extend(map(_to_int, columns[c]))
+        for c in CODED_COLUMNS:
+            self._coded[c].extend(map(self._codes[c].encode, columns[c]))
+        for c in TEXT_COLUMNS:
+            self._texts[c].extend(columns[c])
+        if self._fuzzy is not None:
+            self._fuzzy.add_many(zip(columns["id"], columns["name"], columns["drawer_code"]))
+
+    def _append(self, row):
+        values = dict(zip(COLUMNS, row))
+        self._pos.set(values["id"], len(self._ints["id"]))
+        for c in INT_COLUMNS:
+            self._ints[c].append(_to_int(values[c]))
+        for c in CODED_COLUMNS:
+            self._coded[c].append(self._codes[c].encode(values[c]))
+        for c in TEXT_COLUMNS:
+            self._texts[c].append(values[c])
+        if self._fuzzy is not None:
+            self._fuzzy.add(values["id"], values["name"], values["drawer_code"])
+
+    def _upsert(self, row):
+        pos = self._pos.get(row[0])
+        if pos is None:
+            self._append(row)
+            return
+        values = dict(zip(COLUMNS, row))
+        if self._fuzzy is not None:
+            old_name, old_drawer = self._texts["name"][pos], self._value("drawer_code", pos)
+            if (old_name, old_drawer) != (values["name"], values["drawer_code"]):
+                self._fuzzy.discard(row[0], old_name, old_drawer)
+                self._fuzzy.add(row[0], values["name"], values["drawer_code"])
+        self._ints["quantity"][pos] = _to_int(values["quantity"])
+        for c in CODED_COLUMNS:
+            codes = self._codes[c]
+            codes.release(self._coded[c][pos])
+            self._coded[c][pos] = codes.encode(values[c])
+        for c in TEXT_COLUMNS:
+            self._texts[c][pos] = values[c]
+
+    def _remove(self, comp_id):
+        pos = self._pos.pop(comp_id)
+        if pos is None:
+            return
+        if self._fuzzy is not None:
+            self._fuzzy.discard(comp_id, self._texts["name"][pos], self._value("drawer_code", pos))
+        for c in CODED_COLUMNS:
+            self._codes[c].release(self._coded[c][pos])
+        last = len(self._ints["id"]) - 1
+        columns = list(self._ints.values()) + list(self._coded.values()) + list(self._texts.values())
+        if pos != last:
+            # Son satırı boşluğa taşı: silme O(1), sıra zaten görünümde belirlenir
+            for column in columns:
+                column[pos] = column[last]
+            self._pos.set(self._ints["id"][pos], pos)
+        for column in columns:
+            column.pop()
+
+    def _value(self, column, pos):
+        return self._codes[column].values[self._coded[column][pos]]
+
+    # --- Reads ---
+
+    def __len__(self):
+        return len(self._ints["id"])
+
+    def __contains__(self, comp_id):
+        return self._pos.get(_to_int(comp_id)) is not None
+
+    def _rows_at(self, positions):
+        """Konumlardaki satırlar; sütun sütun toplanıp zip ile tuple'a çevrilir."""
+        columns = []
+        for c in COLUMNS:
+            if c in self._ints:
+                column = self._ints[c]
+                columns.append([column[i] for i in positions])
+            elif c in self._coded:
+                column, values = self._coded[c], self._codes[c].values
+                columns.append([values[column[i]] for i in positions])
+            else:
+                column = self._texts[c]
+                columns.append([column[i] for i in positions])
+        return list(zip(*columns))
+
+    def row(self, comp_id):
+        """COLUMNS sırasında satır tuple'ı (yoksa None). comp_id str de olabilir (Treeview iid)."""
+        with self._lock:
+            pos = self._pos.get(_to_int(comp_id))
+            return self._rows_at((pos,))[0] if pos is not None else None
+
+    def get(self, comp_id):
+        """Tipli Component (yoksa None)."""
+        row = self.row(comp_id)
+        return Component(*row) if row is not None else None
+
+    def categories(self):
+        """En az bir bileşeni olan, boş olmayan kategoriler (get_distinct_categories gibi sıralı)."""
+        with self._lock:
+            codes = self._codes["category"]
+            return sorted(v for v, n in zip(codes.values, codes.counts) if n > 0 and v)
+
+    @perf.timed("store.select")
+    def select(self, category="All", order_by="name", desc=False):
+        """
+        Kategoriye göre süzülmüş satırlar, db_handler.order_by_clause ile aynı
+        sırada (aynı yönde id ile eşitlik çözümü). Veritabanına gidilmez.
+        """
+        if order_by not in COLUMNS:
+            raise ValueError(f"cannot sort by {order_by!r}")
+        with self._lock:
+            if category == "All":
+                positions = range(len(self._ints["id"]))
+            else:
+                code = self._codes["category"].codes.get(category)
+                if code is None:
+                    return []
+                cats = self._coded["category"]
+                positions = [i for i, c in enumerate(cats) if c == code]
+            return self._rows_at(self._order(positions, order_by, desc))
+
+    @perf.timed("store.fuzzy_select")
+    def fuzzy_select(self, term, category="All", order_by=None, desc=False, limit=None):
+        """
+        term'e name/drawer_code üzerinden bulanık uyan satırlar: order_by
+        verilmezse benzerlik skoruna göre, verilirse select() ile aynı sırada.
+        limit kategori süzgecinden sonra uygulanır. İndeks yoksa (fuzzy=False
+        ya da henüz yüklenmedi) veya terim çok kısaysa None döner.
+        """
+        if order_by is not None and order_by not in COLUMNS:
+            raise ValueError(f"cannot sort by {order_by!r}")
+        with self._lock:
+            if self._fuzzy is None or not self.loaded:
+                return None
+            hits = self._fuzzy.search(term, limit=None if category != "All" else limit)
+            if hits is None:
+                return None
+            positions = [self._pos.get(comp_id) for comp_id, _ in hits]
+            if category != "All":
+                code = self._codes["category"].codes.get(category)
+                cats = self._coded["category"]
+                positions = [i for i in positions if cats[i] == code]
+                if limit is not None:
+                    positions = positions[:limit]
+            if order_by is not None:
+                positions = self._order(positions, order_by, desc)
+            return self._rows_at(positions)
+
+    def drop_fuzzy(self):
+        """Bulanık indeksi bırakır (belleği geri verir); fuzzy_select() None döner."""
+        with self._lock:
+            self.fuzzy = False
+            self._fuzzy = None
+
+    def _order(self, positions, order_by, desc):
+        """Konumları order_by sütununa göre sıralar (NULL en küçük, eşitlikte id)."""
+        ids = self._ints["id"]
+        # Önce aynı yönde id'ye göre, sonra anahtara göre kararlı sıralama:
+        # eşit anahtarlar id sırasında kalır, satır başına tuple anahtar gerekmez
+        ordered = sorted(positions, key=ids.__getitem__, reverse=desc)
+        if order_by == "quantity":
+            ordered.sort(key=self._ints["quantity"].__getitem__, reverse=desc)
+        elif order_by in CODED_COLUMNS:
+            # Anahtar kod başına bir kez hesaplanır ve tamsayı sıraya çevrilir
+            make_key = db_handler.SORT_KEYS[order_by]
+            keys = [make_key(v) for v in self._codes[order_by].values]
+            rank_of = {key: rank for rank, key in enumerate(sorted(set(keys)))}
+            ranks = [rank_of[key] for key in keys]
+            column = self._coded[order_by]
+            ordered.sort(key=lambda i: ranks[column[i]], reverse=desc)
+        elif order_by in TEXT_COLUMNS:
+            column = self._texts[order_by]
+            nulls = [i for i in ordered if column[i] is None]   # NULL en küçük
+            ordered = [i for i in ordered if column[i] is not None]
+            ordered.sort(key=lambda i: db_handler.fold_nocase(column[i]), reverse=desc)
+            ordered = ordered + nulls if desc else nulls + ordered
+        return ordered
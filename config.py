@@ -1,6 +1,9 @@
 # config.py
 
 import os, sys, json
+import logging
+import tempfile
+import threading
 
 def resource_path(rel_path):
     """
@@ -23,25 +26,171 @@ DB_FILE = os.path.join(os.path.dirname(__file__), "components.db")
 # Bu satırı config.py dosyanıza ekleyin
 IMAGE_PREVIEW_SIZE = (200, 200)
 
+# Canlı arama: son tuş vuruşundan sonra sorgu için beklenecek süre (ms)
+# ve arka plan işlerinin sonuç kuyruğunun kontrol edilme aralığı (ms)
+SEARCH_DEBOUNCE_MS = 250
+JOB_POLL_MS = 30
+
+# Grafik güncellemelerinin tek çizimde birleştirildiği pencere (ms)
+CHART_COALESCE_MS = 100
+
 # AppData dizini içinde özel klasör oluştur
-APP_DIR = os.path.join(os.getenv("LOCALAPPDATA"), "ComponentTracker")
+# (LOCALAPPDATA olmayan ortamlarda — ör. Linux CI'da benchmark — ~/AppData/Local kullanılır)
+APP_DIR = os.path.join(
+    os.getenv("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local"),
+    "ComponentTracker",
+)
 os.makedirs(APP_DIR, exist_ok=True)
 
+# Resim önizleme küçük resim önbelleği: disk klasörü ve bellek bütçesi (MB)
+THUMBNAIL_CACHE_DIR = os.path.join(APP_DIR, "thumbnails")
+THUMBNAIL_MEMORY_MB = 64
+# Arka planda resim decode eden thread sayısı ve seçimin iki yanında önceden yüklenecek satır sayısı
+IMAGE_DECODE_WORKERS = 2
+IMAGE_PREFETCH_ROWS = 2
+# Açılışta senkron yüklenen satır sayısı; kalanı ilk çizimden sonra arka planda gelir
+INITIAL_PAGE_ROWS = 200
+
+# Log dosyası (app_logging.py): APP_DIR/app.log, dolunca döndürülür
+LOG_FILE = os.path.join(APP_DIR, "app.log")
+LOG_MAX_BYTES = 1 << 20   # 1 MB
+LOG_BACKUP_COUNT = 3
+
+# Performance paneli (F12) yenileme aralığı (ms)
+PERF_PANEL_REFRESH_MS = 1000
+
+# Bellekteki bileşen store'unun başka bağlantıların değişikliklerini kontrol etme aralığı (ms)
+STORE_POLL_MS = 1000
+# Bulanık aramada tabloya gelen en fazla satır (benzerliğe göre en iyileri)
+FUZZY_RESULT_LIMIT = 1000
+
+# Yerel HTTP/JSON API (api_server.py): dinlenen adres ve sabit worker havuzu
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_WORKERS = 8
+API_MAX_BODY = 1 << 20   # 1 MB
+
 SETTINGS_FILE = os.path.join(os.path.expanduser("~"), ".component_tracker_settings.json")
 DEFAULT_SETTINGS = {
     "window_size": (1300, 750),
     "column_widths": {},
-    "theme": "dark"  
+    "theme": "dark",
+    # Modül bazında log seviyeleri ("root" varsayılandır), ör. {"db_handler": "DEBUG"}
+    "log_levels": {"root": "INFO"},
+    # Arama kutusu bulanık (trigram, parça numarası duyarlı) modda mı
+    "fuzzy_search": False,
 }
 
+log = logging.getLogger(__name__)
+
+class SettingsStore:
+    """
+    Ayarların bellekteki tek kopyası.
+
+    Dosya ilk erişimde bir kez okunur; get() her zaman bellekten döner.
+    set() değeri hemen günceller, gözlemcileri bilgilendirir ve diske yazmayı
+    kısa bir zamanlayıcıyla erteler — art arda gelen değişiklikler tek yazmada
+    birleşir. Yazma geçici dosyaya yapılıp os.replace ile atomik olarak taşınır.
+    """
+
+    def __init__(self, path, defaults, flush_delay=0.5):
+        self.path = path
+        self.defaults = defaults
+        self.flush_delay = flush_delay
+        self._data = None
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.RLock()
+        self._observers = {}   # key -> [callback(key, value), ...]
+
+    def _ensure_loaded(self):
+        if self._data is not None:
+            return
+        data = dict(self.defaults)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log.warning("%s okunamadı, varsayılanlar kullanılıyor: %s", self.path, e)
+        self._data = data
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._ensure_loaded()
+            return self._data.get(key, default)
+
+    def snapshot(self):
+        """Tüm ayarların sığ bir kopyası."""
+        with self._lock:
+            self._ensure_loaded()
+            return dict(self._data)
+
+    def set(self, key, value):
+        """Değeri günceller; değiştiyse yazmayı planlar ve gözlemcileri çağırır."""
+        with self._lock:
+            self._ensure_loaded()
+            if self._data.get(key) == value:
+                return
+            self._data[key] = value
+            self._schedule_flush()
+            callbacks = list(self._observers.get(key, ()))
+        for callback in callbacks:
+            callback(key, value)
+
+    def update(self, values):
+        for key, value in values.items():
+            self.set(key, value)
+
+    def observe(self, key, callback):
+        """key değiştiğinde callback(key, value) çağrılır. Aboneliği iptal eden fonksiyon döner."""
+        with self._lock:
+            self._observers.setdefault(key, []).append(callback)
+        return lambda: self._observers.get(key, []).remove(callback)
+
+    def _schedule_flush(self):
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Bekleyen değişiklikleri hemen diske yazar (kapanışta çağrılır)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            data = dict(self._data)
+            self._dirty = False
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.error("Ayarlar kaydedilemedi: %s", e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+# Uygulamanın paylaştığı tek ayar deposu
+settings = SettingsStore(SETTINGS_FILE, DEFAULT_SETTINGS)
+
 def load_settings():
-    if os.path.exists(SETTINGS_FILE):
-        return json.load(open(SETTINGS_FILE))
-    return DEFAULT_SETTINGS.copy()
+    """Geriye dönük uyumluluk: ayarların bir kopyasını döner (diske gitmez)."""
+    return settings.snapshot()
 
-def save_settings(settings):
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(settings, f, indent=2)
+def save_settings(new_settings):
+    """Geriye dönük uyumluluk: değerleri depoya yazar, diske yazım birleştirilir."""
+    settings.update(new_settings)
 
 DB_NAME = "components.db"
 
@@ -1,11 +1,20 @@
 # db_handler.py
 import sqlite3
+import csv
 import datetime
+import io
+import itertools
+import logging
+import re
 from config import DB_NAME, COLUMNS, APP_DIR, resource_path
 import os
 import shutil
-import sqlite3
+import threading
+import time
 import config
+import perf
+
+log = logging.getLogger(__name__)
 
 # db_handler.py en üstüne ekle:
 import os
@@ -29,46 +38,191 @@ def get_db_path():
     # Yoksa geliştirme ortamındaki lokali kullan
     return DEV_DB
 
-# Eğer AppData'da yoksa, orijinal veritabanını kopyala
-if not os.path.exists(LOCAL_DB_PATH):
-    try:
-        shutil.copy(ORIGINAL_DB_PATH, LOCAL_DB_PATH)
-        print("Veritabanı AppData dizinine kopyalandı.")
-    except Exception as e:
-        print(f"Veritabanı kopyalanamadı: {e}")
+_db_copied = False
 
-# Eğer geliştirme ortamında DB’nin APP_DIR’e kopyalanmasını istiyorsan:
-if not os.path.exists(DEV_DB):
-    try:
-        shutil.copy(os.path.join(os.path.dirname(__file__), DB_NAME), DEV_DB)
-        print("Dev DB kopyalandı:", DEV_DB)
-    except Exception as e:
-        print("Dev DB kopyalanamadı:", e)
+def copy_default_database():
+    """
+    AppData'da veritabanı yoksa orijinalini kopyalar. Import sırasında değil,
+    setup_database() içinde çalışır: mesajlar setup_logging() kurulduktan
+    sonra log'a düşer. Süreç başına bir kez.
+    """
+    global _db_copied
+    if _db_copied:
+        return
+    _db_copied = True
+
+    # Eğer AppData'da yoksa, orijinal veritabanını kopyala
+    if not os.path.exists(LOCAL_DB_PATH):
+        try:
+            shutil.copy(ORIGINAL_DB_PATH, LOCAL_DB_PATH)
+            log.info("Veritabanı AppData dizinine kopyalandı.")
+        except Exception as e:
+            log.warning("Veritabanı kopyalanamadı: %s", e)
+
+    # Eğer geliştirme ortamında DB’nin APP_DIR’e kopyalanmasını istiyorsan:
+    if not os.path.exists(DEV_DB):
+        try:
+            shutil.copy(os.path.join(os.path.dirname(__file__), DB_NAME), DEV_DB)
+            log.info("Dev DB kopyalandı: %s", DEV_DB)
+        except Exception as e:
+            log.warning("Dev DB kopyalanamadı: %s", e)
+
+class ConnectionManager:
+    """
+    Uygulamanın sahip olduğu uzun ömürlü SQLite bağlantı katmanı.
+    Her thread kendi bağlantısını bir kez açar ve sonraki çağrılarda onu
+    yeniden kullanır; close_all() hepsini deterministik olarak kapatır.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA foreign_keys=ON",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-16000",   # ~16 MB sayfa önbelleği
+    )
+
+    def __init__(self, db_path, timeout=5.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}        # thread id -> sqlite3.Connection
+        # Yeniden kullanım her sorguda sayılır: sıcak yolda kilit almamak için
+        # her thread kendi sayacını ([n]) artırır, stats() toplar. Kapanan
+        # bağlantıların sayaçları _retired_reuses'a katlanır. Diğer sayaçlar
+        # sadece bağlantı açılırken, kilit altında güncellenir.
+        self._reuse_counters = {}     # thread id -> [n]
+        self._retired_reuses = 0
+        self.opens = 0
+        self.wait_time = 0.0          # bağlantı edinirken geçen toplam süre (sn)
+
+    def get(self):
+        """Bu thread'in bağlantısını döner, yoksa açar."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.reuses[0] += 1   # sadece bu thread yazar
+            return conn
+
+        start = time.perf_counter()
+        counter = [0]
+        with self._lock:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            ident = threading.get_ident()
+            self._connections[ident] = conn
+            self._retire_counter(ident)
+            self._reuse_counters[ident] = counter
+            self.opens += 1
+            self.wait_time += time.perf_counter() - start
+        self._local.reuses = counter
+        self._local.conn = conn
+        return conn
+
+    def _retire_counter(self, ident):
+        """Thread'in sayacını toplamına katar (kilit altında çağrılır)."""
+        counter = self._reuse_counters.pop(ident, None)
+        if counter is not None:
+            self._retired_reuses += counter[0]
+
+    @property
+    def reuses(self):
+        with self._lock:
+            return self._retired_reuses + sum(c[0] for c in self._reuse_counters.values())
+
+    def open_dedicated(self):
+        """
+        Havuza kaydedilmeyen ayrı bir autocommit bağlantı açar (ör. PRAGMA
+        data_version ile başka bağlantıların commit'lerini izleyen okuyucular).
+        Kapatmak çağırana aittir.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False, isolation_level=None)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def close_thread(self):
+        """Sadece çağıran thread'in bağlantısını kapatır (worker thread'ler için)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        with self._lock:
+            self._connections.pop(threading.get_ident(), None)
+            self._retire_counter(threading.get_ident())
+        self._local.conn = None
+        conn.close()
+
+    def close_all(self):
+        """Tüm açık bağlantıları kapatır. Uygulama kapanırken çağrılır."""
+        with self._lock:
+            conns = list(self._connections.values())
+            self._connections.clear()
+            for ident in list(self._reuse_counters):
+                self._retire_counter(ident)
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        # Diğer thread'lerin local referansları bir sonraki get()'te yenilenir
+        self._local = threading.local()
+
+    def stats(self):
+        """Açılış / yeniden kullanım / bekleme sayaçlarını döner."""
+        reuses = self.reuses
+        with self._lock:
+            return {
+                "opens": self.opens,
+                "reuses": reuses,
+                "wait_time": self.wait_time,
+                "open_connections": len(self._connections),
+            }
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_manager():
+    """Uygulama genelindeki tek ConnectionManager örneğini döner."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ConnectionManager(get_db_path())
+    return _manager
 
+def close_connections():
+    """Havuzdaki bütün bağlantıları kapatır."""
+    if _manager is not None:
+        _manager.close_all()
+
+def use_database(db_path):
+    """Bağlantı katmanını başka bir veritabanı dosyasına yönlendirir (betikler, benchmark'lar)."""
+    global _manager, _search_backend
+    close_connections()
+    with _manager_lock:
+        _manager = ConnectionManager(db_path)
+    _search_backend = None
+
+def connection_stats():
+    return get_manager().stats()
+
+def database_path():
+    """Bağlantı katmanının kullandığı veritabanı dosyasının mutlak yolu (use_database dahil)."""
+    return os.path.abspath(get_manager().db_path)
+
+@perf.timed("db.get_category_counts")
 def get_category_counts():
     """
     Her kategori için toplam quantity değerini döner:
       [ (kategori1, toplam_adet1), (kategori2, toplam_adet2), ... ]
+    Trigger'larla güncel tutulan category_totals tablosundan okunur (O(#kategori)).
     """
-    # AppData içindeki gerçek DB dosyası:
-    db_path = os.path.join(APP_DIR, DB_NAME)
-    print(f"[DEBUG] get_category_counts connecting to: {db_path}")
-
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT category, SUM(quantity) AS total_qty
-          FROM components
-         WHERE category IS NOT NULL
-           AND category <> ''
-         GROUP BY category
-    """)
-    rows = cursor.fetchall()
-    conn.close()
-
-    print(f"[DEBUG] get_category_counts returned: {rows}")
-    return rows
+    query = "SELECT category, total_qty FROM category_totals ORDER BY category"
+    return execute_query(query, fetch="all")
 
+@perf.timed("db.component_exists")
 def component_exists(name, drawer_code):
     """
     Aynı name + drawer_code ikilisiyle bir kayıt var mı diye bakar.
@@ -79,40 +233,77 @@ def component_exists(name, drawer_code):
     return row is not None
 
 def create_connection():
-    db_path = get_db_path()
+    """Havuzdan bu thread'e ait bağlantıyı döner. Bağlantıyı kapatmayın."""
     try:
-        return sqlite3.connect(db_path)
+        return get_manager().get()
     except sqlite3.Error as e:
-        print(f"[DB ERROR] Bağlanamadı: {db_path} — {e}")
+        log.error("Bağlanamadı: %s — %s", get_db_path(), e)
         return None
 
-def execute_query(query, params=(), fetch=None):
+def execute_query(query, params=(), fetch=None, raise_integrity=False):
+    """
+    Havuzdaki bağlantıda tek bir sorgu çalıştırır. Hatalar loglanıp None
+    (fetch="all" için []) döner; raise_integrity=True ise kısıt ihlali
+    (ör. tekrar eden name + drawer_code) geri alınıp sqlite3.IntegrityError
+    olarak çağırana iletilir.
+    """
     conn = create_connection()
     if conn is None:
         # Bağlantı yoksa
         return [] if fetch == "all" else None
+    cur = conn.cursor()
+    # Ölçüm sadece perf açıkken; kapalıyken tek bir bayrak kontrolü
+    start = time.perf_counter() if perf.is_enabled() else None
     try:
-        cur = conn.cursor()
         cur.execute(query, params)
         if fetch == "one":
-            return cur.fetchone()
-        if fetch == "all":
-            return cur.fetchall() or []   # kesinlikle liste dön
-        conn.commit()
-        return True
+            result = cur.fetchone()
+        elif fetch == "all":
+            result = cur.fetchall() or []   # kesinlikle liste dön
+        else:
+            conn.commit()
+            # Yazma işlemlerinde etkilenen satır bilgisi istenebilir
+            if fetch == "lastrowid":
+                result = cur.lastrowid
+            elif fetch == "rowcount":
+                result = cur.rowcount
+            else:
+                result = True
+        if start is not None:
+            elapsed = time.perf_counter() - start
+            perf.record("db.sql", elapsed)
+            perf.check_query(conn, query, params, elapsed)
+        return result
     except sqlite3.Error as e:
-        print(f"[SQL ERROR] {e} — Query: {query}")
+        if conn.in_transaction:
+            conn.rollback()
+        if raise_integrity and isinstance(e, sqlite3.IntegrityError):
+            raise
+        log.error("%s — Query: %s", e, query)
         return [] if fetch == "all" else None
+    finally:
+        cur.close()
 
 
+# Şema her değiştiğinde artırılır. PRAGMA user_version bu değerdeyse
+# setup_database hiçbir DDL çalıştırmaz (CLI'nin her çağrısı için hızlı yol).
+SCHEMA_VERSION = 4
+
+@perf.timed("db.setup_database")
 def setup_database():
     """
     1) components tablosunu oluşturur (eğer yoksa),
     2) mevcutsa eksik sütunları ekler.
+    Şema zaten güncelse (user_version) tek bir PRAGMA okumasıyla döner.
+    İlk çağrıda, bağlantı açılmadan önce AppData kopyası hazırlanır.
     """
+    copy_default_database()
     conn = create_connection()
     if conn is None:
-        print("Veritabanı açılamadı.")
+        log.error("Veritabanı açılamadı.")
+        return
+
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
         return
 
     cursor = conn.cursor()
@@ -138,37 +329,538 @@ def setup_database():
 
     if "image_path" not in existing_columns:
         cursor.execute("ALTER TABLE components ADD COLUMN image_path TEXT;")
-        print("image_path sütunu eklendi.")
+        log.info("image_path sütunu eklendi.")
+
+    # 3) Filtre ve tekrar kontrolü için indeksler
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_components_category ON components(category);")
+    # (name, drawer_code) benzersiz olmalı; eski veride tekrar varsa normal
+    # indeksle devam edilir. Bu karar da user_version ile kaydedilir: şema
+    # blokları her açılışta yeniden çalışmaz, uyarı bir kez yazılır (bir
+    # sonraki SCHEMA_VERSION yükseltmesinde benzersiz indeks yeniden denenir).
+    try:
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_components_name_drawer ON components(name, drawer_code);")
+        cursor.execute("DROP INDEX IF EXISTS idx_components_name_drawer;")
+    except sqlite3.IntegrityError:
+        log.warning("name + drawer_code tekrarları var; benzersiz indeks yerine normal indeks kullanılıyor.")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_components_name_drawer ON components(name, drawer_code);")
+
+    # Sıralanabilir sütunlar için tipli indeksler (bkz. SORT_EXPRESSIONS)
+    for column in SORT_INDEXES:
+        expr = SORT_EXPRESSIONS[column].format(t="")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_components_sort_{column} ON components({expr});")
+
+    conn.commit()
+    cursor.close()
+
+    # 4) Tam metin arama indeksi
+    setup_search_index(conn)
+
+    # 5) Kategori toplamları
+    setup_category_totals(conn)
+
+    # 6) Stok hareketleri defteri ve günlük özetler
+    setup_stock_ledger(conn)
+
+    # 7) Bellek içi okuma modeli (component_store) için değişiklik günlüğü
+    setup_change_log(conn)
+
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+
+
+# --- Category Aggregates ---
+
+# Kategorisi boş olmayan her bileşen, kendi kategorisinin satırına eklenir
+_CATEGORY_ADD = """
+    INSERT INTO category_totals (category, total_qty, item_count)
+    SELECT NEW.category, coalesce(NEW.quantity, 0), 1
+     WHERE coalesce(NEW.category, '') <> ''
+    ON CONFLICT(category) DO UPDATE SET
+        total_qty = total_qty + excluded.total_qty,
+        item_count = item_count + 1;
+"""
+_CATEGORY_REMOVE = """
+    UPDATE category_totals
+       SET total_qty = total_qty - coalesce(OLD.quantity, 0),
+           item_count = item_count - 1
+     WHERE category = OLD.category;
+    DELETE FROM category_totals WHERE category = OLD.category AND item_count <= 0;
+"""
+
+def setup_category_totals(conn):
+    """
+    category → (total_qty, item_count) özet tablosunu ve onu components
+    üzerindeki her ekleme/güncelleme/silmede güncel tutan trigger'ları kurar.
+    Tablo ilk kez oluşturuluyorsa mevcut veriden doldurulur.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'category_totals'"
+    ).fetchone()
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS category_totals (
+            category   TEXT PRIMARY KEY,
+            total_qty  INTEGER NOT NULL DEFAULT 0,
+            item_count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS category_totals_ai AFTER INSERT ON components BEGIN
+            {_CATEGORY_ADD}
+        END;
+        CREATE TRIGGER IF NOT EXISTS category_totals_ad AFTER DELETE ON components BEGIN
+            {_CATEGORY_REMOVE}
+        END;
+        CREATE TRIGGER IF NOT EXISTS category_totals_au AFTER UPDATE OF category, quantity ON components BEGIN
+            {_CATEGORY_REMOVE}
+            {_CATEGORY_ADD}
+        END;
+    """)
+    if not exists:
+        rebuild_category_totals(conn)
+
+_CATEGORY_AGGREGATE_SQL = """
+    SELECT category, coalesce(SUM(quantity), 0), COUNT(*)
+      FROM components
+     WHERE category IS NOT NULL AND category <> ''
+     GROUP BY category
+"""
+
+@perf.timed("db.rebuild_category_totals")
+def rebuild_category_totals(conn=None):
+    """category_totals tablosunu components'tan sıfırdan hesaplar."""
+    conn = conn or create_connection()
+    with conn:
+        conn.execute("DELETE FROM category_totals")
+        conn.execute(f"INSERT INTO category_totals (category, total_qty, item_count) {_CATEGORY_AGGREGATE_SQL}")
+
+@perf.timed("db.check_category_totals")
+def check_category_totals(rebuild=False):
+    """
+    Özet tabloyu tam GROUP BY sonucu ile karşılaştırır.
+    Tutarsız kategorileri [(kategori, beklenen, kayıtlı), ...] olarak döner;
+    rebuild=True ise tutarsızlık varsa tabloyu yeniden oluşturur.
+    """
+    expected = {row[0]: tuple(row[1:]) for row in execute_query(_CATEGORY_AGGREGATE_SQL, fetch="all")}
+    stored = {row[0]: tuple(row[1:]) for row in execute_query(
+        "SELECT category, total_qty, item_count FROM category_totals", fetch="all"
+    )}
+    mismatches = [
+        (cat, expected.get(cat), stored.get(cat))
+        for cat in sorted(set(expected) | set(stored))
+        if expected.get(cat) != stored.get(cat)
+    ]
+    if mismatches and rebuild:
+        rebuild_category_totals()
+    return mismatches
+
+
+# --- Stock Movement Ledger ---
+
+# Her miktar değişikliği stock_movements'a bir satır ekler (sadece ekleme yapılır).
+# stock_daily, hareket eklendikçe trigger ile güncellenen parça × gün özetidir;
+# "son 90 gündeki tüketim" en fazla 90 özet satırı okur, ham hareketleri değil.
+_MOVEMENT_TS = "strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')"
+
+def setup_stock_ledger(conn):
+    """stock_movements, stock_daily tablolarını, indeksleri ve trigger'ları kurar."""
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS stock_movements (
+            id             INTEGER PRIMARY KEY,
+            component_id   INTEGER NOT NULL,
+            ts             TEXT    NOT NULL,
+            delta          INTEGER NOT NULL,
+            quantity_after INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_movements_component_ts ON stock_movements(component_id, ts);
+        CREATE INDEX IF NOT EXISTS idx_movements_ts ON stock_movements(ts);
+
+        CREATE TABLE IF NOT EXISTS stock_daily (
+            component_id INTEGER NOT NULL,
+            day          TEXT    NOT NULL,
+            consumed     INTEGER NOT NULL DEFAULT 0,
+            received     INTEGER NOT NULL DEFAULT 0,
+            movements    INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (component_id, day)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_stock_daily_day ON stock_daily(day);
+
+        CREATE TRIGGER IF NOT EXISTS stock_movements_ai_components AFTER INSERT ON components
+        WHEN coalesce(NEW.quantity, 0) <> 0 BEGIN
+            INSERT INTO stock_movements (component_id, ts, delta, quantity_after)
+            VALUES (NEW.id, {_MOVEMENT_TS}, NEW.quantity, NEW.quantity);
+        END;
+        CREATE TRIGGER IF NOT EXISTS stock_movements_au_components AFTER UPDATE OF quantity ON components
+        WHEN coalesce(NEW.quantity, 0) <> coalesce(OLD.quantity, 0) BEGIN
+            INSERT INTO stock_movements (component_id, ts, delta, quantity_after)
+            VALUES (NEW.id, {_MOVEMENT_TS}, coalesce(NEW.quantity, 0) - coalesce(OLD.quantity, 0), coalesce(NEW.quantity, 0));
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS stock_daily_ai AFTER INSERT ON stock_movements BEGIN
+            INSERT INTO stock_daily (component_id, day, consumed, received, movements)
+            VALUES (NEW.component_id, substr(NEW.ts, 1, 10), max(0, -NEW.delta), max(0, NEW.delta), 1)
+            ON CONFLICT(component_id, day) DO UPDATE SET
+                consumed = consumed + excluded.consumed,
+                received = received + excluded.received,
+                movements = movements + 1;
+        END;
+    """)
+
+# --- Change Log ---
+
+# component_changes'te tutulan son kayıt sayısı; daha geride kalan okuyucu tam yükleme yapar
+CHANGE_LOG_KEEP = 10000
+
+def setup_change_log(conn):
+    """
+    components üzerindeki her ekleme/güncelleme/silmede değişen id'yi artan
+    bir sıra numarasıyla component_changes'e yazan trigger'ları kurar.
+    Okuyucular son gördükleri seq'ten sonrasını okuyarak artımlı yenilenir.
+    Tablo her 1000 kayıtta bir CHANGE_LOG_KEEP kayda budanır.
+    """
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS component_changes (
+            seq          INTEGER PRIMARY KEY AUTOINCREMENT,
+            component_id INTEGER NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS component_changes_ai AFTER INSERT ON components BEGIN
+            INSERT INTO component_changes (component_id) VALUES (NEW.id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS component_changes_au AFTER UPDATE ON components BEGIN
+            INSERT INTO component_changes (component_id) VALUES (NEW.id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS component_changes_ad AFTER DELETE ON components BEGIN
+            INSERT INTO component_changes (component_id) VALUES (OLD.id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS component_changes_prune AFTER INSERT ON component_changes
+        WHEN NEW.seq % 1000 = 0 BEGIN
+            DELETE FROM component_changes WHERE seq <= NEW.seq - {CHANGE_LOG_KEEP};
+        END;
+    """)
+
+@perf.timed("db.get_movements")
+def get_movements(comp_id, since=None, until=None, limit=None):
+    """
+    Bir parçanın ham hareketleri [(ts, delta, quantity_after), ...], yeniden eskiye.
+    since/until 'YYYY-MM-DD[ HH:MM:SS]' metinleridir; (component_id, ts) indeksini kullanır.
+    """
+    query = "SELECT ts, delta, quantity_after FROM stock_movements WHERE component_id = ?"
+    params = (comp_id,)
+    if since:
+        query += " AND ts >= ?"
+        params += (since,)
+    if until:
+        query += " AND ts < ?"
+        params += (until,)
+    query += " ORDER BY ts DESC, id DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params += (int(limit),)
+    return execute_query(query, params, fetch="all")
+
+@perf.timed("db.get_daily_usage")
+def get_daily_usage(comp_id, days=90):
+    """
+    Son `days` gün için [(gün, tüketilen, gelen), ...] (sadece hareketli günler).
+    days 1'den küçükse ValueError fırlatılır.
+    """
+    if days < 1:
+        raise ValueError(f"days must be at least 1, got {days}")
+    since = (datetime.date.today() - datetime.timedelta(days=days - 1)).isoformat()
+    return execute_query(
+        "SELECT day, consumed, received FROM stock_daily WHERE component_id = ? AND day >= ? ORDER BY day",
+        (comp_id, since), fetch="all"
+    )
+
+@perf.timed("db.get_usage")
+def get_usage(days=90, comp_id=None, limit=None):
+    """
+    Son `days` gündeki parça başına tüketim, en çok tüketilenden başlayarak:
+    [(id, name, drawer_code, quantity, tüketilen, gelen), ...]. Günlük özetlerden okunur.
+    days 1'den küçükse ValueError fırlatılır.
+    """
+    if days < 1:
+        raise ValueError(f"days must be at least 1, got {days}")
+    since = (datetime.date.today() - datetime.timedelta(days=days - 1)).isoformat()
+    query = """
+        SELECT d.component_id, c.name, c.drawer_code, c.quantity,
+               SUM(d.consumed) AS consumed, SUM(d.received)
+          FROM stock_daily d LEFT JOIN components c ON c.id = d.component_id
+         WHERE d.day >= ?
+    """
+    params = (since,)
+    if comp_id is not None:
+        query += " AND d.component_id = ?"
+        params += (comp_id,)
+    query += " GROUP BY d.component_id ORDER BY consumed DESC, d.component_id"
+    if limit is not None:
+        query += " LIMIT ?"
+        params += (int(limit),)
+    return execute_query(query, params, fetch="all")
+
+@perf.timed("db.compact_movements")
+def compact_movements(keep_days=365):
+    """
+    keep_days günden eski ham hareketleri günlük özetlere katlayıp siler.
+    Özetler o günler için ham veriden yeniden hesaplanır (tam gün sınırında
+    kesildiği için kesin sonuç verir), sonra hareketler silinir; hepsi tek
+    transaction'dadır. Silinen hareket sayısını döner.
+    """
+    cutoff = (datetime.date.today() - datetime.timedelta(days=keep_days)).isoformat()
+    conn = create_connection()
+    if conn is None:
+        raise sqlite3.OperationalError("Database connection is not available.")
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("""
+            INSERT OR REPLACE INTO stock_daily (component_id, day, consumed, received, movements)
+            SELECT component_id, substr(ts, 1, 10), SUM(max(0, -delta)), SUM(max(0, delta)), COUNT(*)
+              FROM stock_movements WHERE ts < ?
+             GROUP BY component_id, substr(ts, 1, 10)
+        """, (cutoff,))
+        removed = conn.execute("DELETE FROM stock_movements WHERE ts < ?", (cutoff,)).rowcount
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return removed
+
+
+# --- Full-Text Search Index ---
+
+# FTS5'e giren sütunlar ve bm25 ağırlıkları (isim ve çekmece kodu öne çıkar)
+SEARCH_COLUMNS = ("name", "drawer_code", "category", "description")
+SEARCH_WEIGHTS = (10.0, 8.0, 2.0, 1.0)
+TRIGRAM_MIN_LEN = 3
+
+# "trigram" (alt dizi araması), "fts5" (kelime/prefix araması) veya "like"
+_search_backend = None
 
+def setup_search_index(conn):
+    """
+    components tablosu için FTS5 indeksini ve onu senkron tutan trigger'ları
+    oluşturur. Önce trigram tokenizer denenir (LIKE '%x%' ile aynı sonucu
+    verir), yoksa düz FTS5, o da yoksa LIKE taramasına düşülür.
+    """
+    global _search_backend
+    cols = ", ".join(SEARCH_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+
+    existing = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'components_fts'"
+    ).fetchone()
+
+    if existing is None:
+        for backend, tokenize in (("trigram", "trigram"), ("fts5", "unicode61 remove_diacritics 2")):
+            try:
+                conn.execute(
+                    f"CREATE VIRTUAL TABLE components_fts USING fts5("
+                    f"{cols}, content='components', content_rowid='id', tokenize='{tokenize}')"
+                )
+            except sqlite3.OperationalError:
+                continue
+            conn.execute("INSERT INTO components_fts(components_fts) VALUES('rebuild')")
+            break
+        else:
+            log.warning("FTS5 bulunamadı, LIKE aramasına düşülüyor.")
+            _search_backend = "like"
+            return _search_backend
+
+    conn.executescript(f"""
+        CREATE TRIGGER IF NOT EXISTS components_fts_ai AFTER INSERT ON components BEGIN
+            INSERT INTO components_fts(rowid, {cols}) VALUES (new.id, {new_cols});
+        END;
+        CREATE TRIGGER IF NOT EXISTS components_fts_ad AFTER DELETE ON components BEGIN
+            INSERT INTO components_fts(components_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END;
+        CREATE TRIGGER IF NOT EXISTS components_fts_au AFTER UPDATE OF {cols} ON components BEGIN
+            INSERT INTO components_fts(components_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO components_fts(rowid, {cols}) VALUES (new.id, {new_cols});
+        END;
+    """)
     conn.commit()
-    conn.close()
+    _search_backend = None
+    return get_search_backend()
+
+def get_search_backend():
+    """Kullanılan arama yöntemini döner: 'trigram', 'fts5' ya da 'like'."""
+    global _search_backend
+    if _search_backend is None:
+        row = execute_query(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'components_fts'",
+            fetch="one"
+        )
+        if row is None:
+            _search_backend = "like"
+        elif "trigram" in row[0]:
+            _search_backend = "trigram"
+        else:
+            _search_backend = "fts5"
+    return _search_backend
+
+def _fts_match_expression(search_term, backend):
+    """Kullanıcı metnini güvenli bir FTS5 MATCH ifadesine çevirir."""
+    if backend == "trigram":
+        # Tek bir phrase: trigram tokenizer ile alt dizi eşleşmesi demek
+        return '"' + search_term.replace('"', '""') + '"'
+    # unicode61: her kelimeyi prefix olarak ara
+    tokens = [t.replace('"', '""') for t in search_term.split()]
+    return " ".join(f'"{t}"*' for t in tokens)
+
+# --- Sorting ---
+
+# Sıralanabilir sütunlar ve ORDER BY ifadeleri ({t}: tablo öneki, ör. "c.").
+# Metinler büyük/küçük harf duyarsız, quantity sayısal, added_date tarih olarak
+# sıralanır. SORT_INDEXES'teki ifadelerin birebir aynısıyla indeks kurulur;
+# böylece sayfalı/sanal görünüm için ilk sayfa tablo taranmadan gelir.
+SORT_EXPRESSIONS = {
+    "id": "{t}id",
+    "name": "{t}name COLLATE NOCASE",
+    "category": "{t}category COLLATE NOCASE",
+    "drawer_code": "{t}drawer_code COLLATE NOCASE",
+    "quantity": "{t}quantity",
+    "datasheet": "{t}datasheet COLLATE NOCASE",
+    "description": "{t}description COLLATE NOCASE",
+    "added_date": "date({t}added_date)",
+    "image_path": "{t}image_path COLLATE NOCASE",
+}
+SORT_INDEXES = ("name", "category", "drawer_code", "quantity", "added_date")
+
+def order_by_clause(order_by, prefix=""):
+    """
+    "name", "quantity desc" ya da "category, name" gibi bir sıralamayı beyaz
+    listeden (SORT_EXPRESSIONS) ORDER BY ifadesine çevirir. Sütun adı asla SQL'e
+    doğrudan yazılmaz; bilinmeyen sütun veya yön için ValueError fırlatılır.
+    Eşitlikler son anahtarın yönünde id ile çözülür (kararlı sayfalama için).
+    """
+    terms = []
+    direction = ""
+    for part in order_by.split(","):
+        words = part.split()
+        if not words or len(words) > 2 or words[0] not in SORT_EXPRESSIONS \
+                or (len(words) == 2 and words[1].lower() not in ("asc", "desc")):
+            raise ValueError(f"cannot sort by {part.strip()!r}")
+        direction = " DESC" if len(words) == 2 and words[1].lower() == "desc" else ""
+        terms.append(SORT_EXPRESSIONS[words[0]].format(t=prefix) + direction)
+    if order_by.split(",")[-1].split()[0] != "id":
+        terms.append(f"{prefix}id{direction}")
+    return ", ".join(terms)
+
+# SORT_EXPRESSIONS'ın Python karşılıkları: bellekte sıralanan ya da yerine
+# eklenen satırlar (sanal tablo, component_store) bir sonraki sorguyla aynı
+# yere düşer. SQLite'ta NULL < sayı < metin; NOCASE sadece ASCII harfleri katlar.
+_ASCII_FOLD = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def fold_nocase(value):
+    return value.lower() if value.isascii() else value.translate(_ASCII_FOLD)
+
+def nocase_key(value):
+    """COLLATE NOCASE ile aynı sırayı veren anahtar (NULL önce)."""
+    if value is None:
+        return (0, "")
+    return (1, fold_nocase(str(value)))
+
+def date_key(value):
+    """date(added_date) gibi: geçerli tarih değilse NULL (önce) sıralanır."""
+    text = (value or "")[:10]
+    if len(text) == 10 and text[4] == "-" and text[7] == "-" and (text[:4] + text[5:7] + text[8:]).isdigit():
+        return (1, text)
+    return (0, "")
+
+def number_key(value):
+    """Tamsayı sütunları: NULL, sonra sayılar, sonra (varsa) metinler."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (2, str(value))
+
+SORT_KEYS = {
+    column: date_key if expr.startswith("date(") else nocase_key if "NOCASE" in expr else number_key
+    for column, expr in SORT_EXPRESSIONS.items()
+}
+
+def row_sort_key(column):
+    """
+    COLUMNS sırasındaki satır tuple'ları için ORDER BY order_by_clause(column)
+    ile aynı sırayı veren anahtar fonksiyonu (eşitlikte id; ters sıralamada
+    id de ters döner, tıpkı order_by_clause gibi).
+    """
+    index = COLUMNS.index(column)
+    key = SORT_KEYS[column]
+    return lambda row: (key(row[index]), row[0])
 
 # --- Component Data Functions ---
 
-def get_all_components(order_by="name"):
-    query = f"SELECT {', '.join(COLUMNS)} FROM components ORDER BY {order_by}"
-    dbp = get_db_path()
-    print(f"[DEBUG] get_all_components bağlanıyor: {dbp} (exists? {os.path.exists(dbp)})")
-    rows = execute_query(query, fetch="all")
-    print(f"[DEBUG] get_all_components döndü: {rows!r}")
+@perf.timed("db.get_all_components")
+def get_all_components(order_by="name", limit=None):
+    """Tüm bileşenler; limit verilirse sadece ilk limit satır (açılıştaki ilk sayfa)."""
+    query = f"SELECT {', '.join(COLUMNS)} FROM components ORDER BY {order_by_clause(order_by)}"
+    params = ()
+    if limit is not None:
+        query += " LIMIT ?"
+        params = (int(limit),)
+    rows = execute_query(query, params, fetch="all")
+    # Satırların kendisi değil sadece sayısı; mesaj DEBUG kapalıyken hiç biçimlendirilmez
+    log.debug("get_all_components: %d row(s) from %s", len(rows), get_manager().db_path)
     return rows
 
 
-def add_component(data):
-    """Adds a new component to the database."""
-    query = """
-        INSERT INTO components (name, category, drawer_code, quantity, datasheet, description, image_path, added_date)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+def iter_components(columns=COLUMNS, order_by="name", batch_size=1000):
     """
-    params = (
+    Bileşenleri fetchmany ile sabit boyutlu parçalar halinde üretir.
+    Tüm tablo asla belleğe alınmaz; her yield bir satır listesidir.
+    """
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown:
+        raise ValueError(f"unknown column(s): {', '.join(unknown)}")
+    order = order_by_clause(order_by)
+    conn = create_connection()
+    if conn is None:
+        return
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SELECT {', '.join(columns)} FROM components ORDER BY {order}")
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+    finally:
+        cur.close()
+
+@perf.timed("db.get_component")
+def get_component(comp_id):
+    """Returns a single component row by its ID (or None)."""
+    query = f"SELECT {', '.join(COLUMNS)} FROM components WHERE id = ?"
+    return execute_query(query, (comp_id,), fetch="one")
+
+_INSERT_COMPONENT = """
+    INSERT INTO components (name, category, drawer_code, quantity, datasheet, description, image_path, added_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _insert_params(data):
+    return (
         data['name'], data['category'], data['drawer_code'], data['quantity'],
         data['datasheet'], data['description'], data.get('image_path', ''),
         datetime.date.today().isoformat()
     )
-    return execute_query(query, params)
 
+@perf.timed("db.add_component")
+def add_component(data):
+    """
+    Adds a new component to the database. Returns the new row's ID (None on failure).
+    Raises sqlite3.IntegrityError if the (name, drawer_code) pair already exists.
+    """
+    return execute_query(_INSERT_COMPONENT, _insert_params(data), fetch="lastrowid", raise_integrity=True)
+
+@perf.timed("db.update_component")
 def update_component(comp_id, data):
-    """Updates an existing component in the database."""
+    """
+    Updates an existing component. Returns the affected ID (None if nothing changed).
+    Raises sqlite3.IntegrityError if another component already has the (name, drawer_code) pair.
+    """
     query = """
         UPDATE components
         SET name = ?, category = ?, drawer_code = ?, quantity = ?, 
@@ -179,26 +871,302 @@ def update_component(comp_id, data):
         data['name'], data['category'], data['drawer_code'], data['quantity'],
         data['datasheet'], data['description'], data.get('image_path', ''), comp_id
     )
-    return execute_query(query, params)
+    return comp_id if execute_query(query, params, fetch="rowcount", raise_integrity=True) else None
 
+@perf.timed("db.delete_component")
 def delete_component(comp_id):
-    """Deletes a component from the database by its ID."""
-    return execute_query("DELETE FROM components WHERE id = ?", (comp_id,))
+    """Deletes a component by its ID. Returns the affected ID (None if nothing was deleted)."""
+    return comp_id if execute_query("DELETE FROM components WHERE id = ?", (comp_id,), fetch="rowcount") else None
 
+@perf.timed("db.find_component_id")
+def find_component_id(name, drawer_code):
+    """name + drawer_code ikilisine ait id (yoksa None)."""
+    row = execute_query(
+        "SELECT id FROM components WHERE name = ? AND drawer_code = ?", (name, drawer_code), fetch="one"
+    )
+    return row[0] if row else None
+
+# --- Stock Adjustments ---
+
+class InsufficientStock(ValueError):
+    """strict modda bir düşüm stoğu sıfırın altına indirecekti; transaction geri alındı."""
+
+# Miktar tek bir UPDATE ile değişir ve sıfırın altına inmez; okuma ve yazma
+# arasında başka bir bağlantı araya giremez, eşzamanlı düşümler kaybolmaz.
+_ADJUST_SQL = "UPDATE components SET quantity = max(0, quantity + ?) WHERE id = ?"
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+def _apply_adjustment(conn, comp_id, delta, strict=False):
+    """Açık transaction içinde tek bir düzeltme uygular; yeni miktarı döner (yoksa None)."""
+    if strict:
+        row = conn.execute("SELECT quantity FROM components WHERE id = ?", (comp_id,)).fetchone()
+        if row is not None and (row[0] or 0) + delta < 0:
+            raise InsufficientStock(f"component {comp_id}: stock {row[0]}, requested {-delta}")
+    if _HAS_RETURNING:
+        row = conn.execute(_ADJUST_SQL + " RETURNING quantity", (delta, comp_id)).fetchone()
+        return row[0] if row else None
+    if not conn.execute(_ADJUST_SQL, (delta, comp_id)).rowcount:
+        return None
+    return conn.execute("SELECT quantity FROM components WHERE id = ?", (comp_id,)).fetchone()[0]
+
+@perf.timed("db.adjust_stock")
+def adjust_stock(comp_id, delta):
+    """
+    quantity = max(0, quantity + delta) işlemini tek ifadede atomik uygular.
+    Yeni miktarı döner (bileşen yoksa veya hata olursa None).
+    """
+    conn = create_connection()
+    if conn is None:
+        return None
+    try:
+        with conn:
+            return _apply_adjustment(conn, comp_id, int(delta))
+    except sqlite3.Error as e:
+        log.error("%s — adjust_stock(%s, %s)", e, comp_id, delta)
+        return None
+
+@perf.timed("db.adjust_stock_many")
+def adjust_stock_many(deltas, strict=False):
+    """
+    Birden çok düzeltmeyi [(comp_id, delta), ...] tek bir transaction'da
+    uygular (ör. bir BOM'un tamamını tüketmek): ya hepsi yazılır ya hiçbiri.
+    Bilinmeyen id varsa KeyError; strict=True iken stok yetmezse
+    InsufficientStock fırlatılır ve hiçbir değişiklik kalmaz.
+    {comp_id: yeni_miktar} döner.
+    """
+    conn = create_connection()
+    if conn is None:
+        raise sqlite3.OperationalError("Database connection is not available.")
+
+    results = {}
+    if conn.in_transaction:
+        conn.commit()
+    # Yazma kilidi baştan alınır; strict kontrolü ile düşüm arasında kimse yazamaz
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for comp_id, delta in deltas:
+            quantity = _apply_adjustment(conn, comp_id, int(delta), strict)
+            if quantity is None:
+                raise KeyError(comp_id)
+            results[comp_id] = quantity
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return results
+
+# --- Bulk Import ---
+
+IMPORT_COLUMNS = ("name", "category", "drawer_code", "quantity", "datasheet", "description", "image_path", "added_date")
+IMPORT_REQUIRED = ("name", "drawer_code", "quantity")
+IMPORT_BATCH_SIZE = 5000
+
+class ImportCancelled(Exception):
+    """İçe aktarma kullanıcı tarafından iptal edildi; transaction geri alındı."""
+
+def _normalize_import_row(row, today):
+    """CSV'den gelen sözlüğü staging tablosu için tuple'a çevirir."""
+    data = {k: (row.get(k) or "").strip() for k in IMPORT_COLUMNS}
+    try:
+        data["quantity"] = int(data["quantity"])
+    except ValueError:
+        data["quantity"] = 0
+    if not data["added_date"]:
+        data["added_date"] = today
+    return tuple(data[k] for k in IMPORT_COLUMNS)
+
+@perf.timed("db.import_components")
+def import_components(rows, progress_callback=None, batch_size=IMPORT_BATCH_SIZE, cancel_event=None):
+    """
+    Sözlük akışını (ör. csv.DictReader) tek bir transaction içinde içe aktarır.
+
+    Satırlar executemany ile geçici bir staging tablosuna toplu yazılır, sonra
+    tek bir set tabanlı INSERT ... SELECT ile hem dosya içindeki hem de mevcut
+    (name, drawer_code) tekrarları elenerek components'a aktarılır.
+    progress_callback(staged_row_count) her batch sonrası çağrılır.
+    cancel_event (threading.Event) set edilirse ImportCancelled fırlatılır; son
+    kontrol transaction içinde COMMIT'ten hemen önce yapılır, yani fonksiyon
+    normal dönerse satırlar yazılmıştır. Hata veya iptal olursa hiçbir şey
+    yazılmaz. (eklenen, tekrar, geçersiz) sayılarını döner; geçersiz, name
+    veya drawer_code'u boş olduğu için alınmayan satırlardır.
+    """
+    conn = create_connection()
+    if conn is None:
+        raise sqlite3.OperationalError("Database connection is not available.")
+
+    cols = ", ".join(IMPORT_COLUMNS)
+    today = datetime.date.today().isoformat()
+    staged = 0
+
+    def check_cancel():
+        if cancel_event is not None and cancel_event.is_set():
+            raise ImportCancelled()
+
+    try:
+        conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS import_staging ({cols})")
+        conn.execute("DELETE FROM import_staging")
+
+        insert_sql = f"INSERT INTO import_staging ({cols}) VALUES ({', '.join('?' * len(IMPORT_COLUMNS))})"
+        batch = []
+        for row in rows:
+            batch.append(_normalize_import_row(row, today))
+            if len(batch) >= batch_size:
+                check_cancel()
+                conn.executemany(insert_sql, batch)
+                staged += len(batch)
+                batch = []
+                if progress_callback:
+                    progress_callback(staged)
+        if batch:
+            conn.executemany(insert_sql, batch)
+            staged += len(batch)
+            if progress_callback:
+                progress_callback(staged)
+        check_cancel()
+
+        count_invalid = conn.execute(
+            "SELECT COUNT(*) FROM import_staging WHERE name = '' OR drawer_code = ''"
+        ).fetchone()[0]
+
+        # Dosya içi tekrarlarda ilk satır kazanır; mevcut kayıtlar atlanır
+        cur = conn.execute(f"""
+            INSERT INTO components ({cols})
+            SELECT {cols} FROM import_staging s
+             WHERE s.name <> '' AND s.drawer_code <> ''
+               AND s.rowid IN (SELECT MIN(rowid) FROM import_staging GROUP BY name, drawer_code)
+               AND NOT EXISTS (SELECT 1 FROM components c
+                                WHERE c.name = s.name AND c.drawer_code = s.drawer_code)
+             ORDER BY s.rowid
+        """)
+        count_new = cur.rowcount
+        conn.execute("DELETE FROM import_staging")
+        # İptal kararı commit ile aynı noktada: bu kontrolden sonra gelen
+        # iptal isteği işi durdurmaz, iş tamamlanmış olarak bildirilir.
+        check_cancel()
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+    return count_new, staged - count_new - count_invalid, count_invalid
+
+def read_csv_components(csvfile, lines=None):
+    """
+    Açık bir CSV dosyasından normalize edilmiş satır sözlükleri üretir.
+    Ayırıcı csv.Sniffer ile bulunur, başlıklar küçük harfe ve alt çizgiye çevrilir.
+    lines verilirse satırlar dosya yerine bu iterable'dan okunur (ör. sayaçlı sarmalayıcı).
+    """
+    sample = csvfile.read(2048)
+    if csvfile.seekable():
+        csvfile.seek(0)
+    else:
+        # stdin gibi geri sarılamayan akış: örneği yarım satır kalmayacak
+        # şekilde tamamla ve okunanı akışın önüne geri ekle
+        sample += csvfile.readline()
+        csvfile = itertools.chain(io.StringIO(sample), csvfile)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=";,\t|")
+    except csv.Error:
+        dialect = 'excel'
+
+    reader = csv.DictReader(csvfile if lines is None else lines, dialect=dialect)
+    reader.fieldnames = [h.strip().lower().replace(' ', '_') for h in (reader.fieldnames or [])]
+    missing = [k for k in IMPORT_REQUIRED if k not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}")
+    return reader
+
+def import_csv_file(file_path, progress_callback=None, cancel_event=None):
+    """
+    CSV dosyasını import_components ile içe aktarır. (eklenen, tekrar, geçersiz) döner.
+    progress_callback(staged_row_count, fraction) — fraction, okunan dosya oranıdır.
+    """
+    total = max(1, os.path.getsize(file_path))
+    consumed = [0]
+
+    def counting(lines):
+        for line in lines:
+            consumed[0] += len(line)
+            yield line
+
+    def on_batch(staged):
+        if progress_callback:
+            progress_callback(staged, min(1.0, consumed[0] / total))
+
+    with open(file_path, newline='', encoding='utf-8-sig') as csvfile:
+        rows = read_csv_components(csvfile, lines=counting(csvfile))
+        return import_components(rows, on_batch, cancel_event=cancel_event)
+
+@perf.timed("db.get_distinct_categories")
 def get_distinct_categories():
-    """Gets all unique categories from the database."""
-    query = "SELECT DISTINCT category FROM components WHERE category IS NOT NULL AND category != '' ORDER BY category"
+    """Gets all unique categories from the maintained category_totals table."""
+    query = "SELECT category FROM category_totals ORDER BY category"
     cats = execute_query(query, fetch="all")
     return [cat[0] for cat in cats] if cats else []
 
-def search_components(search_term, category):
-    """Searches and filters components."""
-    query = f"SELECT {', '.join(COLUMNS)} FROM components WHERE (lower(name) LIKE ? OR lower(drawer_code) LIKE ?)"
-    params = (f'%{search_term}%', f'%{search_term}%')
+def row_matches(row, search_term, category):
+    """
+    Tek bir satırın search_components(search_term, category) sonucuna girip
+    girmeyeceği; tabloya yamalanan satırlar aktif filtreye göre süzülür.
+    trigram ve LIKE alt dizi, fts5 kelime öneki eşleşmesidir.
+    """
+    if category != "All" and row[COLUMNS.index("category")] != category:
+        return False
+    search_term = (search_term or "").strip().lower()
+    if not search_term:
+        return True
+    texts = [str(row[COLUMNS.index(c)] or "").lower() for c in SEARCH_COLUMNS]
+    if get_search_backend() == "fts5":
+        words = re.findall(r"\w+", " ".join(texts))
+        return all(any(w.startswith(t) for w in words) for t in re.findall(r"\w+", search_term))
+    return any(search_term in text for text in texts)
+
+@perf.timed("db.search_components")
+def search_components(search_term, category, limit=None, order_by=None):
+    """
+    Searches and filters components.
+    FTS5 indeksi varsa sonuçlar bm25 skoruna göre sıralanır; kısa terimler
+    (trigram için < 3 karakter) veya FTS5 olmayan kurulumlar LIKE ile aranır.
+    order_by verilirse (bkz. order_by_clause) sonuçlar o sütuna göre sıralanır.
+    """
+    search_term = (search_term or "").strip().lower()
+    backend = get_search_backend()
+    use_fts = bool(search_term) and backend != "like" and not (
+        backend == "trigram" and len(search_term) < TRIGRAM_MIN_LEN
+    )
+
+    if use_fts:
+        cols = ", ".join(f"c.{c}" for c in COLUMNS)
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+        query = (
+            f"SELECT {cols} FROM components_fts f JOIN components c ON c.id = f.rowid "
+            f"WHERE components_fts MATCH ?"
+        )
+        params = (_fts_match_expression(search_term, backend),)
+        if category != "All":
+            query += " AND c.category = ?"
+            params += (category,)
+        if order_by:
+            query += f" ORDER BY {order_by_clause(order_by, prefix='c.')}"
+        else:
+            query += f" ORDER BY bm25(components_fts, {weights}), c.name"
+    else:
+        query = f"SELECT {', '.join(COLUMNS)} FROM components"
+        params = ()
+        conditions = []
+        if search_term:
+            like = f"%{search_term}%"
+            conditions.append("(" + " OR ".join(f"lower({c}) LIKE ?" for c in SEARCH_COLUMNS) + ")")
+            params += (like,) * len(SEARCH_COLUMNS)
+        if category != "All":
+            conditions.append("category = ?")
+            params += (category,)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {order_by_clause(order_by or 'name')}"
 
-    if category != "All":
-        query += " AND category = ?"
-        params += (category,)
+    if limit is not None:
+        query += " LIMIT ?"
+        params += (int(limit),)
+    return execute_query(query, params, fetch="all")
 
-    query += " ORDER BY name"
-    return execute_query(query, params, fetch="all")
\ No newline at end of file
@@ -1,94 +1,271 @@
 # export_utils.py
+# reportlab ve tkinter diyalogları sadece kullanıldıkları fonksiyonlarda import
+# edilir: CSV/CLI yolu ve uygulama açılışı bu ağır modülleri yüklemez.
 import csv
 import os
-from tkinter import filedialog, messagebox
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
 import db_handler
 import config
-from config import resource_path
-import json
+import gzip
+import sys
+import time
+import argparse
 
-with open(resource_path("settings.json"), "r") as f:
-    settings = json.load(f)
+import app_logging
+import perf
+
+# Dışa aktarılan sütunlar ('id' ve 'image_path' hariç) ve başlıkları — bir kez hesaplanır
+EXPORT_COLUMNS = tuple(c for c in config.COLUMNS if c not in ("id", "image_path"))
+EXPORT_HEADERS = [config.COLUMN_TITLES[c] for c in EXPORT_COLUMNS]
+
+EXPORT_BATCH_SIZE = 2000
+WRITE_BUFFER_SIZE = 1 << 16   # 64 KB
+
+@perf.timed("export.csv")
+def write_csv(path, compress=False, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Bileşenleri veritabanından parça parça okuyup CSV'ye yazar.
+    Projeksiyon SQL'de yapılır, satırlar writerows ile tamponlu yazılır;
+    bellek kullanımı satır sayısından bağımsızdır. compress=True ise gzip yazar.
+    Yazılan satır sayısını döner.
+    """
+    if compress:
+        f = gzip.open(path, 'wt', newline='', encoding='utf-8-sig')
+    else:
+        f = open(path, 'w', newline='', encoding='utf-8-sig', buffering=WRITE_BUFFER_SIZE)
+
+    with f:
+        return write_csv_rows(f, batch_size)
+
+def write_csv_rows(f, batch_size=EXPORT_BATCH_SIZE):
+    """Başlık ve tüm bileşen satırlarını açık bir metin dosyasına yazar."""
+    writer = csv.writer(f)
+    writer.writerow(EXPORT_HEADERS)
+    count = 0
+    for batch in db_handler.iter_components(EXPORT_COLUMNS, batch_size=batch_size):
+        writer.writerows(batch)
+        count += len(batch)
+    return count
 
 def export_to_csv(status_callback):
     """Exports all component data to a CSV file, reporting via status_callback."""
+    from tkinter import filedialog, messagebox
     path = filedialog.asksaveasfilename(
         defaultextension=".csv",
-        filetypes=[("CSV Files", "*.csv")],
-        title="Save CSV As"
+        filetypes=[("CSV Files", "*.csv"), ("Compressed CSV", "*.csv.gz")],
+        title="Save CSV As",
+        initialdir=config.settings.get("export_dir")
     )
     if not path:
         return
-
-    # Sütun başlıkları (config'den okunup 'id' ve 'image_path' dışlanabilir)
-    headers = [config.COLUMN_TITLES[c] for c in config.COLUMNS if c not in ("id","image_path")]
+    config.settings.set("export_dir", os.path.dirname(path))
 
     try:
-        rows = db_handler.get_all_components()
-        if rows is None:
-            raise RuntimeError("Database returned no data.")
-
-        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            # Her row bir tuple; yine 'id' ve 'image_path' indekslerini atlayarak yazıyoruz
-            for row in rows:
-                writer.writerow([row[i] for i, c in enumerate(config.COLUMNS) if c not in ("id","image_path")])
-
-        status_callback(f"Export CSV ✓ ({os.path.basename(path)})")
+        count = write_csv(path, compress=path.lower().endswith(".gz"))
+
+        status_callback(f"Export CSV ✓ ({os.path.basename(path)}, {count} rows)")
         messagebox.showinfo("Export CSV", f"Successfully exported to:\n{path}")
     except Exception as e:
         status_callback("Export CSV ✗")
         messagebox.showerror("Export CSV Failed", str(e))
 
 
+# --- PDF ---
+
+PDF_PAGE_SIZE = (792.0, 612.0)   # landscape(letter), pt — reportlab import'u gerektirmez
+PDF_MARGIN = 36             # 0.5 inch
+PDF_FONT_SIZE = 8
+PDF_HEADER_FONT_SIZE = 10
+PDF_ROW_HEIGHT = 14
+PDF_TITLE_HEIGHT = 30
+PDF_FOOTER_HEIGHT = 16
+
+ROW_DATA, ROW_GROUP, ROW_SUBTOTAL = "data", "group", "subtotal"
+
+def _pdf_layout():
+    """
+    Sayfa başına satır sayısı, sütun genişlikleri ve hücre başına karakter
+    sınırını bir kez hesaplar. Satır yüksekliği sabit olduğu için her sayfa
+    tablosunun boyutu önceden bellidir; reportlab'ın dev tablo yerleşimi yapılmaz.
+    """
+    page_w, page_h = PDF_PAGE_SIZE
+    avail_w = page_w - 2 * PDF_MARGIN
+    avail_h = page_h - 2 * PDF_MARGIN - PDF_TITLE_HEIGHT - PDF_FOOTER_HEIGHT
+
+    weights = [config.COLUMN_WIDTHS.get(c, 100) for c in EXPORT_COLUMNS]
+    col_widths = [avail_w * w / sum(weights) for w in weights]
+
+    # Helvetica'da ortalama karakter genişliği ~0.5em; sığmayan metin kırpılır
+    max_chars = [max(3, int((w - 6) / (PDF_FONT_SIZE * 0.5))) for w in col_widths]
+    rows_per_page = int(avail_h // PDF_ROW_HEIGHT) - 1   # başlık satırı hariç
+    return col_widths, max_chars, rows_per_page
+
+def _fit(value, limit):
+    text = "" if value is None else str(value)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+def _iter_report_rows(group_by_category, max_chars, batch_size):
+    """
+    Veritabanından parça parça okunan satırları (tür, hücreler) olarak üretir.
+    Gruplamada kategori başlığı ve kategori sonunda ara toplam satırı eklenir.
+    """
+    order_by = "category, name" if group_by_category else "name"
+    cat_index = EXPORT_COLUMNS.index("category")
+    qty_index = EXPORT_COLUMNS.index("quantity")
+    width = len(EXPORT_COLUMNS)
+
+    current, items, qty = None, 0, 0
+    for batch in db_handler.iter_components(EXPORT_COLUMNS, order_by=order_by, batch_size=batch_size):
+        for row in batch:
+            if group_by_category:
+                category = row[cat_index] or "Uncategorized"
+                if category != current:
+                    if current is not None:
+                        yield ROW_SUBTOTAL, _subtotal_cells(current, items, qty, width, qty_index)
+                    current, items, qty = category, 0, 0
+                    yield ROW_GROUP, [category] + [""] * (width - 1)
+                items += 1
+                qty += row[qty_index] or 0
+            yield ROW_DATA, [_fit(v, n) for v, n in zip(row, max_chars)]
+
+    if group_by_category and current is not None:
+        yield ROW_SUBTOTAL, _subtotal_cells(current, items, qty, width, qty_index)
+
+def _subtotal_cells(category, items, qty, width, qty_index):
+    cells = [""] * width
+    cells[0] = f"Subtotal {category}: {items} item(s)"
+    cells[qty_index] = str(qty)
+    return cells
+
+def _draw_pdf_page(pdf, rows, kinds, col_widths, page_no):
+    """Tek sayfalık tabloyu başlık ve sayfa numarasıyla birlikte çizer."""
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+    page_w, page_h = PDF_PAGE_SIZE
+    pdf.setFont("Helvetica-Bold", 14)
+    pdf.drawString(PDF_MARGIN, page_h - PDF_MARGIN - 14, "Component Library Export")
+    pdf.setFont("Helvetica", 8)
+    pdf.drawRightString(page_w - PDF_MARGIN, PDF_MARGIN, f"Page {page_no}")
+
+    style = [
+        ("BACKGROUND", (0,0), (-1,0), colors.darkblue),
+        ("TEXTCOLOR",  (0,0), (-1,0), colors.whitesmoke),
+        ("FONTNAME",   (0,0), (-1,0), "Helvetica-Bold"),
+        ("FONTSIZE",   (0,0), (-1,0), PDF_HEADER_FONT_SIZE),
+        ("FONTSIZE",   (0,1), (-1,-1), PDF_FONT_SIZE),
+        ("ALIGN",      (0,0), (-1,-1), "CENTER"),
+        ("VALIGN",     (0,0), (-1,-1), "MIDDLE"),
+        ("TOPPADDING", (0,0), (-1,-1), 1),
+        ("BOTTOMPADDING", (0,0), (-1,-1), 1),
+        ("GRID",       (0,0), (-1,-1), 0.5, colors.grey),
+    ]
+    for i, kind in enumerate(kinds, start=1):
+        if kind == ROW_GROUP:
+            style += [("SPAN", (0,i), (-1,i)), ("BACKGROUND", (0,i), (-1,i), colors.lightsteelblue),
+                      ("FONTNAME", (0,i), (-1,i), "Helvetica-Bold"), ("ALIGN", (0,i), (-1,i), "LEFT")]
+        elif kind == ROW_SUBTOTAL:
+            style += [("SPAN", (0,i), (2,i)), ("BACKGROUND", (0,i), (-1,i), colors.whitesmoke),
+                      ("FONTNAME", (0,i), (-1,i), "Helvetica-Oblique"), ("ALIGN", (0,i), (2,i), "RIGHT")]
+
+    table = Table([EXPORT_HEADERS] + rows, colWidths=col_widths,
+                  rowHeights=[PDF_ROW_HEIGHT] * (len(rows) + 1))
+    table.setStyle(TableStyle(style))
+    _, height = table.wrapOn(pdf, sum(col_widths), page_h)
+    table.drawOn(pdf, PDF_MARGIN, page_h - PDF_MARGIN - PDF_TITLE_HEIGHT - height)
+    pdf.showPage()
+
+@perf.timed("export.pdf")
+def write_pdf(path, group_by_category=False, progress_callback=None, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Bileşenleri sayfa sayfa PDF'e yazar. Satırlar veritabanından parça parça
+    okunur ve her sayfa kendi küçük tablosu olarak çizilip hemen bırakılır;
+    bellek kullanımı ve süre satır sayısıyla doğrusal kalır.
+    progress_callback(page_count, row_count) her sayfadan sonra çağrılır.
+    (satır sayısı, sayfa sayısı, sayfa/sn) döner.
+    """
+    from reportlab.pdfgen import canvas
+
+    col_widths, max_chars, rows_per_page = _pdf_layout()
+    pdf = canvas.Canvas(path, pagesize=PDF_PAGE_SIZE, pageCompression=1)
+    pdf.setTitle("Component Library Export")
+
+    start = time.perf_counter()
+    pages = count = 0
+    rows, kinds = [], []
+    for kind, cells in _iter_report_rows(group_by_category, max_chars, batch_size):
+        rows.append(cells)
+        kinds.append(kind)
+        if kind == ROW_DATA:
+            count += 1
+        if len(rows) >= rows_per_page:
+            pages += 1
+            _draw_pdf_page(pdf, rows, kinds, col_widths, pages)
+            rows, kinds = [], []
+            if progress_callback:
+                progress_callback(pages, count)
+
+    if rows or pages == 0:
+        pages += 1
+        _draw_pdf_page(pdf, rows, kinds, col_widths, pages)
+    pdf.save()
+
+    elapsed = time.perf_counter() - start
+    return count, pages, pages / elapsed if elapsed > 0 else 0.0
+
 def export_to_pdf(status_callback):
     """Exports all component data to a PDF file, reporting via status_callback."""
+    from tkinter import filedialog, messagebox
     path = filedialog.asksaveasfilename(
         defaultextension=".pdf",
         filetypes=[("PDF Files", "*.pdf")],
-        title="Save PDF As"
+        title="Save PDF As",
+        initialdir=config.settings.get("export_dir")
     )
     if not path:
         return
+    config.settings.set("export_dir", os.path.dirname(path))
 
+    group = messagebox.askyesno("Export PDF", "Group components by category with subtotals?")
     try:
-        rows = db_handler.get_all_components()
-        if rows is None:
-            raise RuntimeError("Database returned no data.")
-
-        doc = SimpleDocTemplate(path, pagesize=landscape(letter))
-        styles = getSampleStyleSheet()
-        elements = [Paragraph("Component Library Export", styles['Title'])]
-
-        # Tablo veri hazırlığı
-        headers = [config.COLUMN_TITLES[c] for c in config.COLUMNS if c not in ("id","image_path")]
-        data = [headers]
-        for row in rows:
-            data.append([str(row[i]) for i, c in enumerate(config.COLUMNS) if c not in ("id","image_path")])
-
-        # Tablo oluştur ve stil uygula
-        table = Table(data, repeatRows=1)
-        style = TableStyle([
-            ("BACKGROUND", (0,0), (-1,0), colors.darkblue),
-            ("TEXTCOLOR",  (0,0), (-1,0), colors.whitesmoke),
-            ("ALIGN",      (0,0), (-1,-1), "CENTER"),
-            ("FONTNAME",   (0,0), (-1,0), "Helvetica-Bold"),
-            ("FONTSIZE",   (0,0), (-1,0), 12),
-            ("BOTTOMPADDING", (0,0), (-1,0), 8),
-            ("GRID",       (0,0), (-1,-1), 0.5, colors.grey),
-        ])
-        table.setStyle(style)
-        elements.append(table)
-
-        doc.build(elements)
-
-        status_callback(f"Export PDF ✓ ({os.path.basename(path)})")
+        count, pages, rate = write_pdf(path, group_by_category=group)
+
+        status_callback(f"Export PDF ✓ ({os.path.basename(path)}, {count} rows, {pages} pages, {rate:.1f} pages/s)")
         messagebox.showinfo("Export PDF", f"Successfully exported to:\n{path}")
     except Exception as e:
         status_callback("Export PDF ✗")
         messagebox.showerror("Export PDF Failed", str(e))
+
+
+def main(argv=None):
+    """
+    Arayüzsüz dışa aktarma (ör. cron):
+        python export_utils.py components.csv
+        python export_utils.py components.csv.gz --gzip
+        python export_utils.py report.pdf --group
+    """
+    parser = argparse.ArgumentParser(description="Export the component library without the GUI.")
+    parser.add_argument("output", help="output CSV/PDF path ('-' for CSV on stdout)")
+    parser.add_argument("--gzip", action="store_true", help="gzip-compress the CSV output")
+    parser.add_argument("--group", action="store_true", help="PDF: group by category with subtotals")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    # cli.py ve api_server.py gibi: önce log, sonra şema (temiz kurulumda
+    # AppData kopyası ve tablolar setup_database ile hazırlanır)
+    app_logging.setup_logging()
+    db_handler.setup_database()
+
+    if args.output.lower().endswith(".pdf"):
+        count, pages, rate = write_pdf(args.output, group_by_category=args.group, batch_size=args.batch_size)
+        print(f"Exported {count} component(s) on {pages} page(s), {rate:.1f} pages/s.", file=sys.stderr)
+        return 0
+    if args.output == "-":
+        count = write_csv_rows(sys.stdout, args.batch_size)
+    else:
+        compress = args.gzip or args.output.lower().endswith(".gz")
+        count = write_csv(args.output, compress=compress, batch_size=args.batch_size)
+    print(f"Exported {count} component(s).", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
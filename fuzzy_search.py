@@ -0,0 +1,313 @@
+# fuzzy_search.py
+"""
+Parça numarası duyarlı bulanık arama: name ve drawer_code üzerinde
+önceden hesaplanmış trigram indeksi.
+
+Metinler önce normalize edilir: küçük harf, ayraçlar ("-", "/", ".",
+boşluk, ...) atılır, sondaki kılıf ekleri (TO-220, SOT-23, DIP8, ...) ve
+paketleme kelimeleri (TR, NOPB, ...) silinir. Böylece "LM317", "lm-317" ve
+"LM 317 TO-220" aynı anahtara ("lm317") iner; "LM317T" ona çok yakın olur.
+
+Her farklı anahtar bir kez indekslenir (aynı isimli binlerce satır tek
+anahtar paylaşır); trigram → anahtar numaraları listesi array('i') olarak
+tutulur. Sorguda:
+
+  1. Sorgunun trigram'ları seyrekten sığa sıralanır; MIN_SCORE'a ulaşabilen
+     her anahtar en seyrek (|q| - m + 1) listeden en az birinde geçmek
+     zorundadır (m: gereken ortak trigram sayısı). Sadece bu listeler
+     sayılır (Counter, C hızında); çok yaygın trigram'lar (ör. "  l")
+     PROBE_BUDGET aşılıyorsa atlanır.
+  2. En çok eşleşen RESCORE_LIMIT aday tam trigram kümesiyle yeniden
+     puanlanır: skor = (kapsama + Jaccard) / 2. Kapsama (sorgu trigram'larının
+     ya da baştaki boşluksuz iç trigram'larının ne kadarı anahtarda) alt
+     diziyi ("10k" → "RES-0805-10K") tolere eder, Jaccard uzunluğu yakın olanı
+     (tam eşleşmeyi) öne alır. Eşiğin altında kalıp öneki sorgudan tek
+     düzenleme uzakta olan anahtarlar ("lm371" → "LM317T") eşik skoruyla girer.
+
+Ekleme/silme artımlıdır: silinen satırın anahtarı sadece satır listesinden
+çıkar, boş kalan anahtarlar sayılır ve çok birikince indeks yeniden kurulur.
+ComponentStore(fuzzy=True) indeksi kendi değişiklikleriyle güncel tutar.
+"""
+import heapq
+import re
+from array import array
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+
+MIN_QUERY_LEN = 2        # normalize edilmiş sorgu bundan kısaysa bulanık arama yapılmaz
+TYPO_MIN_LEN = 4         # bu uzunluktan itibaren tek harf hatası (bkz. within_one_edit) affedilir
+MIN_SCORE = 0.5          # bu skorun altındaki eşleşmeler döndürülmez
+PROBE_BUDGET = 60_000    # sayılan posting girdisi üst sınırı (yaygın trigram'lar atlanır)
+RESCORE_LIMIT = 600      # tam skoru hesaplanan en iyi aday anahtar sayısı
+COMPACT_RATIO = 0.5      # boş anahtarlar bu oranı geçince indeks yeniden kurulur
+
+_SPLIT = re.compile(r"[\W_]+")
+# Sondaki kılıf eki (ayraçlar atıldıktan sonra): to220, sot23, dip8, soic8, d2pak, ...
+_PACKAGE_SUFFIX = re.compile(
+    r"(?:(?:to|sot|sod|soic|sop|ssop|tssop|msop|dip|pdip|sip|qfn|dfn|qfp|tqfp|lqfp|bga|plcc|do)"
+    r"\d{1,3}[a-z]?|d2pak|dpak|ipak)$"
+)
+# Ayrı yazılmış sondaki paketleme/sipariş kelimeleri: "LM358DR-TR", "LM1117-3.3/NOPB"
+PACKAGING_WORDS = frozenset(("tr", "nopb", "pbf", "nd", "reel", "tape", "bulk", "ct"))
+
+_NO_DOC = -(1 << 63)
+
+
+def _tokens(text):
+    return [t for t in _SPLIT.split(text.lower()) if t]
+
+
+def normalize_code(text):
+    """Çekmece kodları için: küçük harf, ayraçsız ("A-3" → "a3")."""
+    return "".join(_tokens(text or ""))
+
+
+def normalize_part(text):
+    """
+    Parça isimleri (ve sorgular) için: normalize_code + sondaki paketleme
+    kelimeleri ve kılıf eki silinir. Geriye MIN_QUERY_LEN'den kısa bir şey
+    kalacaksa (ör. sadece "TO-220") silinmez.
+    """
+    tokens = _tokens(text or "")
+    while len(tokens) > 1 and tokens[-1] in PACKAGING_WORDS:
+        tokens.pop()
+    key = "".join(tokens)
+    stripped = _PACKAGE_SUFFIX.sub("", key)
+    return stripped if len(stripped) >= MIN_QUERY_LEN else key
+
+
+def trigrams(key):
+    """Başa iki boşluk eklenmiş anahtarın trigram kümesi (baştaki eşleşme ağır basar)."""
+    padded = f"  {key}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def within_one_edit(a, b):
+    """a ile b arasında en fazla bir ekleme, silme, değiştirme ya da komşu yer değiştirme var mı."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    i = 0
+    while i < la and i < lb and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        if a[i + 1:] == b[i + 1:]:   # değiştirme
+            return True
+        # komşu yer değiştirme: "...ab..." ↔ "...ba..."
+        return i + 1 < la and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+    if la > lb:
+        return a[i + 1:] == b[i:]
+    return a[i:] == b[i + 1:]
+
+
+def _typo_prefix(query, key):
+    """key'in bir öneki query'den tek düzenleme uzakta mı ("lm371" ~ "lm317t")."""
+    n = len(query)
+    return any(within_one_edit(query, key[:m]) for m in (n, n - 1, n + 1) if m <= len(key))
+
+
+def _query_grams(query):
+    """Sorgunun tüm trigram'ları ve baş boşluksuz (alt dizi) iç trigram'ları."""
+    qgrams = trigrams(query)
+    return qgrams, {g for g in qgrams if g[0] != " "}
+
+
+def _score(query, qgrams, inner, key, min_score):
+    """key'in sorguya skoru; eşiğin altındaysa (ve yazım hatası da değilse) None."""
+    kgrams = trigrams(key)
+    shared = len(qgrams & kgrams)
+    contained = shared / len(qgrams)
+    if inner:
+        contained = max(contained, len(inner & kgrams) / len(inner))
+    score = (contained + shared / (len(qgrams) + len(kgrams) - shared)) / 2
+    if score < min_score:
+        # Trigram'lar harf yer değiştirmesini farklı parçadan ayıramaz
+        # ("lm371" ile "lm358" de 3 ortak trigram); tek düzenleme ayırır
+        if not (len(query) >= TYPO_MIN_LEN and _typo_prefix(query, key)):
+            return None
+        score = min_score
+    return score
+
+
+def matches(term, name, drawer_code, min_score=MIN_SCORE):
+    """
+    Tek bir satır term için eşiği geçiyor mu (indeks gerekmez; tabloya
+    yamalanan satırları süzmek için). Sorgu çok kısaysa None döner.
+    """
+    query = normalize_part(term)
+    if len(query) < MIN_QUERY_LEN:
+        return None
+    qgrams, inner = _query_grams(query)
+    return any(_score(query, qgrams, inner, key, min_score) is not None
+               for key in FuzzyIndex._field_keys(name, drawer_code))
+
+
+class FuzzyIndex:
+    """
+    Normalize anahtarlar üzerinde trigram indeksi. Thread güvenli değildir;
+    ComponentStore kendi kilidiyle korur.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._key_ids = {}           # anahtar → numara
+        self._keys = []              # numara → anahtar
+        self._first = array("q")     # numara → ilk satır id'si (_NO_DOC: satırı kalmadı)
+        self._more = {}              # numara → diğer satır id'leri (çoğu anahtarda yok)
+        self._postings = {}          # trigram → array('i') anahtar numaraları (artan)
+        self._empty = 0              # satırı kalmamış anahtar sayısı
+        self._count = 0              # indeksli (id, anahtar) çifti sayısı
+
+    def __len__(self):
+        return self._count
+
+    @staticmethod
+    def _field_keys(name, drawer_code, part=None):
+        """İsim ve çekmece kodunun (boş olmayan, farklı) anahtarları."""
+        if part is None:
+            part = normalize_part(name)
+        code = normalize_code(drawer_code)
+        if code and code != part:
+            return (part, code) if part else (code,)
+        return (part,) if part else ()
+
+    def add(self, comp_id, name, drawer_code):
+        for key in self._field_keys(name, drawer_code):
+            self._add_key(key, comp_id)
+
+    def add_many(self, rows):
+        """Toplu ekleme: (id, name, drawer_code) üçlüleri. Tekrar eden isimler bir kez normalize edilir."""
+        parts, field_keys, add_key = {}, self._field_keys, self._add_key
+        for comp_id, name, drawer_code in rows:
+            part = parts.get(name)
+            if part is None:
+                part = parts[name] = normalize_part(name)
+            for key in field_keys(name, drawer_code, part):
+                add_key(key, comp_id)
+
+    def discard(self, comp_id, name, drawer_code):
+        """add(comp_id, name, drawer_code) ile eklenmiş girdileri siler."""
+        for key in self._field_keys(name, drawer_code):
+            self._discard_key(key, comp_id)
+        if self._empty > 1000 and self._empty > COMPACT_RATIO * len(self._keys):
+            self._compact()
+
+    def _add_key(self, key, comp_id):
+        self._count += 1
+        kid = self._key_ids.get(key)
+        if kid is None:
+            kid = self._key_ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._first.append(comp_id)
+            postings = self._postings
+            for gram in trigrams(key):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("i")
+                posting.append(kid)
+        elif self._first[kid] == _NO_DOC:
+            self._first[kid] = comp_id
+            self._empty -= 1
+        else:
+            self._more.setdefault(kid, []).append(comp_id)
+
+    def _discard_key(self, key, comp_id):
+        kid = self._key_ids.get(key)
+        if kid is None:
+            return
+        more = self._more.get(kid)
+        if self._first[kid] == comp_id:
+            if more:
+                self._first[kid] = more.pop()
+            else:
+                # Anahtar posting listelerinde kalır; _compact() temizler
+                self._first[kid] = _NO_DOC
+                self._empty += 1
+        elif more and comp_id in more:
+            more.remove(comp_id)
+        else:
+            return
+        if more is not None and not more:
+            del self._more[kid]
+        self._count -= 1
+
+    def _docs(self, kid):
+        first = self._first[kid]
+        if first == _NO_DOC:
+            return ()
+        more = self._more.get(kid)
+        return (first, *more) if more else (first,)
+
+    def _compact(self):
+        """Boş anahtarları atarak indeksi yeniden kurar."""
+        entries = [(key, self._docs(kid)) for kid, key in enumerate(self._keys)]
+        self._reset()
+        for key, docs in entries:
+            for comp_id in docs:
+                self._add_key(key, comp_id)
+
+    def search(self, term, limit=None, min_score=MIN_SCORE):
+        """
+        [(id, skor), ...] en iyi eşleşme önce (eşit skorda anahtar sırası). Bir
+        satır hem isim hem çekmece koduyla eşleşirse yüksek olan skoru alır. Sorgu
+        normalize edildikten sonra MIN_QUERY_LEN'den kısaysa None döner.
+        """
+        query = normalize_part(term)
+        if len(query) < MIN_QUERY_LEN:
+            return None
+        qgrams, inner = _query_grams(query)
+        postings = self._postings
+
+        # Güvercin yuvası: m ortak trigram gereken anahtar en seyrek (n - m + 1)
+        # listeden en az birinde geçer (hem tüm trigram'lar hem iç trigram'lar için)
+        def rarest(grams):
+            lists = sorted((postings[g] for g in grams if g in postings), key=len)
+            needed = max(1, int(min_score * len(grams) + 0.999999))
+            return lists[:len(grams) - needed + 1]
+
+        inner_lists = rarest(inner)
+        probe, total = [], 0
+        for posting in sorted({id(p): p for p in inner_lists + rarest(qgrams)}.values(), key=len):
+            if probe and total + len(posting) > PROBE_BUDGET:
+                break
+            probe.append(posting)
+            total += len(posting)
+        # İç trigram listeleri önce sayılır: eşit sayıda alt dizi içerenler öne geçer
+        inner_ids = {id(p) for p in inner_lists}
+        probe.sort(key=lambda p: id(p) not in inner_ids)
+
+        counts = Counter(chain.from_iterable(probe))
+        if len(counts) > RESCORE_LIMIT:
+            candidates = [kid for kid, _ in heapq.nlargest(RESCORE_LIMIT, counts.items(), key=itemgetter(1))]
+        else:
+            candidates = list(counts)
+        exact = self._key_ids.get(query)
+        if exact is not None:
+            candidates.append(exact)
+
+        scored = []
+        keys, first = self._keys, self._first
+        for kid in set(candidates):
+            if first[kid] == _NO_DOC:
+                continue
+            key = keys[kid]
+            score = _score(query, qgrams, inner, key, min_score)
+            if score is not None:
+                scored.append((-score, key, kid))
+        scored.sort()
+
+        # Anahtarlar skor sırasında satırlara açılır; limit dolunca durulur
+        ranked, seen = [], set()
+        for neg_score, _, kid in scored:
+            for comp_id in self._docs(kid):
+                if comp_id not in seen:
+                    seen.add(comp_id)
+                    ranked.append((comp_id, -neg_score))
+            if limit is not None and len(ranked) >= limit:
+                return ranked[:limit]
+        return ranked
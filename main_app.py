@@ -1,27 +1,60 @@
 # main_app.py
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import time
+_START = time.perf_counter()   # soğuk açılış ölçümü için, importlardan önce
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
 import webbrowser
+import logging
 import platform
 import sys
-import csv
-import datetime
 from pathlib import Path  # Modern, object-oriented way to handle file paths
 from db_handler import execute_query
 
 # Third-party libraries
+# Not: matplotlib, PIL.ImageTk ve export_utils (reportlab) ağır ve nadiren
+# kullanılıyor; açılışı yavaşlatmamak için ilk kullanımda import edilirler.
 import sv_ttk
 import ctypes
 from ctypes import wintypes
-from PIL import Image, ImageTk
 
 # Import our separated modules
 import db_handler
-import export_utils
+import app_logging
 import config
+import fuzzy_search
+import perf
+from virtual_tree import VirtualTreeview
+from background_jobs import JobRunner, JobCancelled
+from component_store import ComponentStore
+from thumbnail_cache import ThumbnailCache
+
+
+class StartupTimer:
+    """Açılış aşamalarının süresini (ms) kaydeder: import, Tk, DB, widget'lar, ilk satırlar."""
+
+    def __init__(self, start):
+        self.start = self.last = start
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def total(self):
+        return (self.last - self.start) * 1000
+
+    def summary(self):
+        parts = ", ".join(f"{name} {ms:.0f}" for name, ms in self.phases)
+        return f"Startup {self.total():.0f} ms ({parts})"
+
+
+STARTUP = StartupTimer(_START)
+STARTUP.mark("imports")
+
+log = logging.getLogger(__name__)
 
 
 def enable_windows_dark_titlebar(window):
@@ -46,7 +79,7 @@ def enable_windows_dark_titlebar(window):
             ctypes.sizeof(use_dark)
         )
     except Exception as e:
-        print(f"[DWM] Failed to set dark title bar: {e}")
+        log.warning("Failed to set dark title bar: %s", e)
 
 class ComponentTrackerApp:
     
@@ -56,6 +89,13 @@ class ComponentTrackerApp:
         self.chart_fig    = None
         self.chart_ax     = None
         self.chart_canvas = None
+        self.chart        = None   # chart_view.CategoryChart (tembel yüklenir)
+        self.startup_timings = {}  # aşama -> ms, ilk çizimde doldurulur
+        self._chart_after_id = None
+        # Performance paneli (F12); kapanınca ölçüm de kapanır (ortam değişkeniyle açılmadıysa)
+        self.perf_win = None
+        self._perf_after_id = None
+        self._perf_forced = perf.is_enabled()
 
         self.root = root
         self.root.title("Component Library Tracker")
@@ -64,6 +104,39 @@ class ComponentTrackerApp:
         self.selected_item_data = None
         # This will hold the PhotoImage object to prevent it from being garbage collected
         self.photo_image = None
+        # Resim önizlemeleri için bellek + disk küçük resim önbelleği
+        self.thumbnails = ThumbnailCache(
+            config.THUMBNAIL_CACHE_DIR, memory_budget=config.THUMBNAIL_MEMORY_MB * 1024 * 1024
+        )
+        # Resim decode'u UI thread'i dışında, kendi havuzunda (image_jobs) yapılır.
+        # _image_request o an gösterilmesi gereken (yol, boyut); eski sonuçlar atılır.
+        self._image_job = None
+        self._image_request = None
+        self._shown_image = None
+        self._prefetching = set()
+        self._preview_size = config.IMAGE_PREVIEW_SIZE
+
+        # Uzun işler (içe aktarma, store yüklemesi, ...) için arka plan iş altyapısı
+        self.jobs = JobRunner(self.root, max_workers=2, poll_ms=config.JOB_POLL_MS)
+        # Resim decode'u ayrı havuzda: uzun bir içe aktarma önizlemeyi bekletmesin
+        self.image_jobs = JobRunner(self.root, max_workers=config.IMAGE_DECODE_WORKERS, poll_ms=config.JOB_POLL_MS)
+        # Aramalar da kendi tek worker'ında: uzun bir import veya store yüklemesi
+        # yazarken sonuçları bekletmesin.
+        self.search_jobs = JobRunner(self.root, max_workers=1, poll_ms=config.JOB_POLL_MS)
+        self.busy_job = None   # ilerleme çubuğunu kullanan iş
+
+        # Canlı arama: debounce zamanlayıcısı ve uçuştaki sorgu.
+        # Yeni sorgu eskisini iptal eder; iptal edilen işin sonucu uygulanmaz.
+        self._search_after_id = None
+        self._search_job = None
+        # Bellekteki okuma modeli: ilk çizimden sonra arka planda yüklenir, sonra
+        # PRAGMA data_version ile periyodik olarak artımlı yenilenir (CLI/API değişiklikleri dahil)
+        self.store = ComponentStore()
+        self._store_after_id = None
+        self._store_job = None   # uçuştaki (yeniden) yükleme; bitene kadar refresh yapılmaz
+        # Başlığa tıklanarak seçilen sıralama (None: arama skoru / isim)
+        self.sort_column = None
+        self.sort_desc = False
 
         # Load settings and configure the window
         self._load_and_apply_settings()
@@ -74,16 +147,77 @@ class ComponentTrackerApp:
         # Bind events and keyboard shortcuts
         self._bind_events()
 
-        # Load initial data into the Treeview
-        self.refresh_treeview()
+        # Kayıtlı sütun genişliklerini bir kez uygula, değişirse tekrar uygula
+        self.apply_column_widths()
+        config.settings.observe("column_widths", lambda key, value: self.apply_column_widths())
+        STARTUP.mark("widgets")
+
+        # Önce sadece ilk sayfa: pencere tüm envanteri beklemeden dolu açılır.
+        # Kalanı ilk çizimden sonra arka planda normal arama yoluyla yüklenir.
+        first_page = db_handler.get_all_components(limit=config.INITIAL_PAGE_ROWS)
+        self.refresh_treeview(data=first_page)
+        STARTUP.mark("first rows")
+        self.root.after_idle(self._on_first_paint, len(first_page) >= config.INITIAL_PAGE_ROWS)
         
         # Set the theme based on saved settings
         self.on_theme_change()
  
 
+    def _on_first_paint(self, partial):
+        """İlk çizim tamamlandı: açılış süresini kaydet, kalan satırları yükle."""
+        STARTUP.mark("first paint")
+        self.startup_timings = dict(STARTUP.phases)
+        log.info("%s", STARTUP.summary())
+        if partial:
+            self._start_search()
+        self._start_store_load()
+
+    def _start_store_load(self, requery=False):
+        """
+        Store'u (bulanık arama açıksa indeksiyle) arka planda baştan yükler.
+        requery: yüklenince görünüm yeniden sorgulanır (toplu değişiklik, mod değişimi).
+        """
+        self._store_job = self.jobs.submit(
+            self._load_store, self.fuzzy_var.get(), name="store",
+            on_done=lambda job, store: self._on_store_loaded(job, store, requery),
+            on_error=lambda job, e: log.error("Component store could not be loaded: %s", e),
+        )
+
+    def _load_store(self, job, fuzzy):
+        """Worker thread: yeni bir store'u baştan yükler; UI thread'inde yerine konur."""
+        store = ComponentStore(fuzzy=fuzzy)
+        store.load()
+        return store
+
+    def _on_store_loaded(self, job, store, requery):
+        if job is not self._store_job:   # yerine yenisi başlatıldı
+            store.close()
+            return
+        self._store_job = None
+        if not self.fuzzy_var.get():
+            store.drop_fuzzy()   # yükleme sürerken kapatıldı
+        self.store.close()
+        self.store = store
+        self._patch_rows(())   # yükleme sırasında gelen değişiklikler
+        if requery:
+            self.schedule_search(delay=0)
+            self.update_category_filter()
+        if self._store_after_id:
+            self.root.after_cancel(self._store_after_id)
+        self._store_after_id = self.root.after(config.STORE_POLL_MS, self._poll_store)
+
+    def _store_ready(self):
+        """Store yüklü ve güncel mi (yeniden yükleme sürerken okumalar DB'den yapılır)."""
+        return self.store.loaded and self._store_job is None
+
+    def _poll_store(self):
+        """Başka bağlantıların (CLI, API, betikler) değişikliklerini tabloya yansıtır."""
+        self._patch_rows(())
+        self._store_after_id = self.root.after(config.STORE_POLL_MS, self._poll_store)
+
     def _load_and_apply_settings(self):
         """Loads settings from config and applies them to the window."""
-        settings = config.load_settings()
+        settings = config.settings
         
         # Set window size
         w, h = settings.get("window_size", (1300, 750))
@@ -91,6 +225,8 @@ class ComponentTrackerApp:
 
         # Set theme variable (will be applied by on_theme_change)
         self.theme_var = tk.StringVar(value=settings.get("theme", "dark"))
+        # Bulanık (parça numarası duyarlı) arama modu
+        self.fuzzy_var = tk.BooleanVar(value=settings.get("fuzzy_search", False))
         
         # Set protocol for saving settings on close
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -130,6 +266,7 @@ class ComponentTrackerApp:
         tree_frame = self._create_tree_view(main_pane)
         self._create_bottom_pane(bottom_container)
         self._create_action_buttons(button_frame)
+        self._create_progress_bar()
         
         # Add frames to the PanedWindow
         main_pane.add(tree_frame, weight=3)
@@ -169,14 +306,17 @@ class ComponentTrackerApp:
         """Creates search, filter, and theme selection widgets."""
         ttk.Label(parent_frame, text="🔎 Search:", font=("Arial", 10)).pack(side="left", padx=(0, 5))
         self.search_var = tk.StringVar()
-        self.search_var.trace_add("write", lambda *args: self.filter_and_search())
+        self.search_var.trace_add("write", lambda *args: self.schedule_search())
         ttk.Entry(parent_frame, textvariable=self.search_var, width=30).pack(side="left", padx=5)
+        ttk.Checkbutton(
+            parent_frame, text="Fuzzy", variable=self.fuzzy_var, command=self.on_fuzzy_toggle
+        ).pack(side="left", padx=(0, 5))
 
         ttk.Label(parent_frame, text="Category:", font=("Arial", 10)).pack(side="left", padx=(15, 5))
         self.category_filter_var = tk.StringVar(value="All")
         self.category_filter = ttk.Combobox(parent_frame, textvariable=self.category_filter_var, state="readonly")
         self.category_filter.pack(side="left", padx=5)
-        self.category_filter.bind("<<ComboboxSelected>>", lambda *args: self.filter_and_search())
+        self.category_filter.bind("<<ComboboxSelected>>", lambda *args: self.schedule_search(delay=0))
 
         ttk.Label(parent_frame, text="Theme:", font=("Arial", 10)).pack(side="left", padx=(15, 5))
         theme_combo = ttk.Combobox(
@@ -200,8 +340,10 @@ class ComponentTrackerApp:
         self.tree.column("id", width=0, stretch=tk.NO)
         self.tree.column("image_path", width=0, stretch=tk.NO)
         
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Sanal liste: Treeview'da sadece görünen satırlar bulunur,
+        # scrollbar ve seçim VirtualTreeview tarafından yönetilir
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical")
+        self.table = VirtualTreeview(self.tree, scrollbar, on_select=self.on_row_select)
         
         self.tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -252,6 +394,8 @@ class ComponentTrackerApp:
         
         self.image_label = ttk.Label(image_frame, text="No Image", anchor="center")
         self.image_label.grid(row=0, column=0, sticky="nsew")
+        # Önizleme boyutunu önceden bil; seçimde update_idletasks gerekmesin
+        self.image_label.bind("<Configure>", self._on_preview_resize)
 
         # Populate the form with entry fields
         self.entries = {}
@@ -294,14 +438,49 @@ class ComponentTrackerApp:
         ttk.Button(parent_frame, text="🗑️ Delete", command=self.delete_selected, style="Danger.TButton").pack(side="left", expand=True, fill="x", padx=5)
         ttk.Button(parent_frame, text="🧹 Clear Form", command=self.clear_form_and_selection).pack(side="left", expand=True, fill="x", padx=5)
         ttk.Button(parent_frame, text="📥 Import CSV", command=self.import_csv).pack(side="left", expand=True, fill="x", padx=5)
-        ttk.Button(parent_frame, text="📤 Export CSV", command=lambda: export_utils.export_to_csv(self.update_status)).pack(side="left", expand=True, fill="x", padx=5)
-        ttk.Button(parent_frame, text="📄 Export PDF", command=lambda: export_utils.export_to_pdf(self.update_status)).pack(side="left", expand=True, fill="x", padx=5)
+        ttk.Button(parent_frame, text="📤 Export CSV", command=lambda: self.export("csv")).pack(side="left", expand=True, fill="x", padx=5)
+        ttk.Button(parent_frame, text="📄 Export PDF", command=lambda: self.export("pdf")).pack(side="left", expand=True, fill="x", padx=5)
         ttk.Button(parent_frame, text="📊 Category Chart", command=self.show_category_chart).pack(side="left", expand=True, fill="x", padx=5)
     
+    def _create_progress_bar(self):
+        """Arka plan işleri için ilerleme çubuğu ve Cancel butonu (iş yokken gizli)."""
+        self.progress_frame = ttk.Frame(self.root, padding=(10, 0, 10, 5))
+        self.progress_var = tk.DoubleVar(value=0.0)
+        ttk.Progressbar(self.progress_frame, variable=self.progress_var, maximum=1.0).pack(
+            side="left", fill="x", expand=True, padx=(0, 5)
+        )
+        self.cancel_button = ttk.Button(self.progress_frame, text="✖ Cancel", command=self.cancel_busy_job)
+        self.cancel_button.pack(side="right")
+
+    def _show_progress(self, job, text):
+        self.busy_job = job
+        self.progress_var.set(0.0)
+        self.cancel_button.state(["!disabled"])
+        self.progress_frame.pack(side="bottom", fill="x", after=self.status_bar)
+        self.update_status(text)
+
+    def _hide_progress(self):
+        self.busy_job = None
+        self.progress_frame.pack_forget()
+
+    def cancel_busy_job(self):
+        """İlerleme çubuğundaki işi iptal eder."""
+        if self.busy_job:
+            self.busy_job.cancel()
+            self.cancel_button.state(["disabled"])
+            self.update_status(f"Cancelling {self.busy_job.name}...")
+
+    def export(self, kind):
+        """CSV/PDF dışa aktarma; export_utils (ve reportlab) ilk kullanımda yüklenir."""
+        import export_utils
+        if kind == "pdf":
+            export_utils.export_to_pdf(self.update_status)
+        else:
+            export_utils.export_to_csv(self.update_status)
+
     def _bind_events(self):
         """Binds all mouse and keyboard events."""
-        # Treeview events
-        self.tree.bind("<<TreeviewSelect>>", self.on_row_select)
+        # Treeview events (<<TreeviewSelect>> VirtualTreeview üzerinden gelir)
         self.tree.bind("<Double-1>", self.on_cell_double_click)
         self.tree.bind("<ButtonRelease-1>", self.on_tree_click)
         self.tree.bind("<Button-3>", self.show_context_menu) # Right-click
@@ -310,6 +489,7 @@ class ComponentTrackerApp:
         self.root.bind("<Control-n>", lambda e: self.clear_form_and_selection())
         self.root.bind("<Control-s>", lambda e: self.update_component())
         self.root.bind("<Delete>", lambda e: self.delete_selected())
+        self.root.bind("<F12>", lambda e: self.toggle_perf_panel())
 
         # Context menu setup
         self.context_menu = tk.Menu(self.root, tearoff=0)
@@ -323,15 +503,29 @@ class ComponentTrackerApp:
     def on_close(self):
         """Saves settings and closes the application."""
         self.update_status("Saving settings...")
-        settings = config.load_settings()
+        settings = config.settings
         
         # Save window size
-        settings["window_size"] = (self.root.winfo_width(), self.root.winfo_height())
+        settings.set("window_size", [self.root.winfo_width(), self.root.winfo_height()])
         
         # Save column widths
-        settings["column_widths"] = {col: self.tree.column(col, option="width") for col in config.COLUMNS}
+        settings.set("column_widths", {col: self.tree.column(col, option="width") for col in config.COLUMNS})
         
-        config.save_settings(settings)
+        # Bekleyen yazımları hemen diske aktar
+        settings.flush()
+
+        # Bekleyen işleri iptal et, havuzdaki SQLite bağlantılarını kapat
+        if self._search_after_id:
+            self.root.after_cancel(self._search_after_id)
+        if self._perf_after_id:
+            self.root.after_cancel(self._perf_after_id)
+        if self._store_after_id:
+            self.root.after_cancel(self._store_after_id)
+        self.jobs.shutdown()
+        self.image_jobs.shutdown()
+        self.search_jobs.shutdown()
+        self.store.close()
+        db_handler.close_connections()
         self.root.destroy()
 
     def on_theme_change(self, event=None):
@@ -340,34 +534,78 @@ class ComponentTrackerApp:
         sv_ttk.set_theme(new_theme)
         enable_windows_dark_titlebar(self.root)
 
-        # Save the theme choice to settings
-        settings = config.load_settings()
-        settings["theme"] = new_theme
-        config.save_settings(settings)
+        # Save the theme choice to settings (disk write is coalesced)
+        config.settings.set("theme", new_theme)
         
         self.update_status(f"Theme set to '{new_theme}'")
 
+    @perf.timed("ui.refresh_treeview")
     def refresh_treeview(self, data=None):
-        """Clears and repopulates the treeview with data."""
-        current_selection_id = self.get_selected_id()
-        self.tree.delete(*self.tree.get_children())
-        
+        """
+        Loads data into the virtual table. Only the visible window is
+        materialized as Treeview items; selection is preserved by the table.
+        """
         if data is None:
-            data = db_handler.get_all_components()
+            data = db_handler.get_all_components(order_by=self._order_by() or "name")
 
-        for comp in data:
-            self.tree.insert('', 'end', values=comp, iid=comp[0])
+        self.table.set_rows(data, sort_spec=self._sort_spec(),
+                            sort_key=self._row_sort_key(), row_filter=self._row_filter())
         
         self.update_category_filter()
         
-        # Re-select the previously selected item if it still exists
-        if current_selection_id and self.tree.exists(current_selection_id):
-            self.tree.selection_set(current_selection_id)
-            self.tree.focus(current_selection_id)
-            self.tree.see(current_selection_id)
+        # Seçili satır hâlâ varsa formdaki referans veriyi tazele
+        if self.table.selected_id is not None:
+            self.on_row_select()
 
         self.update_status(f"Displayed {len(data)} components.")
-        self.apply_column_widths()
+
+    @perf.timed("ui.patch_rows")
+    def _patch_rows(self, comp_ids):
+        """
+        Değişen satırları tabloya yamalar; görünüyorsa satır başına tek bir
+        Treeview çağrısı. Silinen id'ler tablodan çıkarılır, seçim ve kaydırma
+        konumu korunur. Satırlar store'dan okunur (yüklenmediyse id başına bir
+        DB okuması). Store'un gördüğü başka değişiklikler de uygulanır; ama
+        sadece tabloda zaten olan satırlar için (tablo dışındaki bir satırın
+        sonuçlara girip girmeyeceğini sıralı sorgu belirler). Aktif filtreye
+        artık uymayan satırlar tablodan çıkar, sırası değişenler yerine taşınır.
+        """
+        comp_ids = {int(i) for i in comp_ids}   # formdaki id metin olarak gelir
+        others = set()
+        lookup = db_handler.get_component
+        if self._store_ready():
+            changed = self.store.refresh(reload=False)
+            if changed is None:
+                # Toplu değişiklik (ör. içe aktarma): store arka planda baştan
+                # yüklenir, sonra görünüm yeniden sorgulanır; o zamana kadar DB'den okunur
+                self._start_store_load(requery=True)
+                changed = set()
+            others = {i for i in changed - comp_ids if self.table.row(i) is not None}
+            if self._store_job is None:
+                lookup = self.store.row
+            categories_changed = bool(changed - comp_ids - others)   # tablo dışı satırlar
+        else:
+            categories_changed = False
+
+        for comp_id in comp_ids | others:
+            old = self.table.row(comp_id)
+            row = lookup(comp_id)
+            if row is None:
+                self.table.remove_row(comp_id)
+            else:
+                self.table.upsert_row(row)
+            old_cat = old[2] if old else None
+            new_cat = row[2] if row else None
+            categories_changed |= old_cat != new_cat
+
+        if categories_changed:
+            self.update_category_filter()
+        # Seçili satır yamalandıysa formun referans verisini tazele; başkasının
+        # değişikliği kaydedilmemiş form düzenlemelerini silmesin
+        selected = self.table.selected_id
+        if selected in {str(i) for i in comp_ids} or (
+                selected in {str(i) for i in others} and not self.is_form_dirty()):
+            self.on_row_select()
 
     def add_component(self):
         """Adds a new component to the database. Returns True on success, False on failure."""
@@ -375,10 +613,19 @@ class ComponentTrackerApp:
         if data is None:
             return False   # validation hatasında False dön
 
-        if db_handler.add_component(data):
-            self.update_status(f"Component '{data['name']}' added successfully.")
-            self.refresh_treeview()
+        try:
+            new_id = db_handler.add_component(data)
+        except db_handler.sqlite3.IntegrityError:
+            self._show_duplicate_warning(data)
+            return False
+        if new_id:
+            if self.search_var.get() or self.category_filter_var.get() != "All":
+                # Filtre aktifken yeni satırın sonuçlara girip girmediğini sorgu belirler
+                self.schedule_search(delay=0)
+            else:
+                self._patch_rows([new_id])
             self.clear_form_and_selection()
+            self.update_status(f"Component '{data['name']}' added successfully.")
             return True    # başarı
         else:
             messagebox.showerror("Database Error", "Failed to add the component.")
@@ -395,14 +642,27 @@ class ComponentTrackerApp:
         if data is None:
             return False  # validation hatasında False
 
-        if db_handler.update_component(comp_id, data):
+        try:
+            updated = db_handler.update_component(comp_id, data)
+        except db_handler.sqlite3.IntegrityError:
+            self._show_duplicate_warning(data)
+            return False
+        if updated:
+            self._patch_rows([comp_id])
             self.update_status(f"Component '{data['name']}' updated successfully.")
-            self.refresh_treeview()
             return True   # başarı
         else:
             messagebox.showerror("Database Error", "Failed to update the component.")
             return False  # DB hatasında False
 
+    def _show_duplicate_warning(self, data):
+        """(name, drawer_code) benzersiz indeksine takılan ekleme/güncelleme için."""
+        messagebox.showwarning(
+            "Duplicate Component",
+            f"'{data['name']}' already exists in drawer '{data['drawer_code']}'.\n"
+            "Select that component to change its quantity, or use a different name or drawer."
+        )
+
     def delete_selected(self):
         """Deletes the selected component after confirmation."""
         if not self.selected_item_data:
@@ -414,9 +674,9 @@ class ComponentTrackerApp:
 
         if messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete '{comp_name}'?"):
             if db_handler.delete_component(comp_id):
-                self.update_status(f"Component '{comp_name}' deleted.")
-                self.refresh_treeview()
+                self._patch_rows([comp_id])
                 self.clear_form_and_selection()
+                self.update_status(f"Component '{comp_name}' deleted.")
             else:
                 messagebox.showerror("Database Error", "Failed to delete component.")
 
@@ -424,14 +684,20 @@ class ComponentTrackerApp:
 
     def on_row_select(self, event=None):
         """Handles selection of a row in the treeview, populating the form."""
-        selected_items = self.tree.selection()
-        if not selected_items:
-            self.selected_item_data = None
-            return
-        
-        item_id = selected_items[0]
-        values = self.tree.item(item_id, "values")
-        self.selected_item_data = dict(zip(config.COLUMNS, values))
+        item_id = self.table.selected_id
+        # Tipli kayıt bellekteki store'dan; store henüz yüklenmediyse tablonun satırı
+        component = self.store.get(item_id) if item_id is not None and self._store_ready() else None
+        if component is not None:
+            data = component.as_form()
+        else:
+            row = self.table.row(item_id) if item_id is not None else None
+            if row is None:
+                self.selected_item_data = None
+                return
+            data = dict(zip(config.COLUMNS, ("" if v is None else str(v) for v in row)))
+        if data == self.selected_item_data:
+            return  # zaten yüklü; kaydırma vb. formdaki düzenlemeleri silmesin
+        self.selected_item_data = data
         
         self.clear_form_entries()
         for key, entry_widget in self.entries.items():
@@ -440,6 +706,7 @@ class ComponentTrackerApp:
         
         self.update_status(f"Selected: {self.selected_item_data['name']}")
         self.update_image_preview(self.selected_item_data.get('image_path'))
+        self._prefetch_neighbor_images()
 
     def on_tree_click(self, event):
         region = self.tree.identify_region(event.x, event.y)
@@ -469,7 +736,7 @@ class ComponentTrackerApp:
         """Shows a context menu on right-click."""
         iid = self.tree.identify_row(event.y)
         if iid:
-            self.tree.selection_set(iid)
+            self.table.select(iid)
             self.on_row_select() # Ensure data is loaded for the context actions
             self.context_menu.post(event.x_root, event.y_root)
 
@@ -517,55 +784,57 @@ class ComponentTrackerApp:
         if not file_path:
             return
 
+        if self.busy_job:
+            messagebox.showwarning("Busy", f"Please wait for the running {self.busy_job.name} to finish.")
+            return
+
+        job = self.jobs.submit(
+            self._run_import, file_path, name="import",
+            on_progress=self._on_import_progress,
+            on_done=self._on_import_done,
+            on_error=self._on_import_error,
+            on_cancel=self._on_import_cancelled,
+        )
+        self._show_progress(job, f"Importing {os.path.basename(file_path)}...")
+
+    def _run_import(self, job, file_path):
+        """Worker thread: CSV'yi tek transaction'da içe aktarır, ilerlemeyi bildirir."""
         try:
-            with open(file_path, newline='', encoding='utf-8-sig') as csvfile:
-                # CSV sniffer vs. fallback
-                try:
-                    dialect = csv.Sniffer().sniff(csvfile.read(2048), delimiters=";,\t|")
-                    csvfile.seek(0)
-                except csv.Error:
-                    dialect = 'excel'
-                    csvfile.seek(0)
-
-                reader = csv.DictReader(csvfile, dialect=dialect)
-                reader.fieldnames = [h.strip().lower().replace(' ', '_') for h in reader.fieldnames]
-
-                count_new = 0
-                count_skipped = 0
-
-                for row in reader:
-                    # temel alanlar yoksa atla
-                    if not all(k in row for k in ("name", "drawer_code", "quantity")):
-                        continue
-
-                    # string→int dönüşümleri vs.
-                    data = {k: v.strip() for k, v in row.items()}
-                    try:
-                        data["quantity"] = int(data["quantity"])
-                    except (ValueError, TypeError):
-                        data["quantity"] = 0
-
-                    # eğer zaten bu ikili varsa atla
-                    if db_handler.component_exists(data["name"], data["drawer_code"]):
-                        count_skipped += 1
-                        continue
-
-                    # yoksa ekle
-                    if not data.get("added_date"):
-                        data["added_date"] = datetime.date.today().isoformat()
-
-                    db_handler.add_component(data)
-                    count_new += 1
-
-                messagebox.showinfo(
-                    "Import Complete",
-                    f"{count_new} new component(s) imported.\n"
-                    f"{count_skipped} duplicate(s) skipped."
-                )
-                self.refresh_treeview()
+            return db_handler.import_csv_file(
+                file_path,
+                progress_callback=lambda staged, fraction: job.report(staged, fraction),
+                cancel_event=job.cancel_event,
+            )
+        except db_handler.ImportCancelled:
+            raise JobCancelled() from None
+
+    def _on_import_progress(self, job, staged, fraction):
+        self.progress_var.set(fraction)
+        self.update_status(f"Importing... {staged} row(s) read ({fraction:.0%})")
+
+    def _on_import_done(self, job, result):
+        self._hide_progress()
+        count_new, count_duplicates, count_invalid = result
+        self.refresh_treeview()
+        self.update_status(
+            f"Import complete: {count_new} new, {count_duplicates} duplicate(s), {count_invalid} invalid."
+        )
+        message = (
+            f"{count_new} new component(s) imported.\n"
+            f"{count_duplicates} duplicate(s) skipped."
+        )
+        if count_invalid:
+            message += f"\n{count_invalid} row(s) skipped: empty Name or Drawer Code."
+        messagebox.showinfo("Import Complete", message)
 
-        except Exception as e:
-            messagebox.showerror("Import Failed", f"An error occurred:\n{e}")
+    def _on_import_error(self, job, error):
+        self._hide_progress()
+        self.update_status("Import failed.")
+        messagebox.showerror("Import Failed", f"An error occurred:\n{error}")
+
+    def _on_import_cancelled(self, job):
+        self._hide_progress()
+        self.update_status("Import cancelled. No changes were made.")
 
     def get_form_data(self):
         """Retrieves and validates data from the input form."""
@@ -585,36 +854,40 @@ class ComponentTrackerApp:
 
     def adjust_quantity(self, amount):
         """
-        Formdaki Quantity alanını amount (±1) kadar değiştirir,
-        eğer bir satır seçiliyse veritabanını ve Treeview'u günceller,
-        ve Chart penceresi açıksa grafiği yeniden çizer.
+        Quantity'yi amount (±1) kadar değiştirir. Seçili bir bileşen varsa
+        değişiklik veritabanında tek bir atomik UPDATE ile yapılır (başka bir
+        kullanıcının ya da betiğin eşzamanlı düşümü kaybolmaz); formdaki
+        diğer kaydedilmemiş alanlara dokunulmaz. Seçim yoksa sadece form güncellenir.
         """
-        # 1) Yeni miktarı hesapla
-        try:
-            current = int(self.entries["quantity"].get() or 0)
-            new_val = max(0, current + amount)
-        except ValueError:
-            new_val = max(0, amount)
+        if self.selected_item_data:
+            comp_id = self.selected_item_data['id']
+            new_val = db_handler.adjust_stock(comp_id, amount)
+            if new_val is None:
+                messagebox.showerror("Database Error", "Failed to update the quantity.")
+                return
+            # Referans veriyi önceden güncelle ki yama formu baştan doldurmasın
+            self.selected_item_data['quantity'] = str(new_val)
+        else:
+            try:
+                new_val = max(0, int(self.entries["quantity"].get() or 0) + amount)
+            except ValueError:
+                new_val = max(0, amount)
 
-        # 2) Formu güncelle
         self.entries["quantity"].delete(0, tk.END)
         self.entries["quantity"].insert(0, str(new_val))
 
-        # 3) Seçili bir bileşen varsa veritabanına kaydet ve Treeview'u yenile
         if self.selected_item_data:
-            self.update_component()
+            self._patch_rows([comp_id])
+            self.update_status(f"Quantity of '{self.selected_item_data['name']}' is now {new_val}.")
 
-            # 4) Eğer grafik penceresi açıksa, grafiği yeniden çiz
+            # Eğer grafik penceresi açıksa, grafiği yeniden çiz
             if self.chart_win and self.chart_win.winfo_exists():
                 self._update_chart()
 
-
-
     def clear_form_and_selection(self):
         """Clears the form, the treeview selection, and the image preview."""
         self.clear_form_entries()
-        if self.tree.selection():
-            self.tree.selection_remove(self.tree.selection())
+        self.table.clear_selection()
         self.selected_item_data = None
         self.update_image_preview(None)
         self.update_status("Form cleared. Ready to add a new component.")
@@ -624,28 +897,132 @@ class ComponentTrackerApp:
         for entry in self.entries.values():
             entry.delete(0, tk.END)
 
-    def filter_and_search(self):
-        """Filters treeview data based on search term and category."""
+    def schedule_search(self, delay=None):
+        """
+        Arama kutusu her değiştiğinde çağrılır. Sorguyu hemen çalıştırmak yerine
+        debounce penceresi kadar bekler; bu sürede yeni tuşa basılırsa sayaç
+        sıfırlanır ve sadece son metin için sorgu yapılır.
+        """
+        if delay is None:
+            delay = config.SEARCH_DEBOUNCE_MS
+        if self._search_after_id:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(delay, self._start_search)
+
+    def _start_search(self):
+        """Sorguyu arka plan işi olarak başlatır; uçuştaki eski sorgu iptal edilir."""
+        self._search_after_id = None
+        if self._search_job:
+            self._search_job.cancel()
+
         search_term = self.search_var.get().lower()
         category = self.category_filter_var.get()
-        filtered_data = db_handler.search_components(search_term, category)
-        self.refresh_treeview(data=filtered_data)
+        self._search_job = self.search_jobs.submit(
+            self._run_search, search_term, category, self._order_by(),
+            self.store if self._store_ready() else None, self.fuzzy_var.get(), name="search",
+            on_done=self._apply_search_results,
+            on_error=lambda job, e: self.update_status(f"Search failed: {e}"),
+        )
+        self.update_status("Searching...")
 
-    def sort_treeview_column(self, col, reverse):
-        """Sorts the treeview by a specific column."""
-        data = [(self.tree.set(child, col), child) for child in self.tree.get_children('')]
-        
-        # Attempt to sort numerically, fall back to string sort
-        try:
-            data.sort(key=lambda item: int(item[0]), reverse=reverse)
-        except (ValueError, TypeError):
-            data.sort(key=lambda item: str(item[0]).lower(), reverse=reverse)
+    def _run_search(self, job, search_term, category, order_by=None, store=None, fuzzy=False):
+        """
+        Worker thread: iptal edilmiş sorguyu hiç çalıştırmaz. Arama terimi
+        yoksa (sadece kategori filtresi / sıralama) sonuç bellekteki store'dan
+        gelir; bulanık mod açıksa ve store'un indeksi hazırsa arama da oradan
+        (benzerliğe göre sıralı). Aksi halde FTS araması yapılır.
+        """
+        job.check_cancelled()
+        column, _, direction = (order_by or "").partition(" ")
+        if store is not None and not search_term:
+            return store.select(category, column or "name", desc=direction == "desc")
+        if store is not None and fuzzy:
+            rows = store.fuzzy_select(
+                search_term, category, column or None, desc=direction == "desc",
+                limit=config.FUZZY_RESULT_LIMIT,
+            )
+            if rows is not None:
+                return rows
+        return db_handler.search_components(search_term, category, order_by=order_by)
+
+    def _apply_search_results(self, job, rows):
+        """UI thread: sadece en son sorgunun sonucu tabloya uygulanır."""
+        if job is not self._search_job:
+            return
+        self._search_job = None
+        self.refresh_treeview(data=rows)
 
-        for index, (val, child) in enumerate(data):
-            self.tree.move(child, '', index)
+    def on_fuzzy_toggle(self):
+        """
+        Bulanık aramayı açar/kapatır. İndeks store ile birlikte arka planda
+        kurulur; hazır olana kadar arama FTS ile yapılır. Kapatınca indeks bırakılır.
+        """
+        fuzzy = self.fuzzy_var.get()
+        config.settings.set("fuzzy_search", fuzzy)
+        if fuzzy and not self.store.fuzzy:
+            self.update_status("Building fuzzy search index...")
+            self._start_store_load(requery=True)
+        elif not fuzzy:
+            self.store.drop_fuzzy()
+        if self.search_var.get():
+            self.schedule_search(delay=0)
+
+    def sort_treeview_column(self, col, reverse):
+        """
+        Sorts the table by a column. Sıralama veritabanında ORDER BY ile
+        (indeksli) yapılır ve mevcut arama/filtre ile birlikte yeniden sorgulanır.
+        """
+        self.sort_column, self.sort_desc = col, reverse
+        for c in config.COLUMNS:
+            if c == "image_path":
+                continue
+            arrow = (" ▼" if reverse else " ▲") if c == col else ""
+            self.tree.heading(c, text=config.COLUMN_TITLES[c] + arrow)
 
         # Toggle sort direction for the next click
         self.tree.heading(col, command=lambda: self.sort_treeview_column(col, not reverse))
+        self.schedule_search(delay=0)
+
+    def _sort_spec(self):
+        """VirtualTreeview için (sütun index'i, ters mi); varsayılan isim sırası."""
+        if self.sort_column is None:
+            return (1, False)
+        return (config.COLUMNS.index(self.sort_column), self.sort_desc)
+
+    def _row_sort_key(self):
+        """
+        Tablodaki sırayla aynı anahtar (db_handler.row_sort_key); sonuçlar
+        alaka sırasındaysa (arama var, sütun seçilmemiş) None.
+        """
+        if self.sort_column is None and self.search_var.get().strip():
+            return None
+        return db_handler.row_sort_key(self.sort_column or "name")
+
+    def _row_filter(self):
+        """
+        Yamalanan satırın aktif aramaya ve kategoriye uyup uymadığı; _run_search
+        ile aynı yolu izler (bulanık mod, olmazsa FTS/LIKE). Filtre yoksa None.
+        """
+        term = self.search_var.get().strip()
+        category = self.category_filter_var.get()
+        if not term and category == "All":
+            return None
+        fuzzy = self.fuzzy_var.get() and self.store.fuzzy
+        name, drawer, cat = (config.COLUMNS.index(c) for c in ("name", "drawer_code", "category"))
+
+        def matches(row):
+            if fuzzy and term:
+                found = fuzzy_search.matches(term, row[name], row[drawer])
+                if found is not None:
+                    return found and (category == "All" or row[cat] == category)
+            return db_handler.row_matches(row, term, category)
+        return matches
+
+    def _order_by(self):
+        """db_handler.order_by_clause biçiminde seçili sıralama (yoksa None)."""
+        if self.sort_column is None:
+            return None
+        return f"{self.sort_column} desc" if self.sort_desc else self.sort_column
 
     def browse_file(self, key):
         """Opens a file dialog to select a datasheet or image."""
@@ -662,58 +1039,101 @@ class ComponentTrackerApp:
     
     # --- Helper Methods ---
 
+    def _on_preview_resize(self, event):
+        if event.width > 1 and event.height > 1:
+            self._preview_size = (event.width, event.height)
+
     def update_image_preview(self, image_path):
-        if image_path and os.path.exists(image_path):
-            try:
-                # Load
-                img = Image.open(image_path)
-
-                # Önce geometry güncellesin diye idletasks
-                self.image_label.update_idletasks()
-
-                # Label’ın şu anki boyutunu al
-                max_w = self.image_label.winfo_width()
-                max_h = self.image_label.winfo_height()
-
-                # Eğer daha kurulmadıysa (0 dönerse) fallback olarak config
-                if max_w <= 1 or max_h <= 1:
-                    max_w, max_h = config.IMAGE_PREVIEW_SIZE
-
-                # Oranları koruyarak yeni boyutları hesapla
-                img_w, img_h = img.size
-                img_ratio = img_w / img_h
-                box_ratio = max_w / max_h
-
-                if img_ratio > box_ratio:
-                    # genişlik sınırı belirleyici
-                    new_w = max_w
-                    new_h = int(max_w / img_ratio)
-                else:
-                    # yükseklik sınırı belirleyici
-                    new_h = max_h
-                    new_w = int(max_h * img_ratio)
-
-                # Yeniden boyutlandır
-                img = img.resize((new_w, new_h), Image.LANCZOS)
-
-                # Göster
-                self.photo_image = ImageTk.PhotoImage(img)
-                self.image_label.config(image=self.photo_image, text="")
-
-            except Exception as e:
-                # yüklenemezse metin göster
-                print(f"Image preview error: {e}")
-                self.image_label.config(image="", text="Error loading image")
+        """
+        Önizlemeyi hemen günceller: bellekte hazırsa anında gösterir, değilse
+        yer tutucu koyar. Decode (ve tazelik kontrolü) worker thread'de yapılır,
+        sonuç after() ile gelir; bu arada seçim değiştiyse sonuç atılır.
+        """
+        if self._image_job:
+            self._image_job.cancel()
+            self._image_job = None
+
+        if not image_path:
+            self._image_request = None
+            self._show_preview_text("No Image")
+            return
+
+        size = self._preview_size
+        request = (image_path, size)
+        self._image_request = request
+
+        cached = self.thumbnails.peek(image_path, size)
+        if cached is not None:
+            self._show_preview_image(cached)
         else:
-            # geçersizse sıfırla
-            self.image_label.config(image="", text="No Image")
-            self.photo_image = None
+            self._show_preview_text("Loading...")
+
+        self._image_job = self.image_jobs.submit(
+            self._load_thumbnail, image_path, size, name="image",
+            on_done=lambda job, img: self._on_thumbnail_loaded(request, img),
+            on_error=lambda job, e: self._on_thumbnail_failed(request, e),
+        )
+
+    def _load_thumbnail(self, job, image_path, size):
+        """Worker thread: dosya yoksa None, varsa küçük resmi döner."""
+        job.check_cancelled()
+        if not os.path.exists(image_path):
+            return None
+        return self.thumbnails.get(image_path, size)
+
+    def _on_thumbnail_loaded(self, request, img):
+        if request != self._image_request:
+            return   # bu arada başka satır seçildi
+        if img is None:
+            self._show_preview_text("No Image")
+        elif img is not self._shown_image:
+            self._show_preview_image(img)
+
+    def _on_thumbnail_failed(self, request, error):
+        if request != self._image_request:
+            return
+        log.warning("Image preview error for %s: %s", request[0], error)
+        self._show_preview_text("Error loading image")
+
+    @perf.timed("ui.show_image")
+    def _show_preview_image(self, img):
+        self._shown_image = img
+        from PIL import ImageTk
+        self.photo_image = ImageTk.PhotoImage(img)
+        self.image_label.config(image=self.photo_image, text="")
+
+    def _show_preview_text(self, text):
+        self._shown_image = None
+        self.photo_image = None
+        self.image_label.config(image="", text=text)
+
+    def _prefetch_neighbor_images(self):
+        """Seçimin komşu satırlarının resimlerini arka planda önbelleğe ısıtır."""
+        index = self.table.index_of(self.table.selected_id) if self.table.selected_id else None
+        if index is None:
+            return
+        path_index = config.COLUMNS.index("image_path")
+        size = self._preview_size
+        for offset in range(-config.IMAGE_PREFETCH_ROWS, config.IMAGE_PREFETCH_ROWS + 1):
+            if offset == 0 or not 0 <= index + offset < len(self.table):
+                continue
+            path = self.table.rows[index + offset][path_index]
+            request = (path, size)
+            if not path or request in self._prefetching or self.thumbnails.peek(path, size) is not None:
+                continue
+            self._prefetching.add(request)
+            done = lambda job, *args, r=request: self._prefetching.discard(r)
+            self.image_jobs.submit(self._load_thumbnail, path, size, name="prefetch",
+                                   on_done=done, on_error=done, on_cancel=done)
 
 
     def update_category_filter(self):
         """Updates the category combobox with distinct categories from the DB."""
         current_selection = self.category_filter_var.get()
-        categories = ["All"] + db_handler.get_distinct_categories()
+        if self._store_ready():
+            categories = ["All"] + self.store.categories()
+        else:
+            categories = ["All"] + db_handler.get_distinct_categories()
         self.category_filter['values'] = categories
         # Preserve selection if it's still valid
         if current_selection in categories:
@@ -722,53 +1142,93 @@ class ComponentTrackerApp:
             self.category_filter_var.set("All")
 
     def apply_column_widths(self):
-        """Applies saved column widths from settings."""
-        settings = config.load_settings()
-        for col, w in settings.get("column_widths", {}).items():
+        """Applies saved column widths from the in-memory settings store."""
+        for col, w in config.settings.get("column_widths", {}).items():
             if col in config.COLUMNS:
                 self.tree.column(col, width=w)
 
     def get_selected_id(self):
         """Returns the ID of the currently selected treeview item."""
-        return self.tree.selection()[0] if self.tree.selection() else None
+        return self.table.selected_id
 
     def update_status(self, text):
         """Updates the text in the status bar."""
         self.status_bar.config(text=text)
 
-    def _update_chart(self):
-        """Var olan chart penceresinde dilimleri günceller."""
-        cats, counts = zip(*db_handler.get_category_counts())
-
-        # Ekseni temizle
-        self.chart_ax.clear()
-
-        # Yeni pie çiz
-        wedges, texts, autotexts = self.chart_ax.pie(
-            counts,
-            labels=cats,
-            autopct="%1.1f%%",
-            startangle=90,
-            textprops={"color":"white"},
-            wedgeprops={"edgecolor":"white"},
-        )
-        self.chart_ax.set_title("Category Distribution", color="white")
-
-        # Legend’i güncelle
-        self.chart_ax.legend(
-            wedges,
-            cats,
-            title="Categories",
-            loc="center left",
-            bbox_to_anchor=(1, 0, 0.3, 1),
-            facecolor='#2e2e2e',
-            edgecolor='#2e2e2e',
-        )
-
-        # Çizimi ekrana yansıt
-        self.chart_canvas.draw()
+    # --- Performance panel ---
+
+    def toggle_perf_panel(self):
+        """F12: ölçümü açar ve işlem başına p50/p95/max + yavaş sorgu panelini gösterir."""
+        if self.perf_win and self.perf_win.winfo_exists():
+            return self._close_perf_panel()
+        perf.enable()
+
+        self.perf_win = tk.Toplevel(self.root)
+        self.perf_win.title("Performance")
+        self.perf_win.geometry("760x420")
+        self.perf_win.protocol("WM_DELETE_WINDOW", self._close_perf_panel)
+        self.perf_win.bind("<F12>", lambda e: self._close_perf_panel())
+
+        toolbar = ttk.Frame(self.perf_win, padding=5)
+        toolbar.pack(fill="x")
+        ttk.Button(toolbar, text="Reset", command=perf.reset).pack(side="left")
+        ttk.Label(toolbar, text=f"Slow query threshold: {perf.SLOW_QUERY_MS:.0f} ms").pack(side="right")
+
+        self.perf_text = tk.Text(self.perf_win, font=("Consolas", 9), wrap="none", state="disabled")
+        self.perf_text.pack(fill="both", expand=True)
+        self._refresh_perf_panel()
+        self.update_status("Performance tracing enabled (F12 to close).")
+
+    def _refresh_perf_panel(self):
+        """Paneli periyodik olarak perf.report() ile tazeler (sadece panel açıkken)."""
+        self._perf_after_id = None
+        if not (self.perf_win and self.perf_win.winfo_exists()):
+            return
+        self.perf_text.config(state="normal")
+        self.perf_text.delete("1.0", "end")
+        pool = db_handler.connection_stats()
+        self.perf_text.insert("1.0", perf.report() + (
+            f"\n\nConnection pool: {pool['open_connections']} open, {pool['opens']} opened, "
+            f"{pool['reuses']} reused, {pool['wait_time'] * 1000:.1f} ms spent opening"
+        ))
+        self.perf_text.config(state="disabled")
+        self._perf_after_id = self.root.after(config.PERF_PANEL_REFRESH_MS, self._refresh_perf_panel)
+
+    def _close_perf_panel(self):
+        if self._perf_after_id:
+            self.root.after_cancel(self._perf_after_id)
+            self._perf_after_id = None
+        if self.perf_win and self.perf_win.winfo_exists():
+            self.perf_win.destroy()
+        self.perf_win = None
+        if not self._perf_forced:
+            perf.disable()
+            self.update_status("Performance tracing disabled.")
 
+    def _update_chart(self):
+        """
+        Grafik güncellemesini planlar. Kısa süre içindeki art arda çağrılar
+        (ör. "+" butonuna hızlı tıklamalar) tek bir okuma + çizimde birleşir.
+        """
+        if self._chart_after_id is None:
+            self._chart_after_id = self.root.after(config.CHART_COALESCE_MS, self._redraw_chart)
+
+    @perf.timed("ui.redraw_chart")
+    def _redraw_chart(self):
+        """Var olan chart penceresinde artist'leri yerinde günceller."""
+        self._chart_after_id = None
+        if not (self.chart_win and self.chart_win.winfo_exists()):
+            return
+        rows = db_handler.get_category_counts()
+        cats = [r[0] for r in rows]
+        counts = [r[1] for r in rows]
+        self.chart.update(cats, counts)
 
+    def _on_chart_kind_change(self, event=None):
+        kind = self.chart_kind_var.get()
+        config.settings.set("chart_kind", kind)
+        rows = db_handler.get_category_counts()
+        self.chart.set_kind(kind, [r[0] for r in rows], [r[1] for r in rows])
 
     def show_category_chart(self):
         """
@@ -779,22 +1239,37 @@ class ComponentTrackerApp:
         if self.chart_win and self.chart_win.winfo_exists():
             return self._update_chart()
 
+        # matplotlib sadece grafik ilk açıldığında yüklenir
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        import chart_view
+
         # Yoksa yeni pencere ve figür oluştur
-        cats, counts = zip(*db_handler.get_category_counts())
         self.chart_win = tk.Toplevel(self.root)
         self.chart_win.title("Category Chart")
         self.chart_win.configure(bg='#2e2e2e')
         self.chart_win.geometry("900x600")
         self.chart_win.resizable(False, False)
 
-        self.chart_fig, self.chart_ax = plt.subplots(
-            figsize=(7,7), facecolor='#2e2e2e'
-        )
+        # Grafik türü seçimi (çok kategoride bar/treemap daha okunaklı)
+        toolbar = ttk.Frame(self.chart_win, padding=5)
+        toolbar.pack(fill="x")
+        ttk.Label(toolbar, text="Chart type:").pack(side="left", padx=(0, 5))
+        self.chart_kind_var = tk.StringVar(value=config.settings.get("chart_kind", "pie"))
+        kind_combo = ttk.Combobox(toolbar, textvariable=self.chart_kind_var,
+                                  values=list(chart_view.CHART_KINDS), state="readonly", width=10)
+        kind_combo.pack(side="left")
+        kind_combo.bind("<<ComboboxSelected>>", self._on_chart_kind_change)
+
+        # pyplot yerine doğrudan Figure: global figür kaydı ve ek import yok
+        self.chart_fig = Figure(figsize=(7,7), facecolor='#2e2e2e')
+        self.chart_ax = self.chart_fig.add_subplot()
         self.chart_canvas = FigureCanvasTkAgg(self.chart_fig, master=self.chart_win)
         self.chart_canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.chart = chart_view.CategoryChart(self.chart_ax, self.chart_canvas, kind=self.chart_kind_var.get())
 
         # İlk çizimi yap
-        self._update_chart()
+        self._redraw_chart()
 
 
 
@@ -802,12 +1277,18 @@ class ComponentTrackerApp:
 
 def main():
     """Main function to initialize and run the application."""
+    # Dosyaya yazma arka plan thread'inde; UI thread'i log G/Ç'sini beklemez
+    app_logging.setup_logging()
     root = tk.Tk()
+    STARTUP.mark("tk init")
+
+    # Şema, indeksler ve arama indeksi hazır olsun
+    db_handler.setup_database()
+    STARTUP.mark("database")
     
     # Set the theme before creating the app instance
     # This ensures all widgets are created with the correct theme from the start.
-    settings = config.load_settings()
-    initial_theme = settings.get("theme", "dark")
+    initial_theme = config.settings.get("theme", "dark")
     sv_ttk.set_theme(initial_theme)
     
     # Apply dark title bar after the window is created but before it's drawn
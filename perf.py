@@ -0,0 +1,197 @@
+# perf.py
+"""
+Sıcak yollar için hafif zamanlama katmanı.
+
+    @perf.timed("db.search_components")
+    def search_components(...): ...
+
+    with perf.span("ui.refresh"):
+        ...
+
+Her işlem adı için son SAMPLE_WINDOW örnekten p50/p95/max ve toplam sayaç
+tutulur. Kapalıyken timed() sarmalayıcısı tek bir bayrak kontrolü yapıp
+doğrudan asıl fonksiyonu çağırır, span() paylaşılan boş bir context döner;
+zaman ölçülmez, kilit alınmaz.
+
+Açık olduğunda SLOW_QUERY_MS'i aşan SQL sorguları EXPLAIN QUERY PLAN
+çıktısıyla birlikte slow_queries() listesine ve "perf" logger'ına yazılır.
+
+Açmak için: COMPONENT_TRACKER_PERF=1 ortam değişkeni, perf.enable() ya da
+uygulamada F12 (Performance paneli).
+"""
+import contextlib
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+SAMPLE_WINDOW = 1024      # işlem başına yüzdelik için saklanan son örnek sayısı
+SLOW_QUERY_MS = 50.0      # bu süreyi aşan sorgular planıyla kaydedilir
+SLOW_QUERY_KEEP = 50      # hafızada tutulan son yavaş sorgu sayısı
+
+_enabled = os.getenv("COMPONENT_TRACKER_PERF", "") not in ("", "0")
+_lock = threading.Lock()
+_histograms = {}          # işlem adı -> Histogram
+_slow = deque(maxlen=SLOW_QUERY_KEEP)
+_NULL_SPAN = contextlib.nullcontext()
+
+log = logging.getLogger(__name__)
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def disable():
+    enable(False)
+
+
+class Histogram:
+    """Bir işlemin süreleri: toplam sayaç/süre/max ve yüzdelikler için kayan pencere."""
+
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self, window=SAMPLE_WINDOW):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def snapshot(self):
+        """ms cinsinden {"count", "total", "mean", "p50", "p95", "max"}."""
+        values = sorted(self.samples)
+        if not values:
+            return {"count": 0, "total": 0.0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+
+        def pct(p):
+            return values[min(len(values) - 1, int(p / 100.0 * len(values)))] * 1000
+
+        return {
+            "count": self.count,
+            "total": self.total * 1000,
+            "mean": self.total / self.count * 1000,
+            "p50": pct(50),
+            "p95": pct(95),
+            "max": self.max * 1000,
+        }
+
+
+def record(name, seconds):
+    """name işlemine bir süre (sn) ekler."""
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(seconds)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def span(name):
+    """`with perf.span("ad"):` bloğunun süresini ölçer (kapalıyken hiçbir şey yapmaz)."""
+    return _Span(name) if _enabled else _NULL_SPAN
+
+
+def timed(name):
+    """Fonksiyonun her çağrısını name altında ölçen dekoratör."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+# --- Yavaş sorgular ---
+
+def explain(conn, query, params=()):
+    """EXPLAIN QUERY PLAN çıktısını girintili metin olarak döner."""
+    rows = conn.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _unused, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return "\n".join(lines)
+
+
+def check_query(conn, query, params, seconds):
+    """Sorgu SLOW_QUERY_MS'i aştıysa planıyla birlikte kaydeder."""
+    ms = seconds * 1000
+    if ms < SLOW_QUERY_MS:
+        return
+    try:
+        plan = explain(conn, query, params)
+    except Exception as e:   # plan alınamaması asıl işlemi bozmasın
+        plan = f"(EXPLAIN failed: {e})"
+    sql = " ".join(query.split())
+    _slow.append((time.strftime("%H:%M:%S"), ms, sql, plan))
+    log.warning("slow query %.1f ms: %s\n%s", ms, sql, plan)
+
+
+def slow_queries():
+    """Son yavaş sorgular, en yenisi sonda: [(saat, ms, sql, plan), ...]."""
+    return list(_slow)
+
+
+# --- Raporlama ---
+
+def stats():
+    """{işlem adı: snapshot()} — toplam süreye göre azalan sırada."""
+    with _lock:
+        snaps = {name: hist.snapshot() for name, hist in _histograms.items()}
+    return dict(sorted(snaps.items(), key=lambda item: item[1]["total"], reverse=True))
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+    _slow.clear()
+
+
+def report():
+    """stats() ve yavaş sorguların düz metin tablosu (panel ve CLI için)."""
+    lines = [f"{'operation':<32}{'count':>8}{'p50':>9}{'p95':>9}{'max':>9}{'total':>10}  (ms)"]
+    for name, s in stats().items():
+        lines.append(f"{name:<32}{s['count']:>8}{s['p50']:>9.2f}{s['p95']:>9.2f}{s['max']:>9.2f}{s['total']:>10.1f}")
+    slow = slow_queries()
+    if slow:
+        lines.append("")
+        lines.append(f"Slow queries (>= {SLOW_QUERY_MS:.0f} ms), newest first:")
+        for when, ms, sql, plan in reversed(slow):
+            lines.append(f"{when}  {ms:.1f} ms  {sql}")
+            lines.extend("    " + line for line in plan.splitlines())
+    return "\n".join(lines)
@@ -0,0 +1,32 @@
+# tests/test_export_utils.py
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ExportFreshInstallTest(unittest.TestCase):
+    """Arayüzsüz dışa aktarma boş bir APP_DIR ile (ilk kurulum) çalışmalı."""
+
+    def test_csv_export_from_empty_app_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # cwd de geçici dizin: paketteki components.db'ye (resource_path) dokunulmaz
+            env = dict(os.environ, LOCALAPPDATA=tmp, HOME=tmp)
+            out = os.path.join(tmp, "out.csv")
+            result = subprocess.run(
+                [sys.executable, os.path.join(ROOT, "export_utils.py"), out],
+                cwd=tmp, env=env, capture_output=True, text=True, timeout=60,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertTrue(os.path.exists(os.path.join(tmp, "ComponentTracker", "components.db")))
+            with open(out, newline="", encoding="utf-8-sig") as f:
+                header = next(csv.reader(f))
+            self.assertEqual(header[:2], ["NAME", "CATEGORY"])
+
+
+if __name__ == "__main__":
+    unittest.main()
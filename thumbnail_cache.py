@@ -0,0 +1,175 @@
+# thumbnail_cache.py
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import perf
+
+log = logging.getLogger(__name__)
+
+
+def fit_size(image_size, box_size):
+    """Oranı koruyarak image_size'ı box_size içine sığdıran (w, h)."""
+    img_w, img_h = image_size
+    max_w, max_h = box_size
+    img_ratio = img_w / img_h
+    box_ratio = max_w / max_h
+    if img_ratio > box_ratio:
+        # genişlik sınırı belirleyici
+        return max_w, max(1, int(max_w / img_ratio))
+    # yükseklik sınırı belirleyici
+    return max(1, int(max_h * img_ratio)), max_h
+
+
+class ThumbnailCache:
+    """
+    Bileşen resimleri için iki katmanlı küçük resim önbelleği.
+
+    Anahtar (mutlak yol, mtime, hedef boyut) üçlüsüdür; dosya değişirse
+    anahtar da değişir. Bellekte bayt bütçeli bir LRU tutulur, bellekte
+    olmayanlar diskteki önbellekten (PNG) okunur, o da yoksa orijinal dosya
+    Pillow'un draft()/thumbnail() ile küçültülerek açılır — 12 MP bir JPEG
+    tam çözünürlükte hiç decode edilmez. Thread-safe'tir.
+    """
+
+    def __init__(self, cache_dir=None, memory_budget=64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.memory_budget = memory_budget
+        self._memory = OrderedDict()   # key -> PIL.Image
+        self._memory_bytes = 0
+        self._latest = {}              # (yol, w, h) -> en son bellekteki key
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, path, size):
+        path = os.path.abspath(path)
+        return (path, os.stat(path).st_mtime_ns, int(size[0]), int(size[1]))
+
+    def get(self, path, size):
+        """path'teki resmin size kutusuna sığan küçük halini döner (PIL.Image)."""
+        key = self.key(path, size)
+
+        with self._lock:
+            img = self._memory.get(key)
+            if img is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return img
+
+        img = self._load_from_disk(key)
+        if img is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            img = self._decode(path, size)
+            self._save_to_disk(key, img)
+
+        self._remember(key, img)
+        return img
+
+    def peek(self, path, size):
+        """
+        Dosya sistemine hiç dokunmadan bellekteki son küçük resmi döner (yoksa None).
+        UI thread'inde anında gösterim için; tazelik get() ile ayrıca doğrulanmalıdır.
+        """
+        with self._lock:
+            key = self._latest.get((os.path.abspath(path), int(size[0]), int(size[1])))
+            return self._memory.get(key) if key is not None else None
+
+    def contains(self, path, size):
+        """Resim bellekte hazır mı? (Dosya yoksa False)"""
+        try:
+            key = self.key(path, size)
+        except OSError:
+            return False
+        with self._lock:
+            return key in self._memory
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._latest.clear()
+            self._memory_bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+        }
+
+    # --- Internal ---
+
+    @staticmethod
+    @perf.timed("image.decode")
+    def _decode(path, size):
+        """Reduce-on-load: JPEG'i draft ile 1/2, 1/4, 1/8 ölçekte açar, sonra sığdırır."""
+        from PIL import Image   # Pillow ilk decode'da yüklenir, açılışta değil
+        with Image.open(path) as img:
+            img.draft("RGB", size)
+            target = fit_size(img.size, size)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+            if target[0] <= img.size[0]:
+                img.thumbnail(target, Image.LANCZOS)
+                img.load()
+                return img.copy()
+            # Küçük resimler önizleme kutusunu dolduracak şekilde büyütülür
+            return img.resize(target, Image.LANCZOS)
+
+    @staticmethod
+    def _image_bytes(img):
+        return img.size[0] * img.size[1] * len(img.getbands())
+
+    def _remember(self, key, img):
+        size = self._image_bytes(img)
+        if size > self.memory_budget:
+            return
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = img
+            self._latest[key[0], key[2], key[3]] = key
+            self._memory_bytes += size
+            # Bütçe aşılırsa en eski kullanılanları at
+            while self._memory_bytes > self.memory_budget:
+                old_key, old = self._memory.popitem(last=False)
+                self._memory_bytes -= self._image_bytes(old)
+                if self._latest.get((old_key[0], old_key[2], old_key[3])) == old_key:
+                    del self._latest[old_key[0], old_key[2], old_key[3]]
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".png")
+
+    @perf.timed("image.disk_cache")
+    def _load_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+        from PIL import Image
+        disk_path = self._disk_path(key)
+        try:
+            with Image.open(disk_path) as img:
+                img.load()
+                return img.copy()
+        except (OSError, ValueError):
+            return None
+
+    def _save_to_disk(self, key, img):
+        if not self.cache_dir:
+            return
+        disk_path = self._disk_path(key)
+        tmp_path = f"{disk_path}.{threading.get_ident()}.tmp"
+        try:
+            img.save(tmp_path, format="PNG")
+            os.replace(tmp_path, disk_path)
+        except OSError as e:
+            log.warning("Thumbnail cache write error: %s", e)
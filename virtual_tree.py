@@ -0,0 +1,306 @@
+# virtual_tree.py
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTreeview:
+    """
+    ttk.Treeview için sanal liste modu.
+
+    Sonuç kümesi Python tarafında satır tuple'ları olarak tutulur; Treeview'da
+    sadece görünen pencere (+ küçük bir pay) kadar item bulunur. Kaydırma
+    sırasında pencere dışına çıkan item'lar silinir, yenileri eklenir.
+    Böylece yenileme maliyeti envanter boyutuna değil pencere yüksekliğine bağlıdır.
+
+    Satırların ilk elemanı benzersiz id olmalıdır; Treeview iid'si olarak kullanılır.
+    """
+
+    DEFAULT_ROW_HEIGHT = 20
+    WHEEL_STEP = 3
+
+    def __init__(self, tree, scrollbar, on_select=None, margin=2):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.on_select = on_select
+        self.margin = margin
+
+        self.rows = []
+        self._pos = {}             # iid (str) -> rows içindeki index
+        self._pos_dirty = False    # ekleme/silmeden sonra index tembel yeniden kurulur
+        self.sort_spec = (1, False)  # (sütun index'i, ters mi) — sıralama değişti mi
+        self.sort_key = None       # satır → sıralama anahtarı; yamalanan satırın yeri için
+        self.row_filter = None     # satır → aktif filtreye uyuyor mu (None: hepsi)
+        self.selected_id = None    # seçim pencere dışına kaysa da burada kalır
+        self.first = 0             # görünen ilk satırın index'i
+        self._rendered = []        # Treeview'da şu an bulunan iid'ler (sırasıyla)
+        self._row_height = None
+
+        self.scrollbar.configure(command=self.yview)
+        self.tree.configure(yscrollcommand=lambda *args: None)
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<Configure>", lambda e: self._render())
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_units(-self.WHEEL_STEP))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_units(self.WHEEL_STEP))
+        for key, step in (("<Up>", -1), ("<Down>", 1)):
+            self.tree.bind(key, lambda e, s=step: self._move_selection(s))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self.visible_count()))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self.visible_count()))
+        self.tree.bind("<Home>", lambda e: self._select_index(0))
+        self.tree.bind("<End>", lambda e: self._select_index(len(self.rows) - 1))
+
+    # --- Data ---
+
+    def __len__(self):
+        return len(self.rows)
+
+    def set_rows(self, rows, sort_spec=(1, False), sort_key=None, row_filter=None):
+        """
+        Yeni sonuç kümesini yükler; seçim ve kaydırma konumu korunur.
+        Satırlar veritabanında sıralanmış gelir. sort_key (satır → anahtar,
+        sorgunun ORDER BY'ıyla aynı sıra) ve row_filter (satır → sonuçta mı)
+        sadece upsert_row için saklanır; sort_key yoksa yeni satır sona eklenir.
+        sort_spec (sütun index'i, ters mi) değiştiyse seçili satır görünür
+        alana kaydırılır.
+        """
+        resorted = sort_spec != self.sort_spec
+        self.rows = list(rows)
+        self.sort_spec = sort_spec
+        self.sort_key = sort_key
+        self.row_filter = row_filter
+        self._reindex()
+        if self.selected_id is not None and self.selected_id not in self._pos:
+            self.selected_id = None
+            self._notify_select()
+        self._clear_rendered()
+        if resorted and self.selected_id is not None:
+            self.see(self.selected_id)
+        self._render()
+
+    def row(self, iid):
+        """iid'ye ait satır tuple'ını döner (yoksa None)."""
+        index = self.index_of(iid)
+        return self.rows[index] if index is not None else None
+
+    def index_of(self, iid):
+        if self._pos_dirty:
+            self._reindex()
+        return self._pos.get(str(iid))
+
+    def upsert_row(self, row):
+        """
+        Tek bir satırı yamalar. Aktif filtreye artık uymayan satır kaldırılır.
+        Sıralama anahtarı değişmeyen satır yerinde güncellenir (görünüyorsa
+        tek bir Treeview çağrısı); anahtarı değişen ya da yeni satır mevcut
+        sıralamadaki yerine eklenir. Seçim ve kaydırma konumu korunur.
+        """
+        iid = str(row[0])
+        if self.row_filter is not None and not self.row_filter(row):
+            self.remove_row(iid)
+            return
+        index = self.index_of(iid)
+        if index is not None:
+            old = self.rows[index]
+            if self.sort_key is None or self.sort_key(old) == self.sort_key(row):
+                self.rows[index] = row
+                if iid in self._rendered:
+                    self.tree.item(iid, values=row)
+                return
+            # Yeri değişti: çıkarılıp yeniden eklenir (görünüyorsa item'ı da;
+            # _render kalan item'ların sıralı bir blok olduğunu varsayar)
+            del self.rows[index]
+            if index < self.first:
+                self.first -= 1
+            if iid in self._rendered:
+                self.tree.delete(iid)
+                self._rendered.remove(iid)
+
+        index = self._insertion_index(row)
+        self.rows.insert(index, row)
+        self._pos_dirty = True
+        if index < self.first:
+            self.first += 1   # görünen satırlar yerinde kalsın
+        self._render()
+
+    def remove_row(self, iid):
+        """Tek bir satırı kaldırır; seçiliyse seçim de temizlenir."""
+        iid = str(iid)
+        index = self.index_of(iid)
+        if index is None:
+            return
+        del self.rows[index]
+        self._pos_dirty = True
+        if iid == self.selected_id:
+            self.selected_id = None
+        if index < self.first:
+            self.first -= 1
+        self._render()
+
+    def _insertion_index(self, row):
+        """Mevcut sıralama anahtarına göre ikili arama ile ekleme yeri."""
+        if self.sort_key is None:
+            return len(self.rows)
+        reverse = self.sort_spec[1]
+        key = self.sort_key(row)
+        lo, hi = 0, len(self.rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = self.sort_key(self.rows[mid])
+            if (mid_key > key) if reverse else (mid_key < key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _reindex(self):
+        self._pos = {str(r[0]): i for i, r in enumerate(self.rows)}
+        self._pos_dirty = False
+
+    # --- Selection ---
+
+    def selection(self):
+        return (self.selected_id,) if self.selected_id is not None else ()
+
+    def select(self, iid, see=True):
+        """Satırı seçer, gerekiyorsa görünür alana kaydırır."""
+        iid = str(iid)
+        if self.index_of(iid) is None:
+            return
+        changed = iid != self.selected_id
+        self.selected_id = iid
+        if see:
+            self.see(iid)
+        self._render()
+        if changed:
+            self._notify_select()
+
+    def clear_selection(self):
+        self.selected_id = None
+        if self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+    def _on_tree_select(self, event=None):
+        selected = self.tree.selection()
+        if selected:
+            iid = selected[0]
+        elif self.selected_id in self._rendered:
+            # Görünen satırın seçimi kullanıcı tarafından kaldırıldı
+            iid = None
+        else:
+            # Seçili satır sadece pencere dışına kaydı
+            return
+        if iid != self.selected_id:
+            self.selected_id = iid
+            self._notify_select()
+
+    def _notify_select(self):
+        if self.on_select:
+            self.on_select()
+
+    def _move_selection(self, step):
+        current = self.index_of(self.selected_id) if self.selected_id is not None else None
+        if current is None:
+            current = self.first - 1 if step > 0 else self.first
+        self._select_index(current + step)
+        return "break"
+
+    def _select_index(self, index):
+        if self.rows:
+            index = max(0, min(len(self.rows) - 1, index))
+            self.select(self.rows[index][0])
+        return "break"
+
+    # --- Scrolling ---
+
+    def visible_count(self):
+        """Pencereye sığan satır sayısı."""
+        height = self.tree.winfo_height()
+        row_height = self._row_height or self._lookup_row_height()
+        header = 25
+        if self._rendered:
+            bbox = self.tree.bbox(self._rendered[0])
+            if bbox:
+                header = bbox[1]
+                self._row_height = row_height = bbox[3] or row_height
+        if height <= 1:
+            return 50
+        return max(1, (height - header) // row_height)
+
+    def _lookup_row_height(self):
+        try:
+            return int(ttk.Style().lookup("Treeview", "rowheight") or self.DEFAULT_ROW_HEIGHT)
+        except (tk.TclError, ValueError):
+            return self.DEFAULT_ROW_HEIGHT
+
+    def see(self, iid):
+        """first'i, verilen satır görünür olacak şekilde ayarlar."""
+        index = self.index_of(iid)
+        if index is None:
+            return
+        visible = self.visible_count()
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + visible:
+            self.first = index - visible + 1
+
+    def yview(self, *args):
+        """Scrollbar komut protokolü: ('moveto', f) veya ('scroll', n, 'units'|'pages')."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.rows))
+            self._render()
+        elif args[0] == "scroll":
+            count = int(args[1])
+            if args[2] == "pages":
+                count *= self.visible_count()
+            self._scroll_units(count)
+
+    def _scroll_units(self, count):
+        self.first += count
+        self._render()
+        return "break"
+
+    def _on_mousewheel(self, event):
+        step = -self.WHEEL_STEP if event.delta > 0 else self.WHEEL_STEP
+        return self._scroll_units(step)
+
+    # --- Rendering ---
+
+    def _clear_rendered(self):
+        if self._rendered:
+            self.tree.delete(*self._rendered)
+        self._rendered = []
+
+    def _render(self):
+        """Treeview'daki item'ları [first, first + visible + margin) aralığıyla eşitler."""
+        total = len(self.rows)
+        visible = self.visible_count()
+        self.first = max(0, min(self.first, total - visible))
+        start, end = self.first, min(total, self.first + visible + self.margin)
+        wanted = [str(r[0]) for r in self.rows[start:end]]
+
+        if wanted != self._rendered:
+            keep = set(wanted) & set(self._rendered)
+            stale = [iid for iid in self._rendered if iid not in keep]
+            if stale:
+                self.tree.delete(*stale)
+            # Kalan item'lar zaten sıralı bir blok; yenileri doğru index'e eklenir
+            for index, iid in enumerate(wanted):
+                if iid not in keep:
+                    self.tree.insert("", index, iid=iid, values=self.rows[start + index])
+            self._rendered = wanted
+
+        self.tree.yview_moveto(0)
+        if self.selected_id is not None and self.selected_id in self._rendered:
+            if self.tree.selection() != (self.selected_id,):
+                self.tree.selection_set(self.selected_id)
+                self.tree.focus(self.selected_id)
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+        if total:
+            self.scrollbar.set(start / total, min(1.0, (start + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)